@@ -25,9 +25,25 @@
 # Standard
 import argparse                     # argument parser
 import itertools                    # spinning progress bar
+import math                         # ceil
 import re                           # regex, needed for number string separation
+import time                         # tick latency
+from collections import deque, namedtuple   # command queue, snapshot record
 # Self
-from ATWG.waves.waves import waves  # waveform generator
+from ATWG.waves.waves import waves, waveRec     # waveform generator
+from ATWG.waves.lookahead import lookahead      # chamber lag feedforward
+from ATWG.driver.chamberBase import climaRec    # reused set point record
+from ATWG.driver.registry import driverRegistry # lazy chamber drivers
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+# Records
+snapRec = namedtuple('snapRec', ['time', 'state', 'tmeas', 'humidity', 'tset', 'grad', 'elapsed', 'phase',
+                                 'wakes', 'set', 'meas', 'written', 'skipped', 'tick_sec', 'tick_max_sec'])  # published once per tick
+MEAS_NONE = {'temperature': float('nan'), 'humidity': float('nan')}    # no measurement yet, read only
+SET_NONE = {'val': float('nan'), 'grad': float('nan')}                  # no set point yet, read only
 #------------------------------------------------------------------------------
 
 
@@ -41,11 +57,46 @@ class ATWG:
         """
         # config
         self.cfg_tsample_sec = 1                    # sample time is 1sec
-        self.avlChambers = ["SIM", "ESPEC_SH641",]  # supported climate chambers
+        self.cfg_event_driven = False               # set point only updated on chamber visible change
+        self.cfg_tmeas_sec = None                   # measurement period, None: sample time
+        self.cfg_fast_forward = None                # simulated run time on virtual clock, None: real time
+        self.cfg_trace = None                       # telemetry trace file
+        self.cfg_shm = None                         # telemetry shared memory name
+        self.cfg_offload = False                    # waveform runs as chamber program, ATWG only monitors
+        self.cfg_api = None                         # local API address, 'host:port' or 'unix:path'
+        self.cfg_split = False                      # status and trace in own process
+        self.cfg_cpus = None                        # CPU affinity of control loop
+        self.cfg_fifo = None                        # SCHED_FIFO priority of control loop
+        self.cfg_rainflow = None                    # rainflow histogram bin width of measured temperature, None: disabled
+        self.cfg_dose = None                        # thermal dose settings, f.e. {'ea': 0.7, 'tref': 25}, None: disabled
+        self.cfg_lookahead = None                   # chamber lag model overrides, f.e. {'mode': 'shape', 'tau': 300}, None: disabled
+        self.registry = driverRegistry()            # chamber drivers, imported on selection
+        self.avlChambers = self.registry.names(discover=False)  # builtin climate chambers, first is default
         # storing elements
         self.chamber = None     # class for chamber
         self.wave = None        # waveform
         self.clima = {}         # storage element for last measured clima
+        self.setRec = waveRec()     # waveform value, reused every tick
+        self.climaSet = climaRec()  # chamber set point, reused every tick
+        self.ahead = None           # set point lookahead, chamber leads waveform
+        self.chamberModel = {}      # identified thermal model of lab inventory
+        self.measure = None         # chamber measurement, record or dict
+        # scheduler
+        self.tnext = {'set': None, 'meas': None}    # due time of next set point/measurement update
+        self.ticks = {'set': 0, 'meas': 0}          # number of performed updates
+        self.trace = None                           # telemetry trace writer, record per measurement
+        self.export = None                          # telemetry shared memory writer, record per measurement
+        self.cycles = None                          # rainflow counter, measured temperature per measurement
+        self.dose = None                            # thermal dose accumulator, measured temperature per measurement
+        self.hooks = None                           # user hooks, worker pool created on first registration
+        # remote control
+        self.api = None                             # local API server, publishes snapshots if set
+        self.state = "run"                          # run, pause, stop
+        self.commands = deque()                     # pending commands of API, consumed by tick
+        self.snapshot = None                        # immutable state of last tick
+        self.tstart = None                          # time of first tick
+        self.wakes = 0                              # published ticks
+        self.tickMax = 0                            # slowest tick in seconds
         # time string conversion
         self.timeToSec = {'s': 1, 'sec': 1, 'm': 60, 'min': 60, 'h': 3600, 'hour': 3600, 'd': 86400, 'day': 86400}   # conversion dictory to seconds
         self.timeColSep = "d:h:m:s"                                                                                  # colon separated time string prototype
@@ -70,6 +121,20 @@ class ATWG:
         parser.add_argument('--sine',       action='store_true', help="sine waveform")                          # selects used waveform
         parser.add_argument('--trapezoid',  action='store_true', help="trapezoid waveform")                     #
         parser.add_argument('--invert',     action='store_true', help="wave starts with negative slew rate")    # w/o flag starts wave with positive slew, if set with negative slew
+        # control loop
+        parser.add_argument('--eventDriven', action='store_true', help="update set point only on chamber resolution change")   # sleep until next set point change
+        parser.add_argument("--measPeriod",  nargs=1, default=None, help="period of measurement polling")                      # independent measurement rate
+        parser.add_argument("--fastForward", nargs=1, default=None, help="simulated run time on virtual clock, f.e. 30d")        # no real time waiting
+        parser.add_argument("--trace",       nargs=1, default=None, help="telemetry trace file (CSV)")                          # record run
+        parser.add_argument("--shm",         nargs=1, default=None, help="telemetry shared memory name")                        # local consumers
+        parser.add_argument('--offload',     action='store_true', help="run waveform as chamber program, only monitor")          # chamber program memory
+        parser.add_argument('--split',       action='store_true', help="status and trace in own process, control loop only ticks")
+        parser.add_argument("--cpu",         nargs=1, default=None, help="CPU affinity of control loop, f.e. 1 or 2,3")
+        parser.add_argument("--fifo",        nargs=1, default=None, help="SCHED_FIFO priority of control loop, 1..99")
+        parser.add_argument("--api",         nargs=1, default=None, help="local status/control API, f.e. 127.0.0.1:8080 or unix:/tmp/atwg.sock")
+        parser.add_argument("--rainflow",    nargs=1, default=None, help="rainflow cycle counting of measured temperature, histogram bin width [C]")
+        parser.add_argument("--dose",        nargs=1, default=None, help="Arrhenius thermal dose of measured temperature, f.e. 'ea=0.7,tref=25C,bin=1C'")
+        parser.add_argument("--lookahead",   nargs=1, default=None, help="set point leads waveform by chamber lag, f.e. 'mode=shape,tau=5m,deadtime=1m'")
         # waveform parameters
         parser.add_argument("--period",    nargs=1, default=["1h",],  help="Period duration of selected waveform")    # temperature periodicity
         parser.add_argument("--minTemp",   nargs=1, default=None,     help="waveforms minimal temperature value [C]") # minimal temperature value
@@ -80,12 +145,84 @@ class ATWG:
         # climate chamber
         parser.add_argument("--chamber", nargs=1, default=self.avlChambers[0], help="Used climate chamber")                      # used chamber
         parser.add_argument("--port",    nargs=1, default="",                  help="System port to climate chamber, f.e. COM1") # interface
+        parser.add_argument("--inventory", nargs=1, default=None,              help="lab inventory, '--chamber' selects entry")  # interface overrides
+        # set point write policy
+        parser.add_argument("--writeDeadband", nargs=1, default=None, help="skip set point changes up to this value [C]")  # deadband
+        parser.add_argument("--writeInterval", nargs=1, default=None, help="minimal time between set point writes")        # rate cap
+        parser.add_argument("--writeRefresh",  nargs=1, default=None, help="maximal time between set point writes")        # forced write
+        parser.add_argument("--simModel",      nargs=1, default=None, help="SIM chamber thermal model, f.e. 'order=1,tau=5m,rise=2.9,fall=-1.7'")
         # parse
         args = parser.parse_args(cliArgs)
+        # control loop
+        self.cfg_event_driven = args.eventDriven
+        if ( None != args.measPeriod ):
+            self.cfg_tmeas_sec = self.time_to_sec(args.measPeriod[0])
+        if ( None != args.fastForward ):
+            self.cfg_fast_forward = self.time_to_sec(args.fastForward[0])
+        if ( None != args.trace ):
+            self.cfg_trace = args.trace[0]
+        if ( None != args.shm ):
+            self.cfg_shm = args.shm[0]
+        self.cfg_offload = args.offload
+        if ( None != args.api ):
+            self.cfg_api = args.api[0]
+        self.cfg_split = args.split
+        if ( None != args.cpu ):
+            self.cfg_cpus = [int(cpu) for cpu in args.cpu[0].split(",")]
+        if ( None != args.fifo ):
+            self.cfg_fifo = int(args.fifo[0])
+        if ( None != args.rainflow ):
+            self.cfg_rainflow = float(args.rainflow[0].replace("C", "").replace("c", ""))
+        if ( None != args.dose ):                       # 'key=val,key=val', empty keeps defaults
+            self.cfg_dose = {}
+            for item in filter(None, args.dose[0].split(",")):
+                key, val = item.split("=")
+                if ( "ea" == key ):
+                    self.cfg_dose['ea'] = float(val.lower().replace("ev", ""))
+                elif ( key in ('tref', 'bin') ):
+                    self.cfg_dose['binWidth' if ( "bin" == key ) else key] = float(val.replace("C", "").replace("c", ""))
+                elif ( "maxGap" == key ):
+                    self.cfg_dose[key] = self.time_to_sec(val)
+                else:
+                    raise ValueError("Unknown thermal dose setting '" + key + "'")
+        if ( None != args.lookahead ):                  # 'key=val,key=val', missing from chamber
+            self.cfg_lookahead = {}
+            for item in filter(None, args.lookahead[0].split(",")):
+                key, val = item.split("=")
+                if ( key in ('tau', 'tau2', 'deadtime') ):
+                    self.cfg_lookahead[key] = self.time_to_sec(val)
+                elif ( key in ('rise', 'fall') ):
+                    self.cfg_lookahead[key] = float(val)
+                elif ( "mode" == key ):
+                    self.cfg_lookahead[key] = val
+                else:
+                    raise ValueError("Unknown lookahead setting '" + key + "'")
         # select climate chamber
         chamberArgs = {}
         chamberArgs['chamber'] = ''.join(args.chamber)  # chamber
         chamberArgs['port'] = ''.join(args.port)        # interface
+        if ( None != args.inventory ):
+            chamberArgs['inventory'] = args.inventory[0]
+        policy = {}                                     # only provided write policy settings
+        if ( None != args.writeDeadband ):
+            policy['deadband'] = float(args.writeDeadband[0].replace("C", "").replace("c", ""))
+        if ( None != args.writeInterval ):
+            policy['minInterval'] = self.time_to_sec(args.writeInterval[0])
+        if ( None != args.writeRefresh ):
+            policy['refresh'] = self.time_to_sec(args.writeRefresh[0])
+        if ( 0 < len(policy) ):
+            chamberArgs['policy'] = policy
+        if ( None != args.simModel ):                   # 'key=val,key=val'
+            model = {}
+            for item in args.simModel[0].split(","):
+                key, val = item.split("=")
+                if ( key in ('tau', 'tau2', 'deadtime', 'latency') ):
+                    model[key] = self.time_to_sec(val)
+                elif ( "order" == key ):
+                    model[key] = int(val)
+                else:
+                    model[key] = float(val)
+            chamberArgs['model'] = model
         # align CLI to wave.py api
         waveArgs = {}                                       # init dict
         waveArgs['ts'] = self.cfg_tsample_sec               # define sample time
@@ -324,30 +461,96 @@ class ATWG:
         # check for args
         if ( None == chamberArg or None == waveArg ):
             raise ValueError("Missing args")
-        # select chamber
-        if ( "sim" == chamberArg['chamber'].lower() ):
-            from ATWG.driver.sim.simChamber import simChamber   # import if required
-            self.chamber = simChamber()
-        elif ( "espec_sh641" == chamberArg['chamber'].lower() ):
-            from ATWG.driver.espec.sh641 import especShSu       # import if required
-            self.chamber = especShSu()                          # init driver
-        else:
-            raise ValueError("Unsupported climate chmaber '" + chamberArg['chamber'] +"' selected")
+        # lab inventory, chamber name selects driver and interface overrides
+        driver = chamberArg['chamber']
+        itfArgs = {}
+        if ( 'inventory' in chamberArg ):
+            from ATWG.driver.configCache import cfgCache        # import if required
+            itfArgs = cfgCache.inventory(chamberArg['inventory'], chamberArg['chamber'])
+            driver = itfArgs.pop('driver')
+            self.chamberModel = itfArgs.pop('model', {})
+        if ( (0 < len(chamberArg['port'])) or not ('port' in itfArgs) ):
+            itfArgs['port'] = chamberArg['port']                # command line wins
+        # select chamber, only selected driver is imported
+        self.chamber = self.registry.create(driver)
+        self.measure = getattr(self.chamber, 'measure', self.chamber.get_clima)    # drivers w/o base protocol allocate per tick
+        # inventory interface overrides, only the ones the driver opens with
+        if ( 'inventory' in chamberArg ):
+            import inspect      # import if required
+            params = inspect.signature(self.chamber.open).parameters
+            if not ( any(param.kind == inspect.Parameter.VAR_KEYWORD for param in params.values()) ):
+                unknown = [key for key in itfArgs if not ( key in params )]
+                if ( 0 < len(unknown) ):
+                    raise ValueError("Chamber driver '" + driver + "' supports no interface setting '" + "', '".join(unknown) + "' of inventory entry '" + chamberArg['chamber'] + "'")
+        # options the chamber can not serve, checked before hardware is opened
+        if ( (None != self.cfg_fast_forward) and not (hasattr(self.chamber, 'clock') and hasattr(self.chamber, 'sleep')) ):
+            raise ValueError("Fast forward needs simulated chamber, '" + chamberArg['chamber'] + "' has no model time")
+        policy = getattr(self.chamber, 'policy', None)  # plugin drivers may write every set point
+        if ( ('policy' in chamberArg) and (None == policy) ):
+            raise ValueError("Chamber '" + chamberArg['chamber'] + "' has no set point write policy")
+        if ( self.cfg_event_driven and (None == policy) ):
+            raise ValueError("Event driven update needs set point write policy, '" + chamberArg['chamber'] + "' has none")
+        if ( ('model' in chamberArg) and not hasattr(self.chamber, 'set_model') ):
+            raise ValueError("Chamber '" + chamberArg['chamber'] + "' has no thermal model")
+        if ( self.cfg_offload and not hasattr(self.chamber, 'upload_program') ):
+            raise ValueError("Chamber '" + chamberArg['chamber'] + "' supports no program offload")
+        if ( (None != self.cfg_lookahead) and self.cfg_offload ):
+            raise ValueError("Lookahead needs set points of host, not possible with offload")
         # open chamber interface
-        self.chamber.open(port = chamberArg['port'])
-        # init waveform
-        self.wave = waves()         # create class
-        self.wave.set(**waveArg)    # init waveform
+        self.chamber.open(**itfArgs)
+        try:
+            # set point write policy
+            if ( 'policy' in chamberArg ):
+                policy.set(**chamberArg['policy'])
+            # chamber model, identified model of inventory drives simulated twin, command line wins
+            if ( 'model' in chamberArg ):
+                self.chamber.set_model(**dict(self.chamberModel, **chamberArg['model']))
+            elif ( (0 < len(self.chamberModel)) and hasattr(self.chamber, 'set_model') ):
+                self.chamber.set_model(**self.chamberModel)
+            # init waveform
+            self.wave = waves()         # create class
+            self.wave.set(**waveArg)    # init waveform
+            # chamber lag feedforward
+            if ( None != self.cfg_lookahead ):
+                self.ahead = lookahead(self.wave, **self.lag_model(self.cfg_lookahead))
+        except:
+            self.chamber.close()    # invalid settings, release interface
+            raise
         # normal end
         return True
     #*****************************
     
     
+    #*****************************
+    def lag_model(self, overrides=None):
+        """
+        @note               lag model of opened chamber, identified model of
+                            lab inventory wins over thermal model of
+                            simulated chamber and slew rates of chamber info
+
+        @param overrides    settings which win, f.e. from command line
+        @rtype              dict
+        @return             lookahead arguments
+        """
+        info = self.chamber.info()['temperature']
+        model = getattr(self.chamber, 'model', {})     # only simulated chamber
+        lag = {key: model[key] for key in ('tau', 'tau2', 'deadtime') if ( key in model )}
+        lag['rise'] = info['slewrate']['rise']
+        lag['fall'] = info['slewrate']['fall']
+        lag['tmin'] = info['ratings']['min']
+        lag['tmax'] = info['ratings']['max']
+        lag.update({key: val for key, val in self.chamberModel.items() if ( key in ('tau', 'tau2', 'deadtime', 'rise', 'fall') )})
+        lag.update(overrides or {})
+        return lag
+    #*****************************
+
+
     #*****************************
     def start(self):
         """
         @note               starts chamber with operation
                               * set temperature is current temperature
+                              * offload: waveform uploaded as chamber program
                             
         @rtype              boolean
         @return             successful
@@ -355,8 +558,15 @@ class ATWG:
         # check for successfull opening
         if ( (None == self.chamber) or (None == self.wave) ):
             raise ValueError("Interfaces not opened, call methode 'open'")
+        # waveform runs in chamber, starts at current waveform value
+        if ( self.cfg_offload ):
+            program = self.chamber.compile_program(self.wave)
+            self.chamber.upload_program(program)
+            self.chamber.start(temperature=program['start'])    # program start on its time grid
+            self.chamber.run_program()
+            return True
         # set current clima as target clima
-        self.chamber.set_clima(clima=self.chamber.get_clima())
+        self.force_clima(clima=self.chamber.get_clima())
         # start chamber
         self.chamber.start()
         # graceful end
@@ -372,8 +582,8 @@ class ATWG:
         @rtype              boolean
         @return             successful
         """
-        # set chamber to start value
-        self.chamber.set_clima(clima={'temperature': self.wave.waveArgs['initVal']})
+        # set chamber to start value, no later write could catch up
+        self.force_clima(clima={'temperature': self.wave.waveArgs['initVal']})
         # stop chamber
         self.chamber.stop()
         # graceful end
@@ -381,6 +591,23 @@ class ATWG:
     #*****************************
     
     
+    #*****************************
+    def force_clima(self, clima):
+        """
+        @note               writes set point w/o deadband and rate cap of
+                            the write policy, f.e. start and shutdown;
+                            drivers w/o policy write every set point
+
+        @param clima        new clima value
+        @rtype              boolean
+        @return             successful
+        """
+        if ( None != getattr(self.chamber, 'policy', None) ):
+            return self.chamber.set_clima(clima=clima, force=True)
+        return self.chamber.set_clima(clima=clima)
+    #*****************************
+
+
     #*****************************
     def chamber_update(self):
         """
@@ -395,14 +622,223 @@ class ATWG:
         if ( (None == self.chamber) or (None == self.wave) ):
             raise ValueError("Interfaces not opened, call methode 'open'")
         # acquire current clima
-        self.clima['get'] = self.chamber.get_clima();
-        # calc next clima value
-        self.clima['set'] = self.wave.next();
-        # set chamber value
-        self.chamber.set_clima(clima={'temperature': self.clima['set']['val']})
+        self.measure_update()
+        # calc next clima value, set chamber value
+        self.setpoint_update()
         # graceful end
         return True
     #*****************************
+
+
+    #*****************************
+    def measure_update(self):
+        """
+        @note               reads from chamber current clima conditions
+
+        @rtype              dict
+        @return             measured clima
+        """
+        self.clima['get'] = self.measure()
+        self.ticks['meas'] += 1
+        return self.clima['get']
+    #*****************************
+
+
+    #*****************************
+    def setpoint_update(self):
+        """
+        @note               calculates next waveform value and sets chamber
+                            in event driven mode is the waveform forwarded to
+                            the next chamber visible set point change
+                            in offload mode is only the expected set point
+                            calculated, the chamber program sets the chamber
+
+        @rtype              int
+        @return             number of sample times until next set point update
+        """
+        # calc next clima value
+        self.clima['set'] = self.wave.next(rec=self.setRec)
+        # set chamber value, offloaded program sets by its own
+        if ( False == self.cfg_offload ):
+            self.climaSet.temperature = self.setRec.val if ( None == self.ahead ) else self.ahead.setpoint()
+            self.chamber.set_clima(clima=self.climaSet)
+        self.ticks['set'] += 1
+        # periodic update
+        if ( False == self.cfg_event_driven ):
+            return 1
+        # skip waveform until chamber visible change
+        policy = self.chamber.policy.cfg      # event driven requires policy, checked on open
+        num = 1 + self.wave.ticks_to_change(ref=self.clima['set']['val'], resolution=policy['resolution'])
+        num = max(num, math.ceil(policy['minInterval']/self.cfg_tsample_sec))         # rate cap, intermediate changes are not written
+        if ( False == math.isinf(policy['refresh']) ):
+            num = min(num, max(1, math.floor(policy['refresh']/self.cfg_tsample_sec)))    # forced refresh
+        self.wave.skip(num-1)
+        return num
+    #*****************************
+
+
+    #*****************************
+    def tick(self, now):
+        """
+        @note               performs all due updates, measurement and set
+                            point run with independent periods
+
+        @param now          current time in seconds
+        @rtype              float
+        @return             due time of next update
+        """
+        # check for successfull opening
+        if ( (None == self.chamber) or (None == self.wave) ):
+            raise ValueError("Interfaces not opened, call methode 'open'")
+        tcall = time.perf_counter() if ( None != self.api ) else 0
+        # first call defines time base
+        if ( None == self.tnext['set'] ):
+            self.tnext['set'] = now
+            self.tnext['meas'] = now
+            self.tstart = now
+        # remote commands
+        while ( 0 < len(self.commands) ):
+            self.command(self.commands.popleft(), now)
+        # measurement
+        measured = ( self.tnext['meas'] <= now )
+        if ( measured ):
+            self.measure_update()
+            tmeas = self.cfg_tsample_sec if ( None == self.cfg_tmeas_sec ) else self.cfg_tmeas_sec
+            self.tnext['meas'] += tmeas * (1 + math.floor((now - self.tnext['meas']) / tmeas))  # skip missed periods
+        # set point, holds in pause
+        updated = ( ("run" == self.state) and (self.tnext['set'] <= now) )
+        if ( updated ):
+            missed = math.floor((now - self.tnext['set']) / self.cfg_tsample_sec)   # keep waveform aligned to time
+            if ( 0 < missed ):
+                self.wave.skip(missed)
+                self.tnext['set'] += missed * self.cfg_tsample_sec
+            num = self.setpoint_update()
+            self.tnext['set'] += num * self.cfg_tsample_sec
+        # telemetry
+        setp = self.clima.get('set') or SET_NONE    # not yet updated, f.e. paused before first set point
+        if ( measured and (None != self.trace) ):
+            self.trace.write(now, setp['val'], self.clima['get']['temperature'], self.clima['get']['humidity'], setp['grad'])
+        if ( measured and (None != self.export) ):
+            self.export.write(now, setp['val'], self.clima['get']['temperature'], self.clima['get']['humidity'], setp['grad'])
+        if ( measured and (None != self.cycles) ):
+            self.cycles.add(self.clima['get']['temperature'])
+        if ( measured and (None != self.dose) ):
+            self.dose.add(now, self.clima['get']['temperature'])
+        # user hooks, only queued
+        if ( None != self.hooks ):
+            meas = self.clima.get('get') or MEAS_NONE
+            self.hooks.notify(now, setp['val'], meas['temperature'], meas['humidity'], setp['grad'], updated)
+        # next wake up
+        twake = min(self.tnext['set'], self.tnext['meas']) if ( "run" == self.state ) else self.tnext['meas']
+        # state for API clients
+        if ( None != self.api ):
+            self.publish(now, time.perf_counter() - tcall)
+        return twake
+    #*****************************
+
+
+    #*****************************
+    def hook(self, event, fn):
+        """
+        @note               registers user callback, runs in worker pool
+                            off the control path, default pool on first call
+
+        @param event        tick, segment, peak
+        @param fn           callback, called with hookRec
+        @rtype              callable
+        @return             callback, usable as decorator
+        """
+        if ( None == self.hooks ):
+            from ATWG.telemetry.hooks import hookPool   # import if required
+            self.hooks = hookPool()
+        return self.hooks.add(event, fn)
+    #*****************************
+
+
+    #*****************************
+    def on_tick(self, fn):
+        """
+        @note               callback after every tick
+        """
+        return self.hook("tick", fn)
+    #*****************************
+
+
+    #*****************************
+    def on_segment_change(self, fn):
+        """
+        @note               callback when set point starts to rise, fall or hold
+        """
+        return self.hook("segment", fn)
+    #*****************************
+
+
+    #*****************************
+    def on_peak(self, fn):
+        """
+        @note               callback when set point passed maximum or minimum
+        """
+        return self.hook("peak", fn)
+    #*****************************
+
+
+    #*****************************
+    def command(self, cmd, now):
+        """
+        @note               applies remote command
+                              * pause:  set point holds, measurement continues
+                              * resume: waveform continues where paused
+                              * stop:   control loop ends
+
+        @param cmd          pause, resume, stop
+        @param now          current time in seconds
+        @rtype              string
+        @return             new state
+        """
+        if ( "pause" == cmd ):
+            if ( "run" == self.state ):
+                self.state = "pause"
+        elif ( "resume" == cmd ):
+            if ( "pause" == self.state ):
+                self.state = "run"
+                self.tnext['set'] = now     # paused time is not skipped
+        elif ( "stop" == cmd ):
+            self.state = "stop"
+        else:
+            raise ValueError("Unknown command '" + str(cmd) + "'")
+        return self.state
+    #*****************************
+
+
+    #*****************************
+    def publish(self, now, tick_sec):
+        """
+        @note               publishes state of current tick as immutable
+                            record, readers never block the control loop
+
+        @param now          current time in seconds
+        @param tick_sec     duration of current tick in seconds
+        @rtype              snapRec
+        @return             published snapshot
+        """
+        self.wakes += 1
+        self.tickMax = max(self.tickMax, tick_sec)
+        meas = self.clima.get('get') or MEAS_NONE
+        setp = self.clima.get('set') or SET_NONE   # not yet updated, f.e. paused
+        policy = getattr(self.chamber, 'policy', None)
+        if ( None == policy ):
+            written, skipped = self.ticks['set'], 0     # driver writes every set point
+        else:
+            written, skipped = policy.stats['written'], policy.stats['skipped']
+        self.snapshot = snapRec(
+            now, self.state,
+            meas['temperature'], meas['humidity'], setp['val'], setp['grad'],
+            now - self.tstart, self.wave.iterator / self.wave.waveDescr['x']['n'],
+            self.wakes, self.ticks['set'], self.ticks['meas'], written, skipped,
+            tick_sec, self.tickMax
+        )
+        return self.snapshot
+    #*****************************
     
     
     #*****************************
@@ -415,9 +851,29 @@ class ATWG:
         @rtype      string
         @return     current status as formated text string
         """
+        dose = None if ( None == self.dose ) else self.dose.status()
+        return self.status_text(info=self.chamber.info(), waveArgs=self.wave.waveArgs, tmeas=self.clima['get']['temperature'], tset=self.clima['set']['val'], grad=self.clima['set']['grad'], dose=dose)
+    #*****************************
+
+
+    #*****************************
+    def status_text(self, info, waveArgs, tmeas, tset, grad, dose=None):
+        """
+        @note           formats status text, w/o access to chamber
+                        used by UI process in split mode
+
+        @param info     chamber info, name and fracs
+        @param waveArgs waveform settings
+        @param tmeas    measured temperature
+        @param tset     set temperature
+        @param grad     set point gradient per second
+        @param dose     thermal dose status, None omits
+        @rtype          string
+        @return         current status as formated text string
+        """
         # prepare
-        numFracs = self.chamber.info()['fracs']['temperature']
-        grad_norm = self.normalize_gradient(grad_sec=self.clima['set']['grad'])
+        numFracs = info['fracs']['temperature']
+        grad_norm = self.normalize_gradient(grad_sec=grad)
         str = ""
         # build
         str += "\x1b[2J\n"  # delete complete output
@@ -425,15 +881,17 @@ class ATWG:
         str += "\n"
         str += "  Chamber\n"
         str += "    State    : Run " + self.spinner.__next__() + "\n"
-        str += "    Type     : " + self.chamber.info()['name'] + "\n"
-        str += "    Tmeas    : " + "{num:+.{frac}f} °C\n".format(num=self.clima['get']['temperature'], frac=numFracs)
-        str += "    Tset     : " + "{num:+.{frac}f} °C\n".format(num=self.clima['set']['val'], frac=numFracs)
+        str += "    Type     : " + info['name'] + "\n"
+        str += "    Tmeas    : " + "{num:+.{frac}f} °C\n".format(num=tmeas, frac=numFracs)
+        str += "    Tset     : " + "{num:+.{frac}f} °C\n".format(num=tset, frac=numFracs)
+        if ( None != dose ):
+            str += "    Stress   : " + self.sec_to_time(sec=round(dose['equivalent_sec'])) + " @ " + "{num:+.{frac}f} °C".format(num=dose['tref'], frac=numFracs) + ", AF {:.3g}\n".format(dose['af'])
         str += "\n"
         str += "  Waveform\n"
-        str += "    Shape    : " + self.wave.waveArgs['wave'] + "\n"
-        str += "    Tmin     : " + "{num:+.{frac}f} °C\n".format(num=self.wave.waveArgs['lowVal'], frac=numFracs)
-        str += "    Tmax     : " + "{num:+.{frac}f} °C\n".format(num=self.wave.waveArgs['highVal'], frac=numFracs)
-        str += "    Period   : " + self.sec_to_time(sec=self.wave.waveArgs['tp']) + "\n"
+        str += "    Shape    : " + waveArgs['wave'] + "\n"
+        str += "    Tmin     : " + "{num:+.{frac}f} °C\n".format(num=waveArgs['lowVal'], frac=numFracs)
+        str += "    Tmax     : " + "{num:+.{frac}f} °C\n".format(num=waveArgs['highVal'], frac=numFracs)
+        str += "    Period   : " + self.sec_to_time(sec=waveArgs['tp']) + "\n"
         str += "    Gradient : " + "{num:+.{frac}f} °C".format(num=grad_norm['val'], frac=numFracs+1) + "/" + grad_norm['base'] + "\n"
         str += "\n"
         str += "\n"
@@ -443,6 +901,29 @@ class ATWG:
     #*****************************
     
     
+    #*****************************
+    def analysis_text(self, cycles=None, dose=None):
+        """
+        @note           formats final rainflow and thermal dose result,
+                        w/o access to chamber, used by UI process in
+                        split mode
+
+        @param cycles   rainflow counter, None omits
+        @param dose     thermal dose accumulator, None omits
+        @rtype          string
+        @return         one info line per analysis
+        """
+        lines = []
+        if ( None != cycles ):
+            rep = cycles.report()
+            lines.append("Info: Rainflow {:.1f} cycles, max range {:.2f}C".format(rep['cycles'], rep['max_range']))
+        if ( None != dose ):
+            rep = dose.report()
+            lines.append("Info: Thermal dose " + self.sec_to_time(sec=round(rep['equivalent_sec'])) + " at {:.1f}C, mean AF {:.3g}".format(rep['tref'], rep['af_mean']))
+        return "\n".join(lines)
+    #*****************************
+    
+    
     #*****************************
     def close(self):
         """
@@ -453,6 +934,9 @@ class ATWG:
         """
         # close chamber handle
         self.chamber.close()
+        # pending user hooks
+        if ( None != self.hooks ):
+            self.hooks.close()
         # graceful end
         return True
     #*****************************
@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          rainflow.py
+@date:          2026-10-19
+
+@note           online rainflow cycle counting of measured temperature
+                  * reversals are detected with hysteresis, smaller
+                    reversals, f.e. chamber noise, are ignored
+                  * four point method on residue stack, closed cycles are
+                    counted when the reversal arrives, amortized O(1)
+                  * residue counts as half cycles in the report
+                  * cycle ranges in histogram of fixed bin width
+                  * live in ATWG tick or offline over CSV trace or archive
+                  * 'python3 -m ATWG.analysis.rainflow --bin=1 --hysteresis=0.1 run.atwa'
+@see            ASTM E1049-85, Standard Practices for Cycle Counting in Fatigue Analysis
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Standard
+import json                                         # report output
+import argparse                                     # command line
+# Self
+from ATWG.analysis.trackError import open_reader    # CSV trace or archive
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class rainflow:
+    """
+    @note:  incremental rainflow counter
+    """
+
+    #*****************************
+    def __init__(self, binWidth=1.0, hysteresis=0.0):
+        """
+        @note               empty counter
+
+        @param binWidth     histogram bin width of cycle range in C
+        @param hysteresis   reversals up to this range are ignored in C
+        """
+        if ( 0 >= binWidth ):
+            raise ValueError("Bin width needs to be positive")
+        if ( 0 > hysteresis ):
+            raise ValueError("Hysteresis needs to be non-negative")
+        self.binWidth = float(binWidth)
+        self.hysteresis = float(hysteresis)
+        # reversal detection
+        self.cand = None        # extreme since last reversal, not yet confirmed
+        self.dir = 0            # direction from last reversal to candidate
+        # counting
+        self.stack = []         # residue, confirmed reversals
+        self.hist = []          # closed cycles per range bin
+        self.cycles = 0         # closed cycles
+        self.maxRange = 0.0     # largest closed cycle
+        self.num = 0            # processed values
+        # published on every reversal, read by other threads
+        self.view = ((), (), 0.0)
+    #*****************************
+
+
+    #*****************************
+    def add(self, val):
+        """
+        @note           adds one measured temperature, nan is skipped
+
+        @param val      temperature in C
+        """
+        if ( val != val ):  # nan, f.e. failed measurement
+            return
+        self.num += 1
+        if ( None == self.cand ):               # first value is reversal
+            self.cand = val
+            self.reversal(val)
+        elif ( 0 == self.dir ):                 # direction of first slope
+            delta = val - self.stack[-1]
+            if ( abs(delta) > self.hysteresis ):
+                self.dir = 1 if ( 0 < delta ) else -1
+                self.cand = val
+        elif ( 0 <= (val - self.cand) * self.dir ):   # same direction, extreme grows
+            self.cand = val
+        elif ( abs(val - self.cand) > self.hysteresis ):
+            self.reversal(self.cand)
+            self.dir = -self.dir
+            self.cand = val
+    #*****************************
+
+
+    #*****************************
+    def add_block(self, vals):
+        """
+        @note           adds block of measured temperatures
+
+        @param vals     temperatures in C
+        """
+        for val in vals:
+            self.add(val)
+    #*****************************
+
+
+    #*****************************
+    def reversal(self, val):
+        """
+        @note           confirmed reversal, closes all cycles inside
+                        of the two neighboring ranges
+
+        @param val      temperature of reversal
+        """
+        stack = self.stack
+        stack.append(val)
+        self.closure(stack, self.count)
+        self.view = (tuple(self.hist), tuple(stack), self.maxRange)
+    #*****************************
+
+
+    #*****************************
+    def closure(self, stack, count):
+        """
+        @note           four point method, closes all cycles inside of the
+                        two neighboring ranges of the last reversal
+
+        @param stack    reversals, closed ones are removed
+        @param count    called with range of every closed cycle
+        """
+        while ( 4 <= len(stack) ):
+            inner = abs(stack[-2] - stack[-3])
+            if ( (inner > abs(stack[-1] - stack[-2])) or (inner > abs(stack[-3] - stack[-4])) ):
+                break
+            count(inner)
+            del stack[-3:-1]
+    #*****************************
+
+
+    #*****************************
+    def count(self, rng):
+        """
+        @note           counts one closed cycle
+
+        @param rng      cycle range in C
+        """
+        idx = int(rng / self.binWidth)
+        if ( len(self.hist) <= idx ):
+            self.hist.extend([0] * (idx + 1 - len(self.hist)))
+        self.hist[idx] += 1
+        self.cycles += 1
+        self.maxRange = max(self.maxRange, rng)
+    #*****************************
+
+
+    #*****************************
+    def feed(self, reader, col="tmeas"):
+        """
+        @note           processes complete trace or archive
+
+        @param reader   traceReader or archiveReader
+        @param col      counted column
+        @rtype          dict
+        @return         report
+        """
+        blocks = reader.columns(cols=(col,)) if ( hasattr(reader, 'columns') ) else reader.blocks()
+        for blk in blocks:
+            self.add_block(blk[col])
+        return self.report()
+    #*****************************
+
+
+    #*****************************
+    def report(self, residue=True):
+        """
+        @note               histogram as of last reversal, safe to call
+                            from other threads, f.e. API server
+
+        @param residue      end of data, unconfirmed last extreme is a
+                            reversal, closes its cycles, remaining
+                            residue ranges count as half cycles
+        @rtype              dict
+        @return             cycles, bin width, histogram, residue
+        """
+        closed, stack, maxRange = self.view         # single read, view is immutable
+        cand = self.cand
+        closed = list(closed)
+        halves = [0] * len(closed)
+        if ( residue ):
+            stack = list(stack)
+            if ( (0 != self.dir) and (0 < len(stack)) and (cand != stack[-1]) ):
+                ends = []
+                stack.append(cand)
+                self.closure(stack, ends.append)    # copy, counter continues
+                for rng in ends:
+                    idx = int(rng / self.binWidth)
+                    if ( len(closed) <= idx ):
+                        closed.extend([0] * (idx + 1 - len(closed)))
+                    closed[idx] += 1
+                    maxRange = max(maxRange, rng)
+            for first, second in zip(stack, stack[1:]):
+                rng = abs(second - first)
+                idx = int(rng / self.binWidth)
+                if ( len(halves) <= idx ):
+                    halves.extend([0] * (idx + 1 - len(halves)))
+                halves[idx] += 1
+                maxRange = max(maxRange, rng)
+        halves = halves + [0] * (len(closed) - len(halves))
+        closed = closed + [0] * (len(halves) - len(closed))
+        hist = []
+        for idx, (full, half) in enumerate(zip(closed, halves)):
+            if ( 0 < full + half ):
+                hist.append({'range_lo': idx * self.binWidth, 'range_hi': (idx + 1) * self.binWidth, 'cycles': full + half / 2, 'full': full, 'half': half})
+        return {
+            'cycles': sum(closed) + sum(halves) / 2,
+            'full': sum(closed),
+            'half': sum(halves),
+            'max_range': maxRange,
+            'bin_width': self.binWidth,
+            'hysteresis': self.hysteresis,
+            'hist': hist,
+            'residue': list(stack),
+        }
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="ATWG rainflow cycle counting")
+    parser.add_argument("--bin",        default=1.0, type=float, help="histogram bin width in C")
+    parser.add_argument("--hysteresis", default=0.0, type=float, help="reversals up to this range are ignored in C")
+    parser.add_argument("--col",        default="tmeas",         help="counted column, f.e. tset")
+    parser.add_argument("trace",                                 help="CSV trace or archive (*.atwa)")
+    args = parser.parse_args()
+    myCycles = rainflow(binWidth=args.bin, hysteresis=args.hysteresis)
+    print(json.dumps(myCycles.feed(open_reader(args.trace), col=args.col), indent=2))
+#------------------------------------------------------------------------------
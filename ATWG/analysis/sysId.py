@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          sysId.py
+@date:          2026-10-19
+
+@note           system identification of chamber dynamics from telemetry
+                  * model is the first order lag with dead time and
+                    asymmetric slew rate limit of the SIM chamber
+                  * telemetry is resampled to a fixed step, rate of
+                    measured temperature is
+                      dx/dt = a * (u(t - deadtime) - x), a = 1/tau
+                    while not slew rate limited
+                  * least squares through origin per dead time candidate,
+                    sums over whole log with builtins, best fit wins
+                  * samples with predicted rate beyond the slew rate are
+                    limited, their mean rate is the slew rate; slew rates
+                    and time constant are refined alternately
+                  * fitted model is stored in the lab inventory entry of the
+                    chamber, used by SIM chamber and lookahead
+                  * 'python3 -m ATWG.analysis.sysId --inventory=lab.yml --name=oven1 run.atwa'
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Standard
+import math                                     # log
+import json                                     # report output
+import argparse                                 # command line
+from array import array                         # resampled log
+from operator import sub, mul                   # block wise arithmetic
+from itertools import compress                  # block wise selection
+# Self
+from ATWG.analysis.trackError import open_reader    # CSV trace or archive
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+# Fit
+SYSID_ITER = 5          # refinement passes of time constant and slew rates
+SYSID_QUANTILE = 0.01   # rate quantile as first slew rate guess
+SYSID_MIN_SAT = 3       # slew limited samples needed for slew rate estimate
+SYSID_EXCESS = 0.1      # predicted rate beyond measured mean of slew limited samples
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class sysId:
+    """
+    @note:  fits chamber model to set/measured temperature
+    """
+
+    #*****************************
+    def __init__(self, step=10, maxDead=600):
+        """
+        @note               empty log
+
+        @param step         resample step in seconds, dead time resolution
+        @param maxDead      maximal searched dead time in seconds
+        """
+        if ( 0 >= step ):
+            raise ValueError("Resample step needs to be positive")
+        if ( 0 > maxDead ):
+            raise ValueError("Maximal dead time needs to be non-negative")
+        self.step = step
+        self.maxDead = maxDead
+        # resampled log, nan marks gap
+        self.u = array('d')     # set temperature
+        self.x = array('d')     # measured temperature
+        self.tnext = None       # time of next sample
+    #*****************************
+
+
+    #*****************************
+    def add_block(self, time, tset, tmeas):
+        """
+        @note           resamples block of records, latest record at or
+                        before sample time is taken
+
+        @param time     times in seconds
+        @param tset     set temperatures
+        @param tmeas    measured temperatures
+        """
+        nan = float('nan')
+        for t, u, x in zip(time, tset, tmeas):
+            if ( None == self.tnext ):
+                self.tnext = t
+            if ( t < self.tnext ):
+                continue
+            missed = math.floor((t - self.tnext) / self.step)
+            if ( 0 < missed ):              # gap, no pair across it at any dead time
+                pad = min(missed, math.ceil(self.maxDead / self.step) + 1)
+                self.u.extend([nan] * pad)
+                self.x.extend([nan] * pad)
+                self.tnext += missed * self.step
+            self.u.append(u)
+            self.x.append(x)
+            self.tnext += self.step
+    #*****************************
+
+
+    #*****************************
+    def feed(self, reader):
+        """
+        @note           resamples complete trace or archive and fits
+
+        @param reader   traceReader or archiveReader
+        @rtype          dict
+        @return         fitted model
+        """
+        cols = ("time", "tset", "tmeas")
+        blocks = reader.columns(cols=cols) if ( hasattr(reader, 'columns') ) else reader.blocks()
+        for blk in blocks:
+            self.add_block(*[blk[col] for col in cols])
+        return self.fit()
+    #*****************************
+
+
+    #*****************************
+    def regress(self, err, rate, lo, hi, a=None):
+        """
+        @note           rate over set point error, least squares through
+                        origin, predicted slew limited samples are removed
+
+        @param err      set point error u(t - deadtime) - x
+        @param rate     rate of measured temperature
+        @param lo       fall slew rate, C/s
+        @param hi       rise slew rate, C/s
+        @param a        previous fit, None takes all samples first
+        @rtype          tuple
+        @return         a, mean squared residual, samples
+        """
+        for i in range(SYSID_ITER):
+            if ( None == a ):
+                e, r = err, rate
+            else:
+                keep = [lo < a*ei < hi for ei in err]
+                e, r = list(compress(err, keep)), list(compress(rate, keep))
+            see = sum(map(mul, e, e))
+            if ( 0 == see ):
+                return float('nan'), float('inf'), 0
+            ser = sum(map(mul, e, r))
+            a = ser / see
+        sse = sum(map(mul, r, r)) - a * ser     # residual of fit through origin
+        return a, sse / len(e), len(e)
+    #*****************************
+
+
+    #*****************************
+    def limits(self, err, rate, a, lo, hi):
+        """
+        @note           slew rates, mean rate of samples whose predicted
+                        rate is beyond the limit; limit is dropped if
+                        measured rate there follows the lag anyway
+
+        @param err      set point error at fitted dead time
+        @param rate     rate of measured temperature
+        @param a        fitted inverse time constant
+        @param lo       fall slew rate, C/s
+        @param hi       rise slew rate, C/s
+        @rtype          tuple
+        @return         fall, rise, number of limited samples
+        """
+        pred = [a*e for e in err]
+        res = []
+        for sign, lim in ((-1, lo), (1, hi)):
+            sat = [(p, r) for p, r in zip(pred, rate) if ( sign*p >= sign*lim )]
+            if ( SYSID_MIN_SAT > len(sat) ):
+                res.append((lim, 0))
+                continue
+            p, r = (sum(col) / len(sat) for col in zip(*sat))
+            if ( sign*p > (1+SYSID_EXCESS) * sign*r ):  # predicted clearly beyond measured
+                res.append((r, len(sat)))
+            else:
+                res.append((sign*float('inf'), 0))
+        return res[0][0], res[1][0], (res[0][1], res[1][1])
+    #*****************************
+
+
+    #*****************************
+    def search(self, rate, lo, hi):
+        """
+        @note           least squares per dead time candidate
+
+        @param rate     rate of measured temperature
+        @param lo       fall slew rate, C/s
+        @param hi       rise slew rate, C/s
+        @rtype          tuple
+        @return         lag in steps incl. fraction, a, mean squared
+                        residual, samples
+        """
+        lags = round(self.maxDead / self.step)
+        num = len(self.x)
+        best = None
+        mse = []
+        for lag in range(lags + 1):
+            err = list(map(sub, self.u[0:num-1-lag], self.x[lag:num-1]))
+            keep = [(e == e) and (r == r) for e, r in zip(err, rate[lag:])]
+            res = self.regress(list(compress(err, keep)), list(compress(rate[lag:], keep)), lo, hi)
+            mse.append(res[1])
+            if ( (None == best) or (res[1] < best[2]) ):
+                best = (lag, res[0], res[1], res[2])
+        lag, a, err2, used = best
+        # sub step dead time, parabola through neighbors
+        if ( 0 < lag < lags ):
+            den = mse[lag-1] - 2*mse[lag] + mse[lag+1]
+            if ( 0 < den ):
+                lag += 0.5 * (mse[lag-1] - mse[lag+1]) / den
+        return lag, a, err2, used
+    #*****************************
+
+
+    #*****************************
+    def fit(self):
+        """
+        @note           fits model to resampled log, dead time search and
+                        slew rates are refined once
+
+        @rtype          dict
+        @return         tau, deadtime, rise, fall, fit quality and model
+                        for inventory; slew rates None if never limited
+        """
+        step = self.step
+        num = len(self.x)
+        if ( num < round(self.maxDead / step) + 10 ):
+            raise ValueError("Too few samples for identification, " + str(num) + " resampled")
+        # rate of measured temperature, forward difference
+        rate = [val / step for val in map(sub, self.x[1:], self.x[:-1])]
+        valid = sorted(val for val in rate if ( val == val ))
+        lo = valid[int(SYSID_QUANTILE * (len(valid)-1))]        # first guess, robust against noise
+        hi = valid[int((1-SYSID_QUANTILE) * (len(valid)-1))]
+        for i in range(2):
+            lag, a, err2, used = self.search(rate, lo, hi)
+            if not ( 0 < a * step < 1 ):
+                raise ValueError("No first order lag found in telemetry")
+            # slew rates and time constant at integer dead time
+            err = list(map(sub, self.u[0:num-1-round(lag)], self.x[round(lag):num-1]))
+            keep = [(e == e) and (r == r) for e, r in zip(err, rate[round(lag):])]
+            err, rt = list(compress(err, keep)), list(compress(rate[round(lag):], keep))
+            for j in range(SYSID_ITER):
+                lo, hi, sat = self.limits(err, rt, a, lo, hi)
+                a = self.regress(err, rt, lo, hi, a=a)[0]
+        # release, discrete step response to time constant
+        tau = -step / math.log(1 - a*step)
+        rates = {'fall': 60*lo if ( SYSID_MIN_SAT <= sat[0] ) else None, 'rise': 60*hi if ( SYSID_MIN_SAT <= sat[1] ) else None}
+        model = {'order': 1, 'tau': tau, 'deadtime': lag * step}
+        model.update({key: val for key, val in rates.items() if ( None != val )})
+        return {
+            'tau': tau,
+            'deadtime': lag * step,
+            'rise': rates['rise'],
+            'fall': rates['fall'],
+            'rmse': math.sqrt(max(0.0, err2)) * 60,
+            'samples': used,
+            'step': step,
+            'model': model,
+        }
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="ATWG chamber system identification")
+    parser.add_argument("--step",      default=10,  type=float, help="resample step in seconds")
+    parser.add_argument("--maxDead",   default=600, type=float, help="maximal dead time in seconds")
+    parser.add_argument("--inventory", default=None,            help="lab inventory, fitted model is stored in entry of '--name'")
+    parser.add_argument("--name",      default=None,            help="chamber name in inventory")
+    parser.add_argument("trace",                                help="CSV trace or archive (*.atwa)")
+    args = parser.parse_args()
+    if ( (None != args.inventory) and (None == args.name) ):
+        parser.error("'--inventory' needs '--name'")
+    myId = sysId(step=args.step, maxDead=args.maxDead)
+    res = myId.feed(open_reader(args.trace))
+    print(json.dumps(res, indent=2))
+    if ( None != args.inventory ):
+        from ATWG.driver.configCache import cfgCache
+        cfgCache.store_model(args.inventory, args.name, res['model'])
+#------------------------------------------------------------------------------
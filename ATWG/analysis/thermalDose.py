@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          thermalDose.py
+@date:          2026-10-19
+
+@note           online thermal dose of measured temperature
+                  * Arrhenius acceleration factor against reference
+                    temperature, AF = exp(Ea/k * (1/Tref - 1/T))
+                  * equivalent stress time at reference temperature is
+                    the time integral of AF
+                  * time at temperature histogram of fixed bin width
+                  * measurement holds until next one, constant time per
+                    record
+                  * live in ATWG tick or offline over CSV trace or archive
+                  * 'python3 -m ATWG.analysis.thermalDose --ea=0.7 --tref=25 run.atwa'
+@see            JEDEC JEP122, Failure Mechanisms and Models for Semiconductor Devices
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Standard
+import math                                         # exp
+import json                                         # report output
+import argparse                                     # command line
+# Self
+from ATWG.analysis.trackError import open_reader    # CSV trace or archive
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+# Physics
+DOSE_BOLTZMANN_EV = 8.617333262e-5  # Boltzmann constant in eV/K
+DOSE_KELVIN = 273.15                # 0C in K
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class thermalDose:
+    """
+    @note:  accumulates equivalent stress time and time at temperature
+    """
+
+    #*****************************
+    def __init__(self, ea=0.7, tref=25, binWidth=1.0, maxGap=float('inf')):
+        """
+        @note               empty accumulator
+
+        @param ea           activation energy in eV
+        @param tref         reference temperature in C
+        @param binWidth     histogram bin width in C
+        @param maxGap       longer time between measurements is not
+                            counted in seconds, f.e. chamber offline
+        """
+        if ( 0 > ea ):
+            raise ValueError("Activation energy needs to be non-negative")
+        if ( -DOSE_KELVIN >= tref ):
+            raise ValueError("Reference temperature needs to be above absolute zero")
+        if ( 0 >= binWidth ):
+            raise ValueError("Bin width needs to be positive")
+        self.ea = float(ea)
+        self.tref = float(tref)
+        self.binWidth = float(binWidth)
+        self.maxGap = maxGap
+        self.eak = self.ea / DOSE_BOLTZMANN_EV          # Ea/k in K
+        self.invRef = 1 / (self.tref + DOSE_KELVIN)     # 1/Tref in 1/K
+        # accumulated
+        self.equiv = 0.0        # equivalent time at reference temperature
+        self.elapsed = 0.0      # counted time
+        self.hist = {}          # bin index to seconds
+        self.num = 0            # processed measurements
+        # last measurement, holds until next
+        self.lastTime = None
+        self.lastAf = float('nan')
+        self.lastBin = None
+    #*****************************
+
+
+    #*****************************
+    def factor(self, temp):
+        """
+        @note           Arrhenius acceleration factor
+
+        @param temp     temperature in C
+        @rtype          float
+        @return         acceleration against reference temperature
+        """
+        if ( -DOSE_KELVIN >= temp ):
+            raise ValueError("Temperature " + str(temp) + "C is below absolute zero")
+        return math.exp(self.eak * (self.invRef - 1 / (temp + DOSE_KELVIN)))
+    #*****************************
+
+
+    #*****************************
+    def add(self, time, temp):
+        """
+        @note           adds one measurement, interval since last
+                        measurement is counted with last temperature
+
+        @param time     time in seconds
+        @param temp     measured temperature in C, nan interrupts
+        """
+        if ( None != self.lastBin ):
+            dt = time - self.lastTime
+            if ( 0 < dt <= self.maxGap ):
+                self.equiv += self.lastAf * dt
+                self.elapsed += dt
+                self.hist[self.lastBin] = self.hist.get(self.lastBin, 0.0) + dt
+        self.lastTime = time
+        if ( temp != temp ):    # nan, next interval is unknown
+            self.lastAf = float('nan')
+            self.lastBin = None
+            return
+        self.num += 1
+        self.lastAf = self.factor(temp)
+        self.lastBin = math.floor(temp / self.binWidth)
+    #*****************************
+
+
+    #*****************************
+    def add_block(self, time, temp):
+        """
+        @note           adds block of measurements
+
+        @param time     times in seconds
+        @param temp     temperatures in C
+        """
+        for rec in zip(time, temp):
+            self.add(*rec)
+    #*****************************
+
+
+    #*****************************
+    def feed(self, reader):
+        """
+        @note           processes complete trace or archive
+
+        @param reader   traceReader or archiveReader
+        @rtype          dict
+        @return         report
+        """
+        cols = ("time", "tmeas")
+        blocks = reader.columns(cols=cols) if ( hasattr(reader, 'columns') ) else reader.blocks()
+        for blk in blocks:
+            self.add_block(*[blk[col] for col in cols])
+        return self.report()
+    #*****************************
+
+
+    #*****************************
+    def status(self):
+        """
+        @note           current dose w/o histogram, constant time
+
+        @rtype          dict
+        @return         equivalent time, reference temperature, acceleration
+        """
+        return {'equivalent_sec': self.equiv, 'tref': self.tref, 'af': self.lastAf}
+    #*****************************
+
+
+    #*****************************
+    def report(self):
+        """
+        @note           accumulated dose up to last measurement, safe to
+                        call from other threads, f.e. API server
+
+        @rtype          dict
+        @return         equivalent time, mean and current acceleration,
+                        time at temperature
+        """
+        equiv, elapsed, hist = self.equiv, self.elapsed, dict(self.hist)
+        return {
+            'ea_ev': self.ea,
+            'tref': self.tref,
+            'equivalent_sec': equiv,
+            'elapsed_sec': elapsed,
+            'af_mean': equiv / elapsed if ( 0 < elapsed ) else float('nan'),
+            'af': self.lastAf,
+            'bin_width': self.binWidth,
+            'hist': [{'temp_lo': idx * self.binWidth, 'temp_hi': (idx + 1) * self.binWidth, 'sec': hist[idx]} for idx in sorted(hist)],
+        }
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="ATWG thermal dose")
+    parser.add_argument("--ea",     default=0.7, type=float,          help="activation energy in eV")
+    parser.add_argument("--tref",   default=25,  type=float,          help="reference temperature in C")
+    parser.add_argument("--bin",    default=1.0, type=float,          help="histogram bin width in C")
+    parser.add_argument("--maxGap", default=float('inf'), type=float, help="longer gaps between measurements are not counted in seconds")
+    parser.add_argument("trace",                                      help="CSV trace or archive (*.atwa)")
+    args = parser.parse_args()
+    myDose = thermalDose(ea=args.ea, tref=args.tref, binWidth=args.bin, maxGap=args.maxGap)
+    print(json.dumps(myDose.feed(open_reader(args.trace)), indent=2))
+#------------------------------------------------------------------------------
@@ -0,0 +1,405 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          trackError.py
+@date:          2026-10-19
+
+@note           streaming tracking error analysis of ATWG telemetry
+                  * error is measured minus set temperature
+                  * RMS, maximum, time in tolerance
+                  * phase lag by cross-correlation of decimated set and
+                    measured temperature
+                  * statistics per segment, segment is a run of rising,
+                    falling or holding set point
+                  * bounded memory, processed block wise with builtins
+                  * 'python3 -m ATWG.analysis.trackError --tol=0.5 run.atwa'
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Standard
+import math                                     # sqrt, isnan
+import json                                     # report output
+import argparse                                 # command line
+from operator import sub, mul                   # block wise arithmetic
+from itertools import compress, count           # block wise selection
+# Self
+from ATWG.telemetry.trace import traceReader            # CSV trace
+from ATWG.telemetry.archive import archiveReader, ARC_EXT   # archive
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+# Segments
+SEG_KINDS = {1: "rise", -1: "fall", 0: "hold"}  # sign of set point gradient
+SEG_GRAD_EPS = 1e-9                             # gradient below is hold, C/s
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+def open_reader(traceFile):
+    """
+    @note               telemetry reader selected by file extension
+
+    @param traceFile    '*.atwa' archive, otherwise CSV trace
+    @rtype              archiveReader | traceReader
+    @return             opened reader
+    """
+    if ( traceFile.endswith(ARC_EXT) ):
+        return archiveReader(traceFile)
+    return traceReader(traceFile)
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class trackError:
+    """
+    @note:  accumulates tracking error statistics
+    """
+
+    #*****************************
+    def __init__(self, tol=0.5, maxLag=3600, decimate=60, keepSegments=True, buffered=4096):
+        """
+        @note               initializes statistics
+
+        @param tol          tolerance band, absolute error in C
+        @param maxLag       maximal searched phase lag in seconds
+        @param decimate     samples averaged for cross-correlation, lag
+                            resolution before interpolation
+        @param keepSegments store every segment, otherwise only per kind
+        @param buffered     records collected by 'add' before processing
+        """
+        if ( 0 > tol ):
+            raise ValueError("Tolerance needs to be non-negative")
+        if ( 1 > decimate ):
+            raise ValueError("Decimation needs to be at least one")
+        self.tol = float(tol)   # float compare with measured errors
+        self.maxLag = maxLag
+        self.decimate = decimate
+        self.keepSegments = keepSegments
+        self.buffered = buffered
+        # overall
+        self.num = 0
+        self.sumSq = 0.0
+        self.maxErr = 0.0
+        self.maxTime = float('nan')
+        self.tolSec = 0.0
+        self.totSec = 0.0
+        self.lastTime = None
+        self.lastSet = None
+        # cross-correlation, lags in decimated samples, set on first block
+        self.lags = None
+        self.pend = ([], [])    # not yet decimated set/measured
+        self.tail = []          # last decimated set points, lag history
+        self.sxy = None         # sum of products per lag
+        self.sxl = None         # sum of lagged set points per lag
+        self.syl = None         # sum of measurements per lag
+        self.sxxl = None        # sum of squared lagged set points per lag
+        self.syyl = None        # sum of squared measurements per lag
+        self.nxy = None         # number of products per lag
+        self.nd = 0             # number of decimated samples
+        # segments
+        self.seg = None         # open segment
+        self.segments = []
+        self.kinds = {kind: {'count': 0, 'num': 0, 'sumSq': 0.0, 'max': 0.0, 'tolSec': 0.0, 'totSec': 0.0} for kind in SEG_KINDS.values()}
+        # record wise input
+        self.buf = ([], [], [], [])
+    #*****************************
+
+
+    #*****************************
+    def add(self, time, tset, tmeas, grad=float('nan')):
+        """
+        @note           adds one record, f.e. per 'chamber_update',
+                        processed block wise
+
+        @param time     time in seconds
+        @param tset     set temperature
+        @param tmeas    measured temperature
+        @param grad     set point gradient, nan: derived from tset
+        """
+        for col, val in zip(self.buf, (time, tset, tmeas, grad)):
+            col.append(val)
+        if ( self.buffered <= len(self.buf[0]) ):
+            self.flush()
+    #*****************************
+
+
+    #*****************************
+    def flush(self):
+        """
+        @note           processes records collected by 'add'
+        """
+        if ( 0 < len(self.buf[0]) ):
+            self.add_block(*self.buf)
+            self.buf = ([], [], [], [])
+    #*****************************
+
+
+    #*****************************
+    def feed(self, reader):
+        """
+        @note           processes complete trace or archive
+
+        @param reader   traceReader or archiveReader
+        @rtype          dict
+        @return         report
+        """
+        cols = ("time", "tset", "tmeas", "grad")
+        blocks = reader.columns(cols=cols) if ( hasattr(reader, 'columns') ) else reader.blocks()
+        for blk in blocks:
+            self.add_block(*[blk[col] for col in cols])
+        return self.report()
+    #*****************************
+
+
+    #*****************************
+    def add_block(self, time, tset, tmeas, grad=None):
+        """
+        @note           processes one block of records
+
+        @param time     list of times in seconds
+        @param tset     list of set temperatures
+        @param tmeas    list of measured temperatures
+        @param grad     list of set point gradients, None: derived from tset
+        """
+        # drop records w/o measurement
+        if ( any(map(math.isnan, tmeas)) or any(map(math.isnan, tset)) ):
+            keep = [not (math.isnan(m) or math.isnan(s)) for m, s in zip(tmeas, tset)]
+            time, tset, tmeas = list(compress(time, keep)), list(compress(tset, keep)), list(compress(tmeas, keep))
+            grad = None if ( None == grad ) else list(compress(grad, keep))
+        num = len(time)
+        if ( 0 == num ):
+            return
+        # error
+        err = list(map(sub, tmeas, tset))
+        aerr = list(map(abs, err))
+        sq = list(map(mul, err, err))
+        inTol = list(map(self.tol.__ge__, aerr))
+        prev = time[0] if ( None == self.lastTime ) else self.lastTime
+        dts = list(map(sub, time, [prev] + time[:-1]))   # sample weight, time since previous record
+        self.lastTime = time[-1]
+        # overall
+        self.num += num
+        self.sumSq += sum(sq)
+        blkMax = max(aerr)
+        if ( blkMax > self.maxErr ):
+            self.maxErr = blkMax
+            self.maxTime = time[aerr.index(blkMax)]
+        self.totSec += sum(dts)
+        self.tolSec += sum(compress(dts, inTol))
+        # segments
+        if ( (None == grad) or any(map(math.isnan, grad)) ):
+            prev = tset[min(1, num-1)] if ( None == self.lastSet ) else self.lastSet   # first record takes slope of second
+            grad = list(map(sub, tset, [prev] + tset[:-1]))     # backward difference
+            if ( None == self.lastSet ):
+                grad[0] = -grad[0]
+        self.lastSet = tset[-1]
+        kinds = list(map(sub, map(SEG_GRAD_EPS.__lt__, grad), map((-SEG_GRAD_EPS).__gt__, grad)))
+        edges = [0] + list(compress(count(1), map(sub, kinds[1:], kinds[:-1]))) + [num]
+        for first, last in zip(edges[:-1], edges[1:]):
+            self.segment(SEG_KINDS[kinds[first]], time[first], time[last-1], aerr[first:last], sq[first:last], dts[first:last], inTol[first:last])
+        # phase lag
+        self.correlate(tset, tmeas, dts)
+    #*****************************
+
+
+    #*****************************
+    def segment(self, kind, tstart, tstop, aerr, sq, dts, inTol):
+        """
+        @note           accumulates part of segment, segment closes on
+                        change of kind
+
+        @param kind     rise, fall, hold
+        @param tstart   time of first record
+        @param tstop    time of last record
+        @param aerr     absolute errors
+        @param sq       squared errors
+        @param dts      sample weights
+        @param inTol    in tolerance flags
+        """
+        if ( (None != self.seg) and (kind != self.seg['kind']) ):
+            self.close_segment()
+        if ( None == self.seg ):
+            self.seg = {'kind': kind, 'tstart': tstart, 'tstop': tstop, 'num': 0, 'sumSq': 0.0, 'max': 0.0, 'tolSec': 0.0, 'totSec': 0.0}
+        seg = self.seg
+        seg['tstop'] = tstop
+        seg['num'] += len(sq)
+        seg['sumSq'] += sum(sq)
+        seg['max'] = max(seg['max'], max(aerr))
+        seg['tolSec'] += sum(compress(dts, inTol))
+        seg['totSec'] += sum(dts)
+    #*****************************
+
+
+    #*****************************
+    def close_segment(self):
+        """
+        @note           closes open segment
+        """
+        seg = self.seg
+        self.seg = None
+        kind = self.kinds[seg['kind']]
+        kind['count'] += 1
+        for key in ('num', 'sumSq', 'tolSec', 'totSec'):
+            kind[key] += seg[key]
+        kind['max'] = max(kind['max'], seg['max'])
+        if ( self.keepSegments ):
+            self.segments.append(self.summary(seg, {'kind': seg['kind'], 'tstart': seg['tstart'], 'tstop': seg['tstop']}))
+    #*****************************
+
+
+    #*****************************
+    def correlate(self, tset, tmeas, dts):
+        """
+        @note           cross-correlation of decimated block, measured
+                        temperature is correlated with past set points
+
+        @param tset     set temperatures
+        @param tmeas    measured temperatures
+        @param dts      sample weights, first block defines sample time
+        """
+        # lags in decimated samples, sample time from first block
+        if ( None == self.lags ):
+            ts = (sum(dts) / (len(dts) - 1)) if ( 1 < len(dts) ) else 1
+            self.ts = ts if ( 0 < ts ) else 1
+            self.lags = max(1, round(self.maxLag / (self.ts * self.decimate)))
+            self.sxy = [0.0] * (self.lags + 1)
+            self.sxl = [0.0] * (self.lags + 1)
+            self.syl = [0.0] * (self.lags + 1)
+            self.sxxl = [0.0] * (self.lags + 1)
+            self.syyl = [0.0] * (self.lags + 1)
+            self.nxy = [0] * (self.lags + 1)
+        # decimate
+        px, py = self.pend
+        px += tset
+        py += tmeas
+        dec = self.decimate
+        full = len(px) - len(px) % dec
+        if ( 0 == full ):
+            return
+        xd = [sum(px[i:i+dec]) / dec for i in range(0, full, dec)]
+        yd = [sum(py[i:i+dec]) / dec for i in range(0, full, dec)]
+        self.pend = (px[full:], py[full:])
+        # accumulate
+        self.nd += len(xd)
+        ext = self.tail + xd
+        hist = len(self.tail)
+        for lag in range(self.lags + 1):
+            first = max(0, lag - hist)  # oldest set points not available
+            if ( first < len(yd) ):
+                xl = ext[hist+first-lag:hist+len(yd)-lag]
+                yl = yd[first:]
+                self.sxy[lag] += sum(map(mul, xl, yl))
+                self.sxl[lag] += sum(xl)
+                self.syl[lag] += sum(yl)
+                self.sxxl[lag] += sum(map(mul, xl, xl))
+                self.syyl[lag] += sum(map(mul, yl, yl))
+                self.nxy[lag] += len(yl)
+        self.tail = ext[-self.lags:]
+    #*****************************
+
+
+    #*****************************
+    def lag(self):
+        """
+        @note           phase lag at maximal normalized cross-correlation,
+                        parabolic interpolated
+
+        @rtype          dict
+        @return         lag in seconds, Pearson coefficient at lag;
+                        nan if not enough samples
+        """
+        if ( (None == self.sxy) or (2 > self.nd) ):
+            return {'sec': float('nan'), 'corr': float('nan')}
+        corr = []
+        for sxy, sx, sy, sxx, syy, num in zip(self.sxy, self.sxl, self.syl, self.sxxl, self.syyl, self.nxy):
+            var = (sxx - sx * sx / num) * (syy - sy * sy / num) if ( 1 < num ) else 0
+            corr.append((sxy - sx * sy / num) / math.sqrt(var) if ( 0 < var ) else float('-inf'))
+        peak = corr.index(max(corr))
+        if ( float('-inf') == corr[peak] ):
+            return {'sec': float('nan'), 'corr': float('nan')}
+        shift = 0.0
+        if ( (0 < peak < self.lags) and (float('-inf') not in corr[peak-1:peak+2]) ):
+            den = corr[peak-1] - 2 * corr[peak] + corr[peak+1]
+            if ( 0 > den ):
+                shift = 0.5 * (corr[peak-1] - corr[peak+1]) / den
+        return {'sec': (peak + shift) * self.decimate * self.ts, 'corr': corr[peak]}
+    #*****************************
+
+
+    #*****************************
+    def summary(self, acc, res):
+        """
+        @note           RMS, max and tolerance of accumulator
+
+        @param acc      num, sumSq, max, tolSec, totSec
+        @param res      dict extended by statistics
+        @rtype          dict
+        @return         res
+        """
+        res['rms'] = math.sqrt(acc['sumSq'] / acc['num']) if ( 0 < acc['num'] ) else float('nan')
+        res['max'] = acc['max']
+        res['in_tol_sec'] = acc['tolSec']
+        res['in_tol_frac'] = acc['tolSec'] / acc['totSec'] if ( 0 < acc['totSec'] ) else float('nan')
+        return res
+    #*****************************
+
+
+    #*****************************
+    def report(self):
+        """
+        @note           statistics of all processed records, open segment
+                        is included, processing can continue
+
+        @rtype          dict
+        @return         overall, lag, per segment kind and segments
+        """
+        self.flush()
+        res = self.summary({'num': self.num, 'sumSq': self.sumSq, 'max': self.maxErr, 'tolSec': self.tolSec, 'totSec': self.totSec}, {'samples': self.num, 'duration_sec': self.totSec, 'tol': self.tol})
+        res['max_time'] = self.maxTime
+        res['lag'] = self.lag()
+        # open segment counts as closed
+        kinds = {kind: dict(acc) for kind, acc in self.kinds.items()}
+        segments = list(self.segments)
+        if ( None != self.seg ):
+            acc = kinds[self.seg['kind']]
+            acc['count'] += 1
+            for key in ('num', 'sumSq', 'tolSec', 'totSec'):
+                acc[key] += self.seg[key]
+            acc['max'] = max(acc['max'], self.seg['max'])
+            if ( self.keepSegments ):
+                segments.append(self.summary(self.seg, {'kind': self.seg['kind'], 'tstart': self.seg['tstart'], 'tstop': self.seg['tstop']}))
+        res['kinds'] = {kind: self.summary(acc, {'count': acc['count']}) for kind, acc in kinds.items()}
+        if ( self.keepSegments ):
+            res['segments'] = segments
+        return res
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="ATWG tracking error analysis")
+    parser.add_argument("--tol",        default=0.5,  type=float, help="tolerance band in C")
+    parser.add_argument("--maxLag",     default=3600, type=float, help="maximal phase lag in seconds")
+    parser.add_argument("--decimate",   default=60,   type=int,   help="samples averaged for cross-correlation")
+    parser.add_argument("--segments",   action='store_true',      help="list every segment")
+    parser.add_argument("trace",                                  help="CSV trace or archive (*.atwa)")
+    args = parser.parse_args()
+    myTrack = trackError(tol=args.tol, maxLag=args.maxLag, decimate=args.decimate, keepSegments=args.segments)
+    print(json.dumps(myTrack.feed(open_reader(args.trace)), indent=2))
+#------------------------------------------------------------------------------
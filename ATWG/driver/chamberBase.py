@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          chamberBase.py
+@date:          2026-10-19
+
+@note           common protocol of chamber drivers
+                  * measure() fills a preallocated clima record, reused
+                    every tick, no per tick dict
+                  * set_clima() accepts dicts and clima records
+                  * get_clima() remains as dict interface
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Standard
+import abc      # driver protocol
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class climaRec:
+    """
+    @note:  slot based clima record, item access as for the dict interface
+    """
+    __slots__ = ('temperature', 'humidity')
+
+    #*****************************
+    def __init__(self, temperature=float('nan'), humidity=float('nan')):
+        self.temperature = temperature
+        self.humidity = humidity
+    #*****************************
+
+    #*****************************
+    def __getitem__(self, key):
+        return getattr(self, key)
+    #*****************************
+
+    #*****************************
+    def __setitem__(self, key, value):
+        setattr(self, key, value)
+    #*****************************
+
+    #*****************************
+    def as_dict(self):
+        """
+        @note           dict copy of record
+
+        @rtype          dict
+        @return         {'temperature':, 'humidity':}
+        """
+        return {'temperature': self.temperature, 'humidity': self.humidity}
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class chamberBase(abc.ABC):
+    """
+    @note:  base of chamber drivers, derived driver implements measure()
+            and set_clima(); plugin drivers w/o base are called via
+            get_clima()
+    """
+
+    #*****************************
+    def __init__(self):
+        """
+        @note           preallocates records
+        """
+        self.meas = climaRec()  # last measurement, overwritten by measure()
+    #*****************************
+
+
+    #*****************************
+    @abc.abstractmethod
+    def measure(self):
+        """
+        @note           acquires clima into self.meas
+
+        @rtype          climaRec
+        @return         self.meas
+        """
+    #*****************************
+
+
+    #*****************************
+    def get_clima(self):
+        """
+        @note           Current measured clima
+
+        @rtype          dict
+        @return         humidity/temperature vals
+        """
+        return self.measure().as_dict()
+    #*****************************
+
+#------------------------------------------------------------------------------
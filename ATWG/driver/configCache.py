@@ -0,0 +1,332 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          configCache.py
+@date:          2026-10-19
+
+@note           cached YAML configuration of drivers
+                  * parsed and validated once per process
+                  * disk cache as JSON, invalidated by mtime and size
+                  * user cache holds only configs shipped with the drivers,
+                    other configs, f.e. sim dialogs or temporary inventories,
+                    need an explicit cache directory
+                  * entries of deleted configs are evicted on store
+                  * lab inventory with per chamber interface overrides and
+                    identified thermal model
+
+                inventory file:
+                  chambers:
+                    oven1:
+                      driver: ESPEC_SH641
+                      port: /dev/ttyUSB1
+                      baudrate: 19200
+                      timeout: 2
+                      model:            # written by ATWG.analysis.sysId
+                        order: 1
+                        tau: 412.5
+                        deadtime: 85.0
+                        rise: 2.41
+                        fall: -1.38
+"""
+
+
+
+#------------------------------------------------------------------------------
+import os           # paths, modification time
+import json         # fast loading disk cache
+import hashlib      # cache file name
+import copy         # callers get private copy
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+# Constants
+CFG_CACHE_ENV = "ATWG_CACHE_DIR"    # overwrites disk cache directory, empty disables
+CFG_SHIPPED_DIR = os.path.dirname(os.path.abspath(__file__))    # configs shipped with drivers
+CFG_INV_SCHEMA = {                  # inventory entry, mandatory driver, optional interface overrides
+    'driver': (str,),
+    'port': (str,),
+    'baudrate': (int,),
+    'timeout': (int, float),
+    'model': (dict,),
+}
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class configCache:
+    """
+    @note:  loads YAML configs, memory and disk cached
+    """
+
+    #*****************************
+    def __init__(self, cacheDir=None):
+        """
+        @note           initializes cache
+
+        @param cacheDir disk cache directory, None: $ATWG_CACHE_DIR or user cache, "": no disk cache
+        """
+        self.shippedOnly = False    # explicit cache directory holds every config
+        if ( None == cacheDir ):
+            cacheDir = os.environ.get(CFG_CACHE_ENV)
+        if ( None == cacheDir ):
+            cacheDir = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")), "atwg")
+            self.shippedOnly = True
+        self.cacheDir = cacheDir
+        self.mem = {}   # absolute path to (stamp, config)
+        self.stats = {'mem': 0, 'disk': 0, 'parse': 0}
+    #*****************************
+
+
+    #*****************************
+    def load(self, cfgFile, schema=None):
+        """
+        @note           loads config, YAML is only parsed on changed file
+
+        @param cfgFile  YAML file
+        @param schema   mandatory top level keys to tuple of allowed types
+        @rtype          dict
+        @return         config, private copy
+        """
+        # check file
+        cfgFile = os.path.abspath(cfgFile)
+        if ( False == os.path.isfile(cfgFile) ):
+            raise FileNotFoundError("Configuration file '" + cfgFile + "' not found")
+        st = os.stat(cfgFile)
+        stamp = [st.st_mtime_ns, st.st_size]
+        # memory
+        if ( (cfgFile in self.mem) and (stamp == self.mem[cfgFile][0]) ):
+            self.stats['mem'] += 1
+            return copy.deepcopy(self.mem[cfgFile][1])
+        # disk
+        cfg = self.disk_load(cfgFile, stamp)
+        if ( None != cfg ):
+            self.stats['disk'] += 1
+        # parse and validate
+        else:
+            import yaml     # only on cache miss
+            with open(cfgFile, 'r') as fH:
+                cfg = yaml.safe_load(fH)
+            self.check(cfgFile, cfg, schema)
+            self.disk_store(cfgFile, stamp, cfg)
+            self.stats['parse'] += 1
+        # release
+        self.mem[cfgFile] = (stamp, cfg)
+        return copy.deepcopy(cfg)
+    #*****************************
+
+
+    #*****************************
+    def check(self, cfgFile, cfg, schema):
+        """
+        @note           validates config against schema
+
+        @param cfgFile  config file, used in error message
+        @param cfg      parsed config
+        @param schema   mandatory top level keys to tuple of allowed types
+        """
+        if not ( isinstance(cfg, dict) ):
+            raise ValueError("Configuration '" + cfgFile + "' is not a mapping")
+        for key, types in (schema or {}).items():
+            if not ( key in cfg ):
+                raise ValueError("Configuration '" + cfgFile + "' misses '" + key + "'")
+            if not ( isinstance(cfg[key], types) ):
+                raise ValueError("Configuration '" + cfgFile + "' entry '" + key + "' has unsupported type '" + type(cfg[key]).__name__ + "'")
+    #*****************************
+
+
+    #*****************************
+    def disk_name(self, cfgFile):
+        """
+        @note           disk cache file of config
+
+        @rtype          string
+        @return         path, None if disabled
+        """
+        if ( 0 == len(self.cacheDir) ):
+            return None
+        if ( self.shippedOnly and not cfgFile.startswith(CFG_SHIPPED_DIR + os.sep) ):
+            return None
+        return os.path.join(self.cacheDir, hashlib.sha1(cfgFile.encode()).hexdigest() + ".json")
+    #*****************************
+
+
+    #*****************************
+    def disk_load(self, cfgFile, stamp):
+        """
+        @note           reads disk cache, stale or broken cache is a miss
+
+        @rtype          dict
+        @return         config, None on miss
+        """
+        cacheFile = self.disk_name(cfgFile)
+        try:
+            with open(cacheFile, 'r') as fH:
+                entry = json.load(fH)
+            if ( (entry['src'] == cfgFile) and (entry['stamp'] == stamp) ):
+                return entry['cfg']
+        except (TypeError, OSError, ValueError, KeyError):
+            pass
+        return None
+    #*****************************
+
+
+    #*****************************
+    def disk_store(self, cfgFile, stamp, cfg):
+        """
+        @note           writes disk cache, read-only cache directory is ignored
+        """
+        cacheFile = self.disk_name(cfgFile)
+        if ( None == cacheFile ):
+            return
+        try:
+            os.makedirs(self.cacheDir, exist_ok=True)
+            tmpFile = cacheFile + "." + str(os.getpid())
+            with open(tmpFile, 'w') as fH:
+                json.dump({'src': cfgFile, 'stamp': stamp, 'cfg': cfg}, fH)
+            os.replace(tmpFile, cacheFile)  # atomic, concurrent readers see old or new
+        except (OSError, TypeError, ValueError):
+            pass    # not JSON serializable or not writable, memory cache only
+        self.evict()
+    #*****************************
+
+
+    #*****************************
+    def evict(self):
+        """
+        @note           removes cache entries of deleted configs, only on
+                        store, loads never scan the cache directory
+
+        @rtype          int
+        @return         number of removed entries
+        """
+        num = 0
+        try:
+            names = [name for name in os.listdir(self.cacheDir) if ( (45 == len(name)) and name.endswith(".json") )]    # sha1 named, foreign files stay
+        except OSError:
+            return num
+        for name in names:
+            cacheFile = os.path.join(self.cacheDir, name)
+            try:
+                with open(cacheFile, 'r') as fH:
+                    src = json.load(fH)['src']
+                if ( os.path.isfile(src) ):
+                    continue
+            except (TypeError, OSError, ValueError, KeyError):
+                pass    # broken entry
+            try:
+                os.remove(cacheFile)
+                num += 1
+            except OSError:
+                pass    # removed by concurrent process
+        return num
+    #*****************************
+
+
+    #*****************************
+    def inventory(self, invFile, name):
+        """
+        @note           chamber entry of lab inventory
+
+        @param invFile  inventory YAML file
+        @param name     chamber name in inventory
+        @rtype          dict
+        @return         driver and interface overrides
+        """
+        inv = self.load(invFile, schema={'chambers': (dict,)})
+        if not ( name in inv['chambers'] ):
+            raise ValueError("Chamber '" + name + "' not in inventory '" + invFile + "'")
+        entry = inv['chambers'][name]
+        if not ( isinstance(entry, dict) and ('driver' in entry) ):
+            raise ValueError("Inventory entry '" + name + "' misses 'driver'")
+        for key, value in entry.items():
+            if not ( key in CFG_INV_SCHEMA ):
+                raise ValueError("Inventory entry '" + name + "' has unknown key '" + key + "'")
+            if not ( isinstance(value, CFG_INV_SCHEMA[key]) ):
+                raise ValueError("Inventory entry '" + name + "' key '" + key + "' has unsupported type '" + type(value).__name__ + "'")
+        return entry
+    #*****************************
+
+
+    #*****************************
+    def store_model(self, invFile, name, model):
+        """
+        @note           writes thermal model into chamber entry of lab
+                        inventory, only the 'model' mapping of the entry
+                        is replaced, comments and formatting stay
+
+        @param invFile  inventory YAML file
+        @param name     chamber name in inventory
+        @param model    thermal model, f.e. {'order': 1, 'tau': 300}
+        """
+        import yaml     # only on write
+        self.inventory(invFile, name)   # entry exists and is valid
+        model = {key: (val if ( "order" == key ) else float(val)) for key, val in model.items()}
+        with open(invFile, 'r') as fH:
+            orig = fH.read()
+        lines = orig.splitlines()
+        indent = lambda line: len(line) - len(line.lstrip(" "))
+        key = lambda line: line.split("#")[0].strip()   # w/o comment, '' on blank or comment line
+        # entry line below top level 'chambers'
+        entry = None
+        inside = False
+        for i, line in enumerate(lines):
+            if ( (0 < len(key(line))) and (0 == indent(line)) ):
+                inside = ( "chambers:" == key(line) )
+            elif ( inside and (key(line) in (name + ":", "'" + name + "':", '"' + name + '":')) ):
+                entry = i
+                break
+        # keys of entry, last line and existing model mapping
+        child, last, modelAt = None, entry, None
+        for i in range(len(lines) if ( None == entry ) else entry + 1, len(lines)):
+            if ( 0 == len(key(lines[i])) ):
+                continue
+            if ( indent(lines[i]) <= indent(lines[entry]) ):
+                break
+            child = indent(lines[i]) if ( None == child ) else child
+            if ( (indent(lines[i]) == child) and key(lines[i]).startswith("model:") ):
+                modelAt = i
+            last = i
+        if ( None == child ):
+            raise ValueError("Inventory entry '" + name + "' is no block mapping, update '" + invFile + "' manually")
+        block = [" " * child + "model:"] + [" " * (2*child - indent(lines[entry])) + str(k) + ": " + repr(v) for k, v in model.items()]
+        # replace existing model mapping or append to entry
+        if ( None != modelAt ):
+            stop = modelAt + 1
+            for i in range(modelAt + 1, last + 1):
+                if ( 0 < len(key(lines[i])) ):
+                    if ( indent(lines[i]) <= child ):
+                        break
+                    stop = i + 1
+            lines[modelAt:stop] = block
+        else:
+            lines[last+1:last+1] = block
+        text = "\n".join(lines) + "\n"
+        # only the model changed
+        inv = yaml.safe_load(orig)
+        inv['chambers'][name]['model'] = model
+        if ( yaml.safe_load(text) != inv ):
+            raise ValueError("Inventory '" + invFile + "' layout not supported, update model of '" + name + "' manually")
+        tmpFile = invFile + "." + str(os.getpid())
+        with open(tmpFile, 'w') as fH:
+            fH.write(text)
+        os.replace(tmpFile, invFile)    # atomic, concurrent readers see old or new
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+# shared by all drivers of the process
+cfgCache = configCache()
+#------------------------------------------------------------------------------
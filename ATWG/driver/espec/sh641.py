@@ -37,51 +37,75 @@ Pinning:
 
 #------------------------------------------------------------------------------
 import os                  # platform independent paths
+import math                # program step splitting, nan
 import serial              # COM port Interface
-import math                # required for isnan
-import yaml                # port config
 from . import sh641Const   # ESPEC SH641 constants
+from .sh641Codec import sh641Codec, measRec, ackRec  # response decoder
+from ..trace.serialTrace import serialRecorder, serialReplay  # record/replay serial traffic
+from ..writePolicy import writePolicy                         # set point write coalescing
+from ..configCache import cfgCache                            # parsed interface config
+from ..chamberBase import chamberBase                         # driver protocol
 #------------------------------------------------------------------------------
 
 
 
 #------------------------------------------------------------------------------
-class especShSu:
+class especShSu(chamberBase):
     
     #*****************************
     def __init__(self):
         """
         Initialization of class
         """
+        super().__init__()
         # Com interface
         self.sim = None
-        self.sim_rd = ""        # stores answer of next read request
+        self.sim_rd = b""       # stores answer of next read request
         # managment flags
         self.isOpen = False;    # interface is open
         # internal
-        self.last_write_temp = float("nan") # stores last written value, used for reduction
+        self.last_write_temp = float("nan") # stores last written value
+        self.policy = writePolicy(resolution=sh641Const.MSC_TEMP_RESOLUTION) # write only changed chamber set points
+        self.codec = sh641Codec()           # response decoder
+        self.lineEnd = sh641Const.MSC_LINE_END.encode()
     #*****************************
 
 
     #*****************************
-    def open(self, port="", simFile=""):
+    def open(self, port="", simFile="", recFile="", replayFile="", replaySpeed=1.0, baudrate=None, timeout=None):
         """
         Opens COM port and try to recognize the climate chamber
         SRC: http://www.varesano.net/blog/fabio/serial%20rs232%20connections%20python
+
+        Arguments:
+            port:           serial port, overwrites interface default
+            simFile:        dialog file, answers from static request table
+            recFile:        records serial traffic of the opened port
+            replayFile:     replays recorded serial traffic instead of port
+            replaySpeed:    1: original timing, 0: as fast as possible
+            baudrate:       overwrites interface default
+            timeout:        read timeout in sec, overwrites interface default
         """
         # Clima chamber interface mode
-        if ( 0 == len(simFile) ):
+        if ( 0 < len(replayFile) ):
+            # exists?
+            if ( False == os.path.isfile(replayFile) ):
+                raise FileNotFoundError("Replay file '" + replayFile + "' not found")
+            self.com = serialReplay(logFile=replayFile, speed=replaySpeed)
+        elif ( 0 == len(simFile) ):
             # default interface config
             cfgFile = os.path.dirname(os.path.abspath(__file__)) + os.path.sep + sh641Const.IF_DFLT_CFG
             if ( False == os.path.isfile(cfgFile) ):
                 raise FileNotFoundError("Interface configuration file '" + cfgFile + "' not found")
-            # load interface config
-            fH = open(cfgFile, 'r+')                          # open file for yaml loader
-            itfConfig = yaml.load(fH, Loader=yaml.FullLoader) # load condig
-            fH.close();                                       # close file handle
+            # load interface config, parsed only once
+            itfConfig = cfgCache.load(cfgFile, schema=sh641Const.IF_CFG_SCHEMA)
             # user specifies path to chamber
             if ( 0 < len(port) ):
                 itfConfig['rs232'][os.name] = port
+            if ( None != baudrate ):
+                itfConfig['baudrate'] = baudrate
+            if ( None != timeout ):
+                itfConfig['tiout_sec'] = timeout
             # open interface
             #   https://pyserial.readthedocs.io/en/latest/
             try:
@@ -95,6 +119,9 @@ class especShSu:
                            )
             except:
                 raise ValueError("Failed open port '" + itfConfig['rs232'][os.name] + "' for " + self.info()['name'])
+            # capture traffic
+            if ( 0 < len(recFile) ):
+                self.com = serialRecorder(com=self.com, logFile=recFile)
         # simulation mode, Req/Res from file
         else:
             # User info
@@ -102,10 +129,8 @@ class especShSu:
             # exists?
             if ( False == os.path.isfile(simFile) ):
                 raise FileNotFoundError("Dialog file '" + simFile + "' not found")
-            # open file and load
-            fH = open(simFile, 'r+')                            # open file for yaml loader
-            self.sim = yaml.load(fH, Loader=yaml.FullLoader)    # load condig
-            fH.close();                                         # close file handle
+            # load
+            self.sim = cfgCache.load(simFile, schema={'req': (dict,)})
         # mark interface/sim as open
         self.isOpen = True
         # try to indentify chamber
@@ -143,13 +168,13 @@ class especShSu:
         # prepare record answer
         if ( None != self.sim ):
             # make empty
-            self.sim_rd = ""
+            self.sim_rd = b""
             # request command
             if ("?" == msg[-1]):
-                self.sim_rd = self.sim['req'][msg[:-1]]     # add to next read buffer
+                self.sim_rd = str(self.sim['req'][msg[:-1]]).encode()   # add to next read buffer
             # set command, build ack message
             else:
-                self.sim_rd = sh641Const.RSP_OK + ":" + msg
+                self.sim_rd = (sh641Const.RSP_OK + ":" + msg).encode()
         # pyhsical interface used
         else:
             # bring to line
@@ -168,24 +193,35 @@ class especShSu:
         @rtype          string
         @return         chamber reponse in ASCII text
         """
+        return self.read_raw().decode()
+    #*****************************
+
+
+    #*****************************
+    def read_raw(self):
+        """
+        @note           reads one response frame from serial port, frame
+                        remains as bytes for the codec
+
+        @rtype          bytes
+        @return         chamber reponse w/o line end
+        """
         # interface open or sim mode?
         if ( False == self.isOpen ):
             raise ValueError("Interface nor sim mode used")
-        # make empty
-        msg = ""
         # prepare record answer
         if ( None != self.sim ):
             msg = self.sim_rd   # respond to previous request
-            self.sim_rd = ""    # clear
+            self.sim_rd = b""   # clear
         # pyhsical interface used
         else:
-            # read from COM
-            while ( False == (sh641Const.MSC_LINE_END in msg) ):
-                byte = self.com.read(1);
-                msg += byte.decode()
+            # read from COM, returns incomplete frame on timeout
+            msg = self.com.read_until(self.lineEnd)
+            if ( False == msg.endswith(self.lineEnd) ):
+                raise ValueError("Chamber response timeout")
             # drop line end and return
-            msg = msg[:-len(sh641Const.MSC_LINE_END)]   # skip CRNL
-            msg = msg.strip()                           # remove leading/trailing blanks
+            msg = msg[:-len(self.lineEnd)]  # skip CRNL
+            msg = msg.strip()               # remove leading/trailing blanks
         # all done
         return msg
     #*****************************
@@ -197,64 +233,24 @@ class especShSu:
         @note           parses chamber responses
                           * set command
                           * get command
+                        dict interface on top of the codec, the driver
+                        internal request path uses the codec records
 
         @param msg      chamber response string
-        @type           string
+        @type           string | bytes
         @rtype          dict
         @return         {'state': , 'parm': , 'val', :} in case of measuement
                         command contents contents val a dict
         """
-        # check for message
-        if ( 0 == len(msg) ):
-            raise ValueError("Empty message to parse provided")
-        # dict
-        myParse = {}
+        # align to codec
+        if ( isinstance(msg, str) ):
+            msg = msg.encode()
+        rsp = self.codec.decode(msg)
         # Set Command / Failed Request
-        if ( -1 != msg.find(":") ):
-            # split at ':', f.e. OK:TEMP,S25
-            msg = msg.split(':')        # OK:TEMP,S25 -> ['OK', 'TEMP,S25']
-            myParse['state'] = msg[0]   # 'OK'
-            msg = msg[1];               # 'TEMP,S25'
-            # split at ',', f.e. 'TEMP,S25'
-            msg = msg.split(',')        # 'TEMP,S25' -> ['TEMP', 'S25']
-            # iterate over list
-            i = 0                       # helps to align
-            myParse['parm'] = ""
-            myParse['val'] = ""         # for recursive alignment
-            for elem in msg:
-                if ( 0 == i ):  myParse['parm'] = elem
-                if ( 0 < i ):   myParse['val'] = myParse['val'] + elem + ','    # collect rest of param
-                i += 1
-            # drop last ',' in 'val'
-            myParse['val'] = myParse['val'][0:-1]
+        if ( isinstance(rsp, ackRec) ):
+            return {'state': rsp.state, 'parm': rsp.parm, 'val': rsp.val.decode()}
         # measurement command
-        else:
-            # prepare dicts
-            myParse['state'] = sh641Const.RSP_OK    # 'OK'
-            myParse['parm'] = "MEAS"                # measurement command was applied
-            myMeas = {}                             # dict for measurment values
-            myMeas['measured'] = float("nan")       # always full dict is returned
-            myMeas['setpoint'] = float("nan")       #
-            myMeas['upalarm']  = float("nan")       #
-            myMeas['lowalarm'] = float("nan")       #
-            # parse response
-            i = 0
-            for elem in msg.split(','):
-                # non-numeric input, skip iteration
-                if ( False == self.is_numeric(elem.strip()) ):
-                    i+=1
-                    continue
-                # allign to dict
-                if ( 0 == i ): myMeas['measured'] = float(elem.strip())                 # measured
-                if ( 1 == i ): myMeas['setpoint'] = float(elem.strip())                 # set-point
-                if ( 2 == i ): myMeas['upalarm'] = float(elem.strip())                  # upper-limit-alarm-value
-                if ( 3 == i ): myMeas['lowalarm'] = float(elem.strip())                 # lower-limit-alarm-value
-                if ( 3 < i): raise ValueError("Unrecognized response in '" + msg + "'") # something went wrong
-                i+=1
-            # assign to reponse dict
-            myParse['val'] = myMeas;
-        # release parsed structure
-        return myParse
+        return {'state': sh641Const.RSP_OK, 'parm': "MEAS", 'val': rsp._asdict()}
     #*****************************
 
 
@@ -277,31 +273,33 @@ class especShSu:
 
 
     #*****************************
-    def get_clima(self):
+    def measure(self):
         """
-        @note           Current measured clima
+        @note           Current measured clima, record is reused
 
-        @rtype          dict
+        @rtype          climaRec
         @return         humidity/temperature vals
         """
         # init resut
-        clima = {'temperature': float('nan'), 'humidity': float('nan')}
+        clima = self.meas
+        clima.temperature = math.nan
+        clima.humidity = math.nan
         # acquire temperature
         try:
             self.write(sh641Const.CMD_GET_TEMP)             # write temperature request to chamber
-            rsp = self.parse(self.read())                   # read/parse; dict: measured, setpoint, upalarm, lowalarm
-            if not ( (sh641Const.RSP_OK == rsp['state']) and ("MEAS" == rsp['parm']) ):
+            rsp = self.codec.decode(self.read_raw())        # read/decode; measured, setpoint, upalarm, lowalarm
+            if not ( isinstance(rsp, measRec) ):
                 raise ValueError("Get temperaure request not succesfull completeted by chamber")
-            clima['temperature'] = rsp['val']['measured']   # extract current temp values
+            clima.temperature = rsp.measured                # extract current temp values
         except:
             raise ValueError("Failed to get temperature not proper handled")
         # acquire humidity
         try:
             self.write(sh641Const.CMD_GET_HUMI)         #  write temperature request to chamber
-            rsp = self.parse(self.read())               # read/parse; dict: measured, setpoint, upalarm, lowalarm
-            if not ( (sh641Const.RSP_OK == rsp['state']) and ("MEAS" == rsp['parm']) ):
+            rsp = self.codec.decode(self.read_raw())    # read/decode; measured, setpoint, upalarm, lowalarm
+            if not ( isinstance(rsp, measRec) ):
                 raise ValueError("Get humidity request not succesfull completeted by chamber")
-            clima['humidity'] = rsp['val']['measured']  # extract humidity values
+            clima.humidity = rsp.measured               # extract humidity values
         except:
             raise ValueError("Get humidity request not proper handled")
         # release result
@@ -310,13 +308,14 @@ class especShSu:
 
 
     #*****************************
-    def set_clima(self, clima=None):
+    def set_clima(self, clima=None, force=False):
         """
         @note           set chambers new clima value
                           * temperature
 
         @param clima    new clima value
         @type           dict, {'temperature': myVal}
+        @param force    write w/o deadband and rate cap of write policy
         @rtype          boolean
         @return         successful
         """
@@ -326,23 +325,23 @@ class especShSu:
         # try to set temperature
         try:
             # check if update is necessary
-            if ( False == math.isnan(self.last_write_temp) ):
-                if ( sh641Const.MSC_TEMP_RESOLUTION >= abs(self.last_write_temp-clima['temperature']) ):
-                    return True
+            newTemp = self.policy.check(clima['temperature'], force=force)  # quantized set point
+            if ( None == newTemp ):
+                return True
             # prepare
-            numDigs = len(str(sh641Const.MSC_TEMP_RESOLUTION).split(".")[1])            # determine number of digits in fracs based on resulotion
-            self.last_write_temp = clima['temperature']                                 # write only new value, if change is bigger then resulotion
-            setTemp = '{temp:.{frac}f}'.format(temp=clima['temperature'], frac=numDigs) # build temp string based  on chambers fraction settings
+            self.last_write_temp = clima['temperature']                                             # requested value
+            setTemp = '{temp:.{frac}f}'.format(temp=newTemp, frac=self.policy.fracs)                # build temp string based  on chambers fraction settings
             # request chamber
             try:
                 self.write(sh641Const.CMD_SET_TEMP + setTemp)   # set new temperature
-                rsp=self.parse(self.read())                     # read response from chamber
+                rsp=self.codec.decode(self.read_raw())          # read response from chamber
             except:
                 raise ValueError("Request chamber failed")
             # check setting of new temperature
-            #   rsp['val']: S35 -> 35
-            if not ( (sh641Const.RSP_OK == rsp['state']) and ("TEMP" == rsp['parm']) and (float(setTemp) == float(rsp['val'][1:])) ):
+            #   rsp.val: b'S35' -> 35
+            if not ( isinstance(rsp, ackRec) and (sh641Const.RSP_OK == rsp.state) and ("TEMP" == rsp.parm) and (float(setTemp) == float(rsp.val[1:])) ):
                 raise Warning("Temperature set check failed")
+            self.policy.commit(newTemp)                         # confirmed by chamber
         except:
             raise ValueError("Failed to set clima")
         # graceful end
@@ -370,11 +369,11 @@ class especShSu:
         # request chamber
         try:
             self.write(sh641Const.CMD_SET_PWR + pwr)    # set power state
-            rsp=self.parse(self.read())                 # read response from chamber
+            rsp=self.codec.decode(self.read_raw())      # read response from chamber
         except:
             raise ValueError("Request chamber failed")
         # check response
-        if not ( (sh641Const.RSP_OK == rsp['state']) and ("POWER" == rsp['parm']) and (pwr == rsp['val']) ):
+        if not ( isinstance(rsp, ackRec) and (sh641Const.RSP_OK == rsp.state) and ("POWER" == rsp.parm) and (pwr.encode() == rsp.val) ):
             raise ValueError("Failed to set new power state")
         # graceful end
         return True
@@ -399,17 +398,194 @@ class especShSu:
         # request chamber
         try:
             self.write(sh641Const.CMD_SET_MODE + mode)  # set mode
-            rsp=self.parse(self.read())                 # read response from chamber
+            rsp=self.codec.decode(self.read_raw())      # read response from chamber
         except:
             raise ValueError("Request chamber failed")
         # check response
-        if not ( (sh641Const.RSP_OK == rsp['state']) and ("MODE" == rsp['parm']) and (mode == rsp['val']) ):
+        if not ( isinstance(rsp, ackRec) and (sh641Const.RSP_OK == rsp.state) and ("MODE" == rsp.parm) and (mode.encode() == rsp.val) ):
             raise ValueError("Failed to set new mode")
         # graceful end
         return True
     #*****************************
 
 
+    #*****************************
+    def compile_program(self, profile, repeat=0):
+        """
+        @note           compiles profile into controller program steps
+                          * waveform: steps from current position to period
+                            end, followed by one period repeated as loop
+                          * ramp list: steps w/o loop
+                        step times are in controller minute resolution,
+                        rounding is carried over to the next step;
+                        waveform program starts on the minute grid to the
+                        period end, compressed waveforms break only on it,
+                        so they follow the waveform within chamber
+                        resolution
+
+        @param profile  waveform or list of (startVal, endVal, sec)
+        @param repeat   loop repetitions, 0 is endless
+        @rtype          dict
+        @return         {'steps': [{'temp':, 'time': min, 'ramp':}], 'loop': (first, last) | None, 'repeat':, 'start': temperature}
+        """
+        # check arg
+        if not ( 0 <= repeat <= sh641Const.PRGM_REPEAT_MAX ):
+            raise ValueError("Program repeat " + str(repeat) + " outside of 0.." + str(sh641Const.PRGM_REPEAT_MAX))
+        # waveform, loop over full period
+        if ( hasattr(profile, 'ramps') ):
+            n = profile.waveDescr['x']['n']
+            q = sh641Const.MSC_PRGM_TIME_SEC / profile.waveDescr['x']['ts']    # samples per program minute
+            pos = profile.iterator % n
+            pos = int(n - round((n - pos) / q) * q) % n                         # prefix in whole minutes, shift below half a minute
+            tol = self.policy.cfg['resolution'] / 2                             # compressed to half resolution, quantized step adds other half
+            prefix = profile.ramps(pos, n-pos, maxError=tol, quantum=sh641Const.MSC_PRGM_TIME_SEC) if ( 0 < pos ) else []
+            steps = self.program_steps(prefix)
+            loop = self.program_steps(profile.ramps(0, n, maxError=tol, quantum=sh641Const.MSC_PRGM_TIME_SEC))
+            if ( 0 == len(loop) ):
+                raise ValueError("Waveform period below program time resolution")
+            program = {'steps': steps + loop, 'loop': (len(steps)+1, len(steps)+len(loop)), 'repeat': repeat, 'start': self.policy.quantize(profile.sample(pos))}
+        # ramp list
+        else:
+            pieces = list(profile)
+            program = {'steps': self.program_steps(pieces), 'loop': None, 'repeat': 0, 'start': self.policy.quantize(pieces[0][0]) if ( 0 < len(pieces) ) else None}
+        # check controller limits
+        if ( sh641Const.PRGM_STEPS_MAX < len(program['steps']) ):
+            raise ValueError("Program needs " + str(len(program['steps'])) + " steps, chamber supports " + str(sh641Const.PRGM_STEPS_MAX))
+        for step in program['steps']:
+            if not ( sh641Const.TEMP_MIN_C <= step['temp'] <= sh641Const.TEMP_MAX_C ):
+                raise ValueError("Program temperature " + str(step['temp']) + " outside of chamber ratings")
+        return program
+    #*****************************
+
+
+    #*****************************
+    def program_steps(self, pieces):
+        """
+        @note           converts linear pieces into program steps
+
+        @param pieces   list of (startVal, endVal, sec)
+        @rtype          list
+        @return         program steps
+        """
+        # prepare
+        steps = []
+        tsum = 0            # end of piece in sec
+        tmin = 0            # end of last step in min
+        last = None         # end value of last piece
+        tol = self.policy.cfg['resolution'] / 2
+        for startVal, endVal, dur in pieces:
+            # continuous pieces ramp, jumps are only allowed into constant pieces
+            ramp = ( (None == last) or (abs(startVal - last) <= tol) )
+            if ( (False == ramp) and (abs(endVal - startVal) > tol) ):
+                raise ValueError("Discontinuous ramp from " + str(last) + " to " + str(startVal) + " not supported by program")
+            last = endVal
+            # align to time resolution, piece below resolution is dropped
+            tsum += dur
+            num = round(tsum / sh641Const.MSC_PRGM_TIME_SEC) - tmin
+            if ( 0 >= num ):
+                continue
+            tmin += num
+            # split steps exceeding longest step time
+            parts = math.ceil(num / sh641Const.PRGM_STEP_TIME_MAX_MIN)
+            done = 0
+            for i in range(parts):
+                stop = (num * (i+1)) // parts
+                steps.append({'temp': self.policy.quantize(startVal + (endVal-startVal)*stop/num), 'time': stop - done, 'ramp': ramp})
+                done = stop
+        return steps
+    #*****************************
+
+
+    #*****************************
+    def upload_program(self, program, pgm=1):
+        """
+        @note           writes program into chamber program memory
+
+        @param program  compiled program, see compile_program()
+        @param pgm      program number
+        @rtype          boolean
+        @return         successful
+        """
+        # check arg
+        if not ( 1 <= pgm <= sh641Const.PRGM_NUM_MAX ):
+            raise ValueError("Unsupported program number '" + str(pgm) + "'")
+        # build program commands
+        head = sh641Const.CMD_PRGM_WRITE + str(pgm) + ","
+        cmds = [head + sh641Const.PRGM_EDIT_START]
+        for num, step in enumerate(program['steps'], start=1):
+            cmds.append(head + "STEP{num:d},TEMP{temp:.{frac}f},TIME{h:d}:{m:02d},RAMP {ramp}".format(
+                num=num, temp=step['temp'], frac=self.policy.fracs, h=step['time']//60, m=step['time']%60, ramp=("ON" if step['ramp'] else "OFF")))
+        if ( None != program['loop'] ):
+            cmds.append(head + "COUNT,({first:d}.{last:d}.{repeat:d})".format(first=program['loop'][0], last=program['loop'][1], repeat=program['repeat']))
+        cmds.append(head + sh641Const.PRGM_END_HOLD)
+        cmds.append(head + sh641Const.PRGM_EDIT_END)
+        # write
+        for cmd in cmds:
+            self.program_request(cmd)
+        return True
+    #*****************************
+
+
+    #*****************************
+    def run_program(self, pgm=1):
+        """
+        @note           starts stored program, chamber follows the profile
+                        w/o host interaction
+
+        @param pgm      program number
+        @rtype          boolean
+        @return         successful
+        """
+        if not ( 1 <= pgm <= sh641Const.PRGM_NUM_MAX ):
+            raise ValueError("Unsupported program number '" + str(pgm) + "'")
+        return self.program_request(sh641Const.CMD_PRGM_RUN + str(pgm) + ",STEP1")
+    #*****************************
+
+
+    #*****************************
+    def program_request(self, cmd):
+        """
+        @note           program command w/ acknowledge check
+
+        @param cmd      program command
+        @rtype          boolean
+        @return         successful
+        """
+        try:
+            self.write(cmd)                             # program command
+            rsp = self.codec.decode(self.read_raw())    # read response from chamber
+        except:
+            raise ValueError("Request chamber failed")
+        if not ( isinstance(rsp, ackRec) and (sh641Const.RSP_OK == rsp.state) ):
+            raise ValueError("Chamber rejected program command '" + cmd + "'")
+        return True
+    #*****************************
+
+
+    #*****************************
+    def get_program(self):
+        """
+        @note           state of running program
+
+        @rtype          dict
+        @return         {'pgm':, 'step':, 'remain': sec, 'count': remaining loops}
+        """
+        # request chamber
+        try:
+            self.write(sh641Const.CMD_PRGM_MON)
+            msg = self.read_raw().decode(errors="replace")
+        except:
+            raise ValueError("Request chamber failed")
+        # '1,3,0:25,5', time field collides with acknowledge separator, not handled by codec
+        try:
+            pgm, step, remain, count = msg.split(",")
+            hours, minutes = remain.split(":")
+            return {'pgm': int(pgm), 'step': int(step), 'remain': (60*int(hours) + int(minutes)) * sh641Const.MSC_PRGM_TIME_SEC, 'count': int(count)}
+        except ValueError:
+            raise ValueError("Unrecognized program monitor response '" + msg + "'")
+    #*****************************
+
+
     #*****************************
     def start(self, temperature=None):
         """
@@ -424,7 +600,7 @@ class especShSu:
             temperature = self.get_clima()['temperature']
         # start chamber
         try:
-            self.set_clima(clima={'temperature': temperature})  # set start temp
+            self.set_clima(clima={'temperature': temperature}, force=True)  # set start temp
             self.set_power(sh641Const.PWR_ON)                   # enable chamber
             self.set_mode(sh641Const.MODE_CONSTANT)             # run in constant mode
         except:
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          sh641Codec.py
+@date:          2026-10-19
+
+@brief:         ESPEC CORP. SH-641 response codec
+                  * decodes raw bytes frames, no str conversion
+                  * measurement frame: '26.4,0.0,140.0,-50.0' -> measRec
+                  * acknowledge frame: 'OK:TEMP,S25'          -> ackRec
+@see:           https://www.atecorp.com/atecorp/media/pdfs/data-sheets/espec-sh-641_datasheet.pdf
+"""
+
+
+
+#------------------------------------------------------------------------------
+import re                           # precompiled number matcher
+import functools                    # bound record constructor
+from collections import namedtuple  # compact response records
+from . import sh641Const            # ESPEC SH641 constants
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+# Records
+measRec = namedtuple('measRec', ['measured', 'setpoint', 'upalarm', 'lowalarm'])    # measurement response, f.e. TEMP?
+ackRec = namedtuple('ackRec', ['state', 'parm', 'val'])                             # set command response, f.e. OK:TEMP,S25
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class sh641Codec:
+    """
+    @note:  table driven decoder for SH641 chamber responses
+    """
+
+    #*****************************
+    def __init__(self):
+        """
+        @note           precompiles tables, shared for all decodes
+        """
+        # frame separators
+        self.ackSep = b":"                              # 'OK:TEMP,S25'
+        self.valSep = b","                              # field separator
+        self.lineEnd = sh641Const.MSC_LINE_END.encode() # frame end
+        # number field, leading/trailing blanks allowed, f.e. ' -5.0'
+        self.numField = re.compile(rb"\s*[-+]?(?:\d+(?:\.\d*)?|\.\d+)\s*")
+        self.numChars = b"0123456789+-., \r\n"  # frame w/ only this chars takes the fast path
+        # known states/parms, decoded once and afterwards only looked up
+        self.stateTbl = {
+            sh641Const.RSP_OK.encode(): sh641Const.RSP_OK,
+            sh641Const.RSP_FAIL.encode(): sh641Const.RSP_FAIL,
+        }
+        self.parmTbl = {
+            b"TEMP": "TEMP",
+            b"HUMI": "HUMI",
+            b"POWER": "POWER",
+            b"MODE": "MODE",
+            b"TYPE": "TYPE",
+        }
+        # measurement fields
+        self.numMeas = len(measRec._fields)
+        self.nan = float("nan")
+        # record constructors, skips namedtuple argument processing
+        self.newMeas = functools.partial(tuple.__new__, measRec)
+        self.newAck = functools.partial(tuple.__new__, ackRec)
+    #*****************************
+
+
+    #*****************************
+    def decode(self, frame):
+        """
+        @note           decodes chamber response frame
+
+        @param frame    chamber response, w/ or w/o line end
+        @type           bytes
+        @rtype          measRec | ackRec
+        @return         decoded response record
+        """
+        # check for message
+        if ( 0 == len(frame) ):
+            raise ValueError("Empty message to parse provided")
+        # dispatch frame type
+        if ( self.ackSep in frame ):
+            return self.decode_ack(frame)
+        return self.decode_meas(frame)
+    #*****************************
+
+
+    #*****************************
+    def decode_meas(self, frame):
+        """
+        @note           decodes measurement response, non-numeric fields are
+                        decoded as nan, f.e. disabled humidity control
+
+        @param frame    measurement response, f.e. b'26.4,0.0,140.0,-50.0'
+        @type           bytes
+        @rtype          measRec
+        @return         measured, setpoint, upalarm, lowalarm
+        """
+        # split in fields, line end is handled as blank
+        fields = frame.split(self.valSep)
+        if ( self.numMeas < len(fields) ):
+            raise ValueError("Unrecognized response in '" + frame.strip().decode(errors="replace") + "'")
+        # fast path: all fields present and only number chars, float() accepts bytes directly
+        if ( (self.numMeas == len(fields)) and (0 == len(frame.translate(None, self.numChars))) ):
+            try:
+                return self.newMeas(map(float, fields))
+            except ValueError:
+                pass    # f.e. empty field, take field-wise path
+        # field-wise conversion
+        vals = [self.nan] * self.numMeas
+        fullmatch = self.numField.fullmatch
+        for idx, field in enumerate(fields):
+            if ( None != fullmatch(field) ):
+                vals[idx] = float(field)
+        # release record
+        return self.newMeas(vals)
+    #*****************************
+
+
+    #*****************************
+    def decode_ack(self, frame):
+        """
+        @note           decodes set command acknowledge
+
+        @param frame    acknowledge response, f.e. b'OK:TEMP,S25'
+        @type           bytes
+        @rtype          ackRec
+        @return         state, parm, val; val remains raw bytes
+        """
+        # drop line end
+        if ( frame.endswith(self.lineEnd) ):
+            frame = frame[:-len(self.lineEnd)]
+        # 'OK:TEMP,S25' -> b'OK', b'TEMP,S25'
+        state, sep, cmd = frame.partition(self.ackSep)
+        # 'TEMP,S25' -> b'TEMP', b'S25'
+        parm, sep, val = cmd.partition(self.valSep)
+        # known tokens are looked up, unknown are decoded
+        return self.newAck((
+            self.stateTbl.get(state) or state.decode(errors="replace"),
+            self.parmTbl.get(parm) or parm.decode(errors="replace"),
+            val
+        ))
+    #*****************************
+
+#------------------------------------------------------------------------------
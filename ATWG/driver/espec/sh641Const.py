@@ -30,6 +30,12 @@ MODE_CONSTANT="CONSTANT"    # constant temperature mode
 MODE_STANDBY="STANDBY"      # chamber in standby, no temperature set
 MODE_OFF="OFF"              # disables panel
 CMD_GET_HUMI="HUMI?"        # request chamber humidity
+CMD_PRGM_WRITE="PRGM DATA WRITE,PGM"    # program memory edit, followed by program number
+CMD_PRGM_RUN="PRGM,RUN,PGM:"            # starts stored program, followed by program number
+CMD_PRGM_MON="PRGM MON?"                # running program: program, step, remaining step time, remaining loops
+PRGM_EDIT_START="EDIT START"            # opens program for edit, clears steps
+PRGM_EDIT_END="EDIT END"                # stores edited program
+PRGM_END_HOLD="END,HOLD"                # keep last set point at program end
 
 # Responses
 RSP_CH_ID="T,T,S2,160.0"    # ID of chamber
@@ -40,9 +46,24 @@ RSP_FAIL="NA"               # chamber discards command
 MSC_LINE_END="\r\n"         # used line end
 MSC_TIOUT_RS232_MSEC=10e3   # Time out for serial read
 MSC_TEMP_RESOLUTION=0.1     # Resolution temperature chamber
+MSC_PRGM_TIME_SEC=60        # Resolution program step time
+
+# Program memory
+PRGM_NUM_MAX=20             # number of storable programs
+PRGM_STEPS_MAX=99           # steps per program
+PRGM_REPEAT_MAX=99          # loop repetitions, 0 is endless
+PRGM_STEP_TIME_MAX_MIN=5999 # longest step, 99:59
 
 # Interface Defaults
 IF_DFLT_CFG="sh641InterfaceDefault.yml"
+IF_CFG_SCHEMA={             # mandatory interface config entries
+    'rs232': (dict,),
+    'baudrate': (int,),
+    'databit': (int,),
+    'parity': (str,),
+    'stopbit': (int, float),
+    'tiout_sec': (int, float),
+}
 
 # Ratings
 TEMP_MAX_C=150          # Chamber maximum temperature in celsius
@@ -0,0 +1,370 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          sh641Emu.py
+@date:          2026-10-19
+
+@brief:         ESPEC CORP. SH-641 emulator on a pseudo terminal
+                  * Linux/POSIX only, 'especShSu.open(port=myEmu.port)'
+                  * exercises the real pyserial path of the driver
+                  * baud rate equivalent delay, response latency
+                  * fault injection: dropped, garbled and rejected responses
+                  * program memory, stored ramp/soak programs run w/o host
+@see:           https://www.atecorp.com/atecorp/media/pdfs/data-sheets/espec-sh-641_datasheet.pdf
+"""
+
+
+
+#------------------------------------------------------------------------------
+import os                  # pseudo terminal
+import re                  # program commands
+import tty                 # raw mode of pty
+import select              # wait for host request
+import threading           # chamber runs in background
+import random              # fault injection
+import time                # latencies and chamber dynamic
+from . import sh641Const   # ESPEC SH641 constants
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class sh641Emu:
+    """
+    @note:  emulates SH641 chamber behind a pty
+    """
+
+    #*****************************
+    def __init__(self, baudrate=9600, latency=0.0, drop=0.0, garble=0.0, reject=0.0, seed=None, speed=1.0):
+        """
+        @note           initializes emulator
+
+        @param baudrate     baud rate equivalent transmission delay, 0 disables
+        @param latency      chamber response latency in seconds
+        @param drop         probability of missing response
+        @param garble       probability of a corrupted response byte
+        @param reject       probability of a 'NA' response
+        @param seed         seeds fault injection
+        @param speed        chamber time per real time, accelerates programs
+        """
+        # config
+        self.baudrate = baudrate
+        self.latency = latency
+        self.faults = {'drop': drop, 'garble': garble, 'reject': reject}
+        self.rnd = random.Random(seed)
+        self.speed = speed
+        # chamber state
+        self.temperature = 20.0     # measured temperature
+        self.setTemp = 20.0         # temperature set point
+        self.alarmUp = 140.0        # upper alarm
+        self.alarmLow = -50.0       # lower alarm
+        self.humidity = 25          # measured humidity
+        self.power = sh641Const.PWR_OFF
+        self.mode = sh641Const.MODE_STANDBY
+        self.tupdate = time.monotonic()
+        # program memory
+        self.programs = {}          # stored programs, number to {'steps':, 'loop':, 'repeat':}
+        self.prgm = None            # running program
+        self.prgmStep = re.compile(r"STEP(\d+),TEMP([-+]?[\d.]+),TIME(\d+):(\d\d),RAMP (ON|OFF)")
+        self.prgmCount = re.compile(r"COUNT,\((\d+)\.(\d+)\.(\d+)\)")
+        # statistics
+        self.stats = {'requests': 0, 'drop': 0, 'garble': 0, 'reject': 0}
+        # interface
+        self.master = None
+        self.slave = None
+        self.port = ""
+        self.thread = None
+        self.running = False
+        self.lineEnd = sh641Const.MSC_LINE_END.encode()
+    #*****************************
+
+
+    #*****************************
+    def open(self):
+        """
+        @note           creates pty and starts chamber
+
+        @rtype          string
+        @return         system port of chamber
+        """
+        # only POSIX provides pty
+        if ( "posix" != os.name ):
+            raise OSError("Emulator requires pseudo terminals, not available on '" + os.name + "'")
+        # create pty, slave is opened by host
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.slave)  # no echo, no line discipline
+        self.port = os.ttyname(self.slave)
+        # start chamber
+        self.running = True
+        self.thread = threading.Thread(target=self.serve, daemon=True)
+        self.thread.start()
+        # release port
+        return self.port
+    #*****************************
+
+
+    #*****************************
+    def close(self):
+        """
+        @note           stops chamber and releases pty
+
+        @rtype          boolean
+        @return         successful
+        """
+        self.running = False
+        if ( None != self.thread ):
+            self.thread.join()
+            self.thread = None
+        for fd in (self.master, self.slave):
+            if ( None != fd ):
+                os.close(fd)
+        self.master = None
+        self.slave = None
+        return True
+    #*****************************
+
+
+    #*****************************
+    def serve(self):
+        """
+        @note           chamber loop, answers host requests
+        """
+        buf = b""
+        while ( self.running ):
+            # wait for request, timeout allows stop
+            rdy, _, _ = select.select([self.master], [], [], 0.05)
+            if ( 0 == len(rdy) ):
+                continue
+            try:
+                buf += os.read(self.master, 1024)
+            except OSError:
+                break
+            # process complete requests
+            while ( self.lineEnd in buf ):
+                req, buf = buf.split(self.lineEnd, 1)
+                rsp = self.respond(req.decode(errors="replace").strip())
+                if ( None != rsp ):
+                    self.transmit(rsp)
+    #*****************************
+
+
+    #*****************************
+    def transmit(self, rsp):
+        """
+        @note           sends response w/ latency and baud rate delay
+        """
+        frame = rsp.encode() + self.lineEnd
+        delay = self.latency
+        if ( 0 < self.baudrate ):
+            delay += len(frame) * 10 / self.baudrate    # 8N1: 10 bit per character
+        if ( 0 < delay ):
+            time.sleep(delay)
+        os.write(self.master, frame)
+    #*****************************
+
+
+    #*****************************
+    def update(self):
+        """
+        @note           moves measured temperature with chamber slew rates
+        """
+        now = time.monotonic()
+        dt = (now - self.tupdate) * self.speed
+        self.tupdate = now
+        # chamber only active in constant or program mode
+        if not ( sh641Const.PWR_ON == self.power ):
+            return
+        if ( None != self.prgm ):
+            self.program_update(dt)
+        elif not ( sh641Const.MODE_CONSTANT == self.mode ):
+            return
+        delta = self.setTemp - self.temperature
+        delta = min(delta, sh641Const.TEMP_GRAD_RISE * dt / 60)     # heating limit
+        delta = max(delta, sh641Const.TEMP_GRAD_FALL * dt / 60)     # cooling limit
+        self.temperature += delta
+    #*****************************
+
+
+    #*****************************
+    def program_update(self, dt):
+        """
+        @note           moves running program forward, updates set point
+
+        @param dt       elapsed chamber time in sec
+        """
+        prgm = self.prgm
+        steps = prgm['program']['steps']
+        prgm['tstep'] += dt
+        # step completed
+        while ( prgm['tstep'] >= steps[prgm['pos']]['time'] ):
+            prgm['tstep'] -= steps[prgm['pos']]['time']
+            prgm['from'] = steps[prgm['pos']]['temp']
+            loop = prgm['program']['loop']
+            if ( (None != loop) and (prgm['pos']+1 == loop[1]) and ((0 == prgm['program']['repeat']) or (0 < prgm['count'])) ):
+                prgm['count'] -= 1
+                prgm['pos'] = loop[0] - 1
+            elif ( prgm['pos']+1 < len(steps) ):
+                prgm['pos'] += 1
+            else:   # end, hold last set point
+                self.setTemp = prgm['from']
+                self.prgm = None
+                return
+        # set point of step
+        step = steps[prgm['pos']]
+        if ( step['ramp'] ):
+            self.setTemp = prgm['from'] + (step['temp'] - prgm['from']) * prgm['tstep'] / step['time']
+        else:
+            self.setTemp = step['temp']
+    #*****************************
+
+
+    #*****************************
+    def program_edit(self, args):
+        """
+        @note           program memory write
+
+        @param args     command w/o 'PRGM DATA WRITE,PGM', f.e. '1,STEP1,TEMP25.0,TIME1:00,RAMP ON'
+        @rtype          boolean
+        @return         accepted
+        """
+        num, sep, edit = args.partition(",")
+        if not ( num.isdigit() and (1 <= int(num) <= sh641Const.PRGM_NUM_MAX) ):
+            return False
+        num = int(num)
+        # new program
+        if ( sh641Const.PRGM_EDIT_START == edit ):
+            self.programs[num] = {'steps': [], 'loop': None, 'repeat': 0}
+            return True
+        if not ( num in self.programs ):
+            return False
+        program = self.programs[num]
+        # program content
+        if ( edit in (sh641Const.PRGM_EDIT_END, sh641Const.PRGM_END_HOLD) ):
+            return True
+        match = self.prgmStep.fullmatch(edit)
+        if ( (None != match) and (int(match.group(1)) == len(program['steps'])+1) ):
+            program['steps'].append({'temp': float(match.group(2)), 'time': 60*(60*int(match.group(3)) + int(match.group(4))), 'ramp': ("ON" == match.group(5))})
+            return True
+        match = self.prgmCount.fullmatch(edit)
+        if ( None != match ):
+            program['loop'] = (int(match.group(1)), int(match.group(2)))
+            program['repeat'] = int(match.group(3))
+            return True
+        return False
+    #*****************************
+
+
+    #*****************************
+    def respond(self, cmd):
+        """
+        @note           processes one request
+
+        @param cmd      request w/o line end
+        @rtype          string
+        @return         response, None if dropped
+        """
+        self.stats['requests'] += 1
+        self.update()
+        # fault: no answer
+        if ( self.rnd.random() < self.faults['drop'] ):
+            self.stats['drop'] += 1
+            return None
+        # fault: chamber rejects
+        if ( self.rnd.random() < self.faults['reject'] ):
+            self.stats['reject'] += 1
+            return sh641Const.RSP_FAIL + ":" + cmd
+        # dispatch
+        rsp = self.execute(cmd)
+        # fault: transmission error
+        if ( (0 < len(rsp)) and (self.rnd.random() < self.faults['garble']) ):
+            self.stats['garble'] += 1
+            pos = self.rnd.randrange(len(rsp))
+            rsp = rsp[:pos] + chr(self.rnd.randrange(0x21, 0x7f)) + rsp[pos+1:]
+        return rsp
+    #*****************************
+
+
+    #*****************************
+    def execute(self, cmd):
+        """
+        @note           executes chamber command
+
+        @param cmd      request w/o line end
+        @rtype          string
+        @return         chamber response
+        """
+        # requests
+        if ( sh641Const.CMD_GET_TYPE == cmd ):
+            return sh641Const.RSP_CH_ID
+        if ( sh641Const.CMD_GET_TEMP == cmd ):
+            return "{:.1f},{:.1f},{:.1f},{:.1f}".format(self.temperature, self.setTemp, self.alarmUp, self.alarmLow)
+        if ( sh641Const.CMD_GET_HUMI == cmd ):
+            return "{:d},0,100,0".format(self.humidity)
+        if ( sh641Const.CMD_PRGM_MON == cmd ):
+            if ( None == self.prgm ):
+                return sh641Const.RSP_FAIL + ":" + cmd
+            step = self.prgm['program']['steps'][self.prgm['pos']]
+            remain = max(0, round((step['time'] - self.prgm['tstep']) / 60))
+            return "{:d},{:d},{:d}:{:02d},{:d}".format(self.prgm['num'], self.prgm['pos']+1, remain//60, remain%60, max(0, self.prgm['count']))
+        # set commands
+        ack = sh641Const.RSP_OK + ":" + cmd
+        try:
+            if ( cmd.startswith(sh641Const.CMD_SET_TEMP) ):
+                self.setTemp = float(cmd[len(sh641Const.CMD_SET_TEMP):])
+                return ack
+            if ( cmd.startswith(sh641Const.CMD_SET_TEMP_ALUP) ):
+                self.alarmUp = float(cmd[len(sh641Const.CMD_SET_TEMP_ALUP):])
+                return ack
+            if ( cmd.startswith(sh641Const.CMD_SET_TEMP_ALLOW) ):
+                self.alarmLow = float(cmd[len(sh641Const.CMD_SET_TEMP_ALLOW):])
+                return ack
+        except ValueError:
+            return sh641Const.RSP_FAIL + ":" + cmd
+        if ( cmd.startswith(sh641Const.CMD_SET_PWR) ):
+            pwr = cmd[len(sh641Const.CMD_SET_PWR):]
+            if ( pwr in (sh641Const.PWR_ON, sh641Const.PWR_OFF) ):
+                self.power = pwr
+                return ack
+        if ( cmd.startswith(sh641Const.CMD_SET_MODE) ):
+            mode = cmd[len(sh641Const.CMD_SET_MODE):]
+            if ( mode in (sh641Const.MODE_CONSTANT, sh641Const.MODE_STANDBY, sh641Const.MODE_OFF) ):
+                self.mode = mode
+                self.prgm = None    # mode change ends program
+                return ack
+        # program memory
+        if ( cmd.startswith(sh641Const.CMD_PRGM_WRITE) ):
+            if ( self.program_edit(cmd[len(sh641Const.CMD_PRGM_WRITE):]) ):
+                return ack
+        if ( cmd.startswith(sh641Const.CMD_PRGM_RUN) ):
+            num, sep, step = cmd[len(sh641Const.CMD_PRGM_RUN):].partition(",")
+            if ( num.isdigit() and (int(num) in self.programs) and (0 < len(self.programs[int(num)]['steps'])) and (sh641Const.PWR_ON == self.power) ):
+                program = self.programs[int(num)]
+                self.prgm = {'num': int(num), 'program': program, 'pos': 0, 'tstep': 0.0, 'from': self.setTemp, 'count': program['repeat']}
+                return ack
+        # unknown
+        return sh641Const.RSP_FAIL + ":" + cmd
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    myEmu = sh641Emu()                                      # call class constructor
+    print("SH641 emulator listens on '" + myEmu.open() + "'")   # create pty
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    myEmu.close()                                           # release pty
+#------------------------------------------------------------------------------
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          registry.py
+@date:          2026-10-19
+
+@note           chamber driver registry
+                  * drivers are imported only when selected
+                  * builtin drivers known w/o any discovery
+                  * external drivers via entry point group 'atwg.drivers',
+                    f.e. 'MY_CHAMBER = myPkg.myMod:myChamber'
+                  * plugin directories in ATWG_DRIVER_PATH, one driver per
+                    file, driver name is file name, module provides the
+                    driver class as 'ATWG_DRIVER'
+                  * discovery only if a not builtin driver is requested
+"""
+
+
+
+#------------------------------------------------------------------------------
+import os               # plugin directories
+import importlib.util   # lazy import
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+# Constants
+DRV_BUILTIN = {
+    "SIM": "ATWG.driver.sim.simChamber:simChamber",     # simulated chamber
+    "ESPEC_SH641": "ATWG.driver.espec.sh641:especShSu", # ESPEC SH-641
+}
+DRV_ENTRY_POINTS = "atwg.drivers"   # entry point group of installed drivers
+DRV_PLUGIN_ENV = "ATWG_DRIVER_PATH" # plugin directories, os.pathsep separated
+DRV_PLUGIN_ATTR = "ATWG_DRIVER"     # driver class in plugin file
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class driverRegistry:
+    """
+    @note:  maps chamber names to lazy loaded driver classes
+    """
+
+    #*****************************
+    def __init__(self):
+        """
+        @note           registers builtin drivers, w/o import
+        """
+        self.drivers = {}           # upper case name to (name, target)
+        self.loaded = {}            # upper case name to driver class
+        self.discovered = False     # entry points/plugins scanned
+        for name, target in DRV_BUILTIN.items():
+            self.register(name, target)
+    #*****************************
+
+
+    #*****************************
+    def register(self, name, target):
+        """
+        @note           adds driver, later registration overwrites
+
+        @param name     chamber name, case insensitive
+        @param target   'module:class', entry point, plugin file or class
+        @rtype          boolean
+        @return         successful
+        """
+        self.drivers[name.upper()] = (name, target)
+        self.loaded.pop(name.upper(), None)
+        return True
+    #*****************************
+
+
+    #*****************************
+    def discover(self):
+        """
+        @note           scans entry points and plugin directories, builtin
+                        drivers are not replaced
+
+        @rtype          int
+        @return         number of found drivers
+        """
+        found = 0
+        self.discovered = True
+        # installed packages
+        try:
+            from importlib.metadata import entry_points     # costly, only on demand
+            eps = entry_points()
+            eps = eps.select(group=DRV_ENTRY_POINTS) if ( hasattr(eps, 'select') ) else eps.get(DRV_ENTRY_POINTS, [])
+        except ImportError:
+            eps = []
+        for ep in eps:
+            if not ( ep.name.upper() in self.drivers ):
+                self.register(ep.name, ep)
+                found += 1
+        # plugin directories
+        for path in os.environ.get(DRV_PLUGIN_ENV, "").split(os.pathsep):
+            if ( (0 == len(path)) or (False == os.path.isdir(path)) ):
+                continue
+            for fileName in sorted(os.listdir(path)):
+                name, ext = os.path.splitext(fileName)
+                if ( (".py" == ext) and not (name.upper() in self.drivers) ):
+                    self.register(name, os.path.join(path, fileName))
+                    found += 1
+        return found
+    #*****************************
+
+
+    #*****************************
+    def names(self, discover=True):
+        """
+        @note           known chamber names
+
+        @param discover scans for external drivers
+        @rtype          list
+        @return         chamber names, builtin first
+        """
+        if ( discover and not self.discovered ):
+            self.discover()
+        return [name for name, target in self.drivers.values()]
+    #*****************************
+
+
+    #*****************************
+    def load(self, name):
+        """
+        @note           imports driver
+
+        @param name     chamber name, case insensitive
+        @rtype          class
+        @return         driver class
+        """
+        key = name.upper()
+        # already imported
+        if ( key in self.loaded ):
+            return self.loaded[key]
+        # unknown, look for external drivers
+        if ( not (key in self.drivers) and not self.discovered ):
+            self.discover()
+        if not ( key in self.drivers ):
+            raise ValueError("Unsupported climate chmaber '" + name + "' selected")
+        target = self.drivers[key][1]
+        # dispatch target
+        if ( isinstance(target, type) ):                # class
+            drv = target
+        elif ( hasattr(target, 'load') ):               # entry point
+            drv = target.load()
+        elif ( target.endswith(".py") ):                # plugin file
+            spec = importlib.util.spec_from_file_location("atwg_plugin_" + key.lower(), target)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            if not ( hasattr(module, DRV_PLUGIN_ATTR) ):
+                raise ValueError("Plugin '" + target + "' provides no '" + DRV_PLUGIN_ATTR + "'")
+            drv = getattr(module, DRV_PLUGIN_ATTR)
+        else:                                           # 'module:class'
+            modName, sep, clsName = target.partition(":")
+            drv = getattr(importlib.import_module(modName), clsName)
+        self.loaded[key] = drv
+        return drv
+    #*****************************
+
+
+    #*****************************
+    def create(self, name):
+        """
+        @note           imports driver and creates chamber object
+
+        @param name     chamber name, case insensitive
+        @rtype          object
+        @return         chamber driver
+        """
+        return self.load(name)()
+    #*****************************
+
+#------------------------------------------------------------------------------
@@ -12,16 +12,225 @@
 @date:          2020-02-22
 
 @note           virtual climate chamber, allows ATWG virtual run
+                  * order 0: ideal chamber, measured is set temperature
+                  * order 1: first order lag, slew rate limited
+                  * order 2: first order + sensor lag
+                  * optional dead time, sensor noise and interface latency
 """
 
 
 
 #------------------------------------------------------------------------------
-class simChamber:
+# Standard
+import math                 # exp
+import time                 # model timing
+import random               # sensor noise
+import collections          # dead time queue
+from array import array     # offline simulation
+# Self
+from ..writePolicy import writePolicy   # set point write coalescing
+from ..chamberBase import chamberBase   # driver protocol
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class simChamber(chamberBase):
 
     #*****************************
     def __init__(self):
+        super().__init__()
         self.last_set_temp = 20.0
+        self.policy = writePolicy(resolution=0.01)  # resolution of 'fracs'
+        # thermal model
+        self.model = {
+            'order': 0,                 # 0: ideal, 1: first order, 2: second order
+            'tau': 0.0,                 # chamber time constant in sec
+            'tau2': 0.0,                # sensor time constant in sec, order 2
+            'deadtime': 0.0,            # set point to chamber reaction in sec
+            'rise': float('+inf'),      # heating rate in c/min
+            'fall': float('-inf'),      # cooling rate in c/min
+            'noise': 0.0,               # sensor noise, standard deviation in c
+            'latency': 0.0,             # interface latency per request in sec
+        }
+        self.clock = time.monotonic         # model time
+        self.sleep = time.sleep             # latency injection
+        self.rnd = random.Random()          # sensor noise
+        self.state = [20.0, 20.0]           # chamber, sensor temperature
+        self.u = 20.0                       # effective set temperature, after dead time
+        self.inputs = collections.deque()   # pending set points (apply time, temperature)
+        self.tupdate = None                 # time of model state
+    #*****************************
+
+
+    #*****************************
+    def set_model(self, seed=None, **kwargs):
+        """
+        @note           configures thermal model, model starts with
+                        last set temperature
+
+        @param seed     seeds sensor noise
+        @param kwargs   order, tau, tau2, deadtime, rise, fall, noise, latency
+        @rtype          boolean
+        @return         successful
+        """
+        # check arguments
+        for key, value in kwargs.items():
+            if not ( key in self.model ):
+                raise ValueError("Unknown model argument '" + key + "'")
+            self.model[key] = value
+        if not ( self.model['order'] in (0, 1, 2) ):
+            raise ValueError("Unsupported model order '" + str(self.model['order']) + "'")
+        if ( (0 >= self.model['rise']) or (0 <= self.model['fall']) ):
+            raise ValueError("Rise slew rate needs to be positive, fall negative")
+        # init model
+        if ( None != seed ):
+            self.rnd.seed(seed)
+        self.state = [self.last_set_temp, self.last_set_temp]
+        self.u = self.last_set_temp
+        self.inputs.clear()
+        self.tupdate = None
+        return True
+    #*****************************
+
+
+    #*****************************
+    def lag(self, x, u, dt):
+        """
+        @note           first order lag w/ slew rate limit, exact solution
+
+        @param x        chamber temperature
+        @param u        set temperature
+        @param dt       time step in sec
+        @rtype          float
+        @return         chamber temperature after time step
+        """
+        tau = self.model['tau']
+        rmax = self.model['rise'] / 60  # c/sec
+        rmin = self.model['fall'] / 60
+        # pure slew rate limit
+        if ( 0 >= tau ):
+            return x + min(max(u - x, rmin*dt), rmax*dt)
+        # slew rate limited until lag demands less
+        r = (u - x) / tau
+        if ( r > rmax ):
+            tslew = ((u - rmax*tau) - x) / rmax
+            if ( dt <= tslew ):
+                return x + rmax*dt
+            x = u - rmax*tau
+            dt -= tslew
+        elif ( r < rmin ):
+            tslew = ((u - rmin*tau) - x) / rmin
+            if ( dt <= tslew ):
+                return x + rmin*dt
+            x = u - rmin*tau
+            dt -= tslew
+        # exponential approach
+        return u + (x - u)*math.exp(-dt/tau)
+    #*****************************
+
+
+    #*****************************
+    def step(self, state, u, dt):
+        """
+        @note           moves model state for constant set temperature
+
+        @param state    [chamber, sensor] temperature, updated in place
+        @param u        set temperature
+        @param dt       time step in sec
+        """
+        # nothing to do
+        if ( 0 >= dt ):
+            return
+        # first order
+        if ( 2 != self.model['order'] ):
+            state[0] = self.lag(state[0], u, dt)
+            state[1] = state[0]
+            return
+        # second order, sensor follows chamber, substeps resolve chamber change
+        tau2 = self.model['tau2']
+        num = 1 if ( 0 >= tau2 ) else max(1, math.ceil(4*dt/tau2))
+        h = dt / num
+        for i in range(num):
+            x = self.lag(state[0], u, h)
+            if ( 0 >= tau2 ):
+                state[1] = x
+            else:
+                xavg = (state[0] + x) / 2
+                state[1] = xavg + (state[1] - xavg)*math.exp(-h/tau2)
+            state[0] = x
+    #*****************************
+
+
+    #*****************************
+    def advance(self, now):
+        """
+        @note           brings model state to given time, applies pending
+                        set points after dead time
+
+        @param now      time in sec
+        """
+        # first access defines time base
+        if ( None == self.tupdate ):
+            self.tupdate = now
+            return
+        # pending set points
+        while ( (0 < len(self.inputs)) and (self.inputs[0][0] <= now) ):
+            tapply, u = self.inputs.popleft()
+            self.step(self.state, self.u, tapply - self.tupdate)
+            self.tupdate = max(self.tupdate, tapply)
+            self.u = u
+        # remaining time
+        self.step(self.state, self.u, now - self.tupdate)
+        self.tupdate = max(self.tupdate, now)
+    #*****************************
+
+
+    #*****************************
+    def simulate(self, tset, ts, start=None, jitter=0):
+        """
+        @note           offline simulation of a complete profile, measurement
+                        at begin of sample, set point hold over sample;
+                        same behaviour as get_clima/set_clima sequence
+
+        @param tset     set temperatures, one per sample
+        @param ts       sample time in sec
+        @param start    start temperature, first set temperature if None
+        @param jitter   tick jitter, standard deviation in sec
+        @rtype          array
+        @return         measured temperatures
+        """
+        # prepare
+        if ( None == start ):
+            start = tset[0]
+        ndead = round(self.model['deadtime'] / ts)  # dead time in samples
+        noise = self.model['noise']
+        gauss = self.rnd.gauss
+        step = self.step
+        state = [start, start]
+        meas = array('d', bytes(8*len(tset)))
+        # ideal chamber, measured is last set temperature
+        if ( 0 == self.model['order'] ):
+            meas[1:] = array('d', tset[:-1])
+            meas[0] = start
+            if ( 0 < noise ):
+                for k in range(len(meas)):
+                    meas[k] += gauss(0, noise)
+            return meas
+        # run model
+        u = start
+        tofs = 0.0  # tick offset to ideal sample time
+        for k in range(len(tset)):
+            meas[k] = state[1] + gauss(0, noise) if ( 0 < noise ) else state[1]
+            if ( k >= ndead ):
+                u = tset[k - ndead]
+            if ( 0 < jitter ):
+                tnext = gauss(0, jitter)
+                step(state, u, max(0, ts + tnext - tofs))
+                tofs = tnext
+            else:
+                step(state, u, ts)
+        return meas
     #*****************************
     
     
@@ -99,8 +308,8 @@ class simChamber:
         info['temperature']['ratings']['min'] = float('-inf')       # minimal allowed temperature
         info['temperature']['ratings']['max'] = float('+inf')       # maximal allowed temperature
         info['temperature']['ratings']['unit'] = "c"                # Celsius degree
-        info['temperature']['slewrate']['rise'] = float('+inf')     # positiv slewrate
-        info['temperature']['slewrate']['fall'] = float('-inf')     # negativ slewrate
+        info['temperature']['slewrate']['rise'] = self.model['rise']    # positiv slewrate
+        info['temperature']['slewrate']['fall'] = self.model['fall']    # negativ slewrate
         info['temperature']['slewrate']['unit'] = "c/min"           # change rate in Celsius per minute
         # Name
         info['name'] = "SIM"
@@ -110,25 +319,36 @@ class simChamber:
     
     
     #*****************************
-    def get_clima(self):
+    def measure(self):
         """
-        @note           Current measured clima
+        @note           Current measured clima, record is reused
         
-        @rtype          dict
+        @rtype          climaRec
         @return         hudidity/temperature vals
         """
-        clima = {}
-        clima['temperature'] = self.last_set_temp
-        clima['humidity'] = float('nan')
+        # interface latency
+        if ( 0 < self.model['latency'] ):
+            self.sleep(self.model['latency'])
+        # measure
+        clima = self.meas
+        if ( 0 == self.model['order'] ):
+            clima.temperature = self.last_set_temp
+        else:
+            self.advance(self.clock())
+            clima.temperature = self.state[1]
+        if ( 0 < self.model['noise'] ):
+            clima.temperature += self.rnd.gauss(0, self.model['noise'])
+        clima.humidity = math.nan
         return clima
     #*****************************    
     
     
     #*****************************
-    def set_clima(self, clima=None):
+    def set_clima(self, clima=None, force=False):
         """
         @note           Current measured clima
         
+        @param force    write w/o deadband and rate cap of write policy
         @rtype          boolean
         @return         hudidity/temperature vals
         """
@@ -137,9 +357,20 @@ class simChamber:
             raise ValueError("No new data provided")
         # try to set temperature
         try:
-            self.last_set_temp = clima['temperature']
+            setTemp = self.policy.check(clima['temperature'], force=force)
         except:
             raise ValueError("Miss temperature set value")
+        if ( None != setTemp ):
+            # interface latency
+            if ( 0 < self.model['latency'] ):
+                self.sleep(self.model['latency'])
+            # chamber reacts after dead time
+            if ( 0 != self.model['order'] ):
+                now = self.clock()
+                self.advance(now)
+                self.inputs.append((now + self.model['deadtime'], setTemp))
+            self.last_set_temp = setTemp
+            self.policy.commit(setTemp)
         # try to set humidity
         # graceful end
         return True
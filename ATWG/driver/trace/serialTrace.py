@@ -0,0 +1,335 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          serialTrace.py
+@date:          2026-10-19
+
+@note           timestamped record/replay of serial traffic
+                  * serialRecorder: wraps an opened port, logs all traffic
+                  * serialReplay:   serves a log as port w/o hardware
+
+                Log format, little endian:
+                  |--------+--------+---------------------------------------+
+                  | Offset | Type   | Remark                                |
+                  |--------+--------+---------------------------------------+
+                  | 0      | 8s     | magic 'ATWGST' + version              |
+                  | record | Q      | time since record start in usec       |
+                  |        | c      | direction, b'W' to chamber, b'R' from |
+                  |        |        | b'Q' read request, version 2          |
+                  |        | H      | payload length                        |
+                  |        | bytes  | payload                               |
+                  |--------+--------+---------------------------------------+
+
+                Read request payload, precedes read record:
+                  |--------+--------+---------------------------------------+
+                  | 0      | c      | b'S' read(size), b'U' read_until      |
+                  | 1      | i      | size, -1 for None                     |
+                  | 5      | bytes  | expected, read_until only             |
+                  |--------+--------+---------------------------------------+
+"""
+
+
+
+#------------------------------------------------------------------------------
+import struct   # binary log records
+import time     # timestamps
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+# Log format
+LOG_MAGIC = b"ATWGST\x00\x02"   # file identifier, last byte is version
+LOG_MAGIC_V1 = b"ATWGST\x00\x01"    # w/o read requests, replay unchecked
+LOG_REC = struct.Struct("<QcH") # record header: time_us, direction, length
+LOG_REQ = struct.Struct("<ci")  # read request: method, size
+DIR_WRITE = b"W"                # host to chamber
+DIR_READ = b"R"                 # chamber to host
+DIR_REQ = b"Q"                  # read request of host
+REQ_SIZE = b"S"                 # read(size)
+REQ_UNTIL = b"U"                # read_until(expected, size)
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+def load(logFile):
+    """
+    @note           loads complete log
+
+    @param logFile  path to log file
+    @rtype          list
+    @return         records (time_sec, direction, payload)
+    """
+    # read complete log
+    with open(logFile, 'rb') as fH:
+        buf = fH.read()
+    # check header
+    if ( buf[:len(LOG_MAGIC)] not in (LOG_MAGIC, LOG_MAGIC_V1) ):
+        raise ValueError("File '" + logFile + "' is not a serial trace")
+    # unpack records
+    recs = []
+    pos = len(LOG_MAGIC)
+    while ( pos < len(buf) ):
+        if ( pos + LOG_REC.size > len(buf) ):
+            raise ValueError("Truncated record at offset " + str(pos))
+        tus, direction, length = LOG_REC.unpack_from(buf, pos)
+        pos += LOG_REC.size
+        recs.append((tus/1e6, direction, buf[pos:pos+length]))
+        pos += length
+    # release
+    return recs
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+def pack_req(method, size, expected=b""):
+    """
+    @note           packs read request
+
+    @param method   REQ_SIZE or REQ_UNTIL
+    @param size     requested size, None for unlimited
+    @param expected terminator of read_until
+    @rtype          bytes
+    @return         request payload
+    """
+    return LOG_REQ.pack(method, -1 if ( None == size ) else size) + expected
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+def format_req(req):
+    """
+    @note           human readable read request, used in mismatch reports
+
+    @param req      request payload
+    @rtype          string
+    @return         call, f.e. "read_until(b'\\n', None)"
+    """
+    method, size = LOG_REQ.unpack_from(req)
+    size = None if ( 0 > size ) else size
+    if ( REQ_SIZE == method ):
+        return "read(" + str(size) + ")"
+    return "read_until(" + repr(req[LOG_REQ.size:]) + ", " + str(size) + ")"
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class serialRecorder:
+    """
+    @note:  pass through to an opened serial port, logs traffic w/ time
+    """
+
+    #*****************************
+    def __init__(self, com, logFile, clock=time.monotonic):
+        """
+        @note           initializes recorder
+
+        @param com      opened serial port, f.e. serial.Serial
+        @param logFile  path to log file, overwritten
+        @param clock    time source in seconds
+        """
+        self.com = com
+        self.clock = clock
+        self.fH = open(logFile, 'wb')
+        self.fH.write(LOG_MAGIC)
+        self.tstart = self.clock()
+    #*****************************
+
+
+    #*****************************
+    def __getattr__(self, name):
+        """
+        @note           port attributes are forwarded, f.e. timeout
+        """
+        return getattr(self.com, name)
+    #*****************************
+
+
+    #*****************************
+    def log(self, direction, data):
+        """
+        @note           appends one record to log
+        """
+        tus = int(round((self.clock() - self.tstart) * 1e6))
+        self.fH.write(LOG_REC.pack(tus, direction, len(data)))
+        self.fH.write(data)
+        self.fH.flush()     # keep log on abnormal end
+    #*****************************
+
+
+    #*****************************
+    def write(self, data):
+        """
+        @note           writes to port and logs
+        """
+        self.log(DIR_WRITE, data)
+        return self.com.write(data)
+    #*****************************
+
+
+    #*****************************
+    def read(self, size=1):
+        """
+        @note           reads from port and logs
+        """
+        self.log(DIR_REQ, pack_req(REQ_SIZE, size))
+        data = self.com.read(size)
+        self.log(DIR_READ, data)
+        return data
+    #*****************************
+
+
+    #*****************************
+    def read_until(self, expected=b"\n", size=None):
+        """
+        @note           reads from port and logs
+        """
+        self.log(DIR_REQ, pack_req(REQ_UNTIL, size, expected))
+        data = self.com.read_until(expected, size)
+        self.log(DIR_READ, data)
+        return data
+    #*****************************
+
+
+    #*****************************
+    def close(self):
+        """
+        @note           closes port and log
+        """
+        self.fH.close()
+        self.com.close()
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class serialReplay:
+    """
+    @note:  serves recorded traffic as serial port
+    """
+
+    #*****************************
+    def __init__(self, logFile, speed=1.0, strict=True, clock=time.monotonic, sleep=time.sleep):
+        """
+        @note           loads log for replay
+
+        @param logFile  path to log file
+        @param speed    replay speed, 1: original timing, 0: as fast as possible
+        @param strict   host writes and read requests are checked against the log
+        @param clock    time source in seconds
+        @param sleep    waits given seconds
+        """
+        if ( 0 > speed ):
+            raise ValueError("Replay speed needs to be non-negative")
+        self.recs = load(logFile)
+        self.idx = 0
+        self.speed = speed
+        self.strict = strict
+        self.clock = clock
+        self.sleep = sleep
+        self.tstart = None      # replay time base, set on first access
+        self.timeout = None     # compatibility to serial.Serial
+    #*****************************
+
+
+    #*****************************
+    def next_rec(self, direction):
+        """
+        @note           fetches next record in given direction, paces replay
+
+        @rtype          bytes
+        @return         payload, None if log ends
+        """
+        # skip foreign direction in non-strict mode
+        while ( self.idx < len(self.recs) ):
+            tsec, recDir, data = self.recs[self.idx]
+            self.idx += 1
+            if ( recDir == direction ):
+                break
+            if ( self.strict ):
+                raise ValueError("Replay mismatch at record " + str(self.idx-1) + ", expected direction '" + recDir.decode() + "'")
+        else:
+            return None
+        # pace to original timing
+        if ( None == self.tstart ):
+            self.tstart = self.clock() - tsec/self.speed if ( 0 < self.speed ) else self.clock()
+        elif ( 0 < self.speed ):
+            wait = self.tstart + tsec/self.speed - self.clock()
+            if ( 0 < wait ):
+                self.sleep(wait)
+        return data
+    #*****************************
+
+
+    #*****************************
+    def write(self, data):
+        """
+        @note           consumes next write record
+        """
+        rec = self.next_rec(DIR_WRITE)
+        if ( self.strict and (rec != data) ):
+            raise ValueError("Replay mismatch at record " + str(self.idx-1) + ", expected " + repr(rec) + " got " + repr(data))
+        return len(data)
+    #*****************************
+
+
+    #*****************************
+    def check_req(self, req):
+        """
+        @note           consumes recorded read request and checks it
+                        against the host call, version 1 logs have none
+
+        @param req      request payload of host call
+        """
+        if ( (self.idx < len(self.recs)) and (DIR_REQ == self.recs[self.idx][1]) ):
+            rec = self.recs[self.idx][2]
+            self.idx += 1
+            if ( self.strict and (rec != req) ):
+                raise ValueError("Replay mismatch at record " + str(self.idx-1) + ", expected " + format_req(rec) + " got " + format_req(req))
+    #*****************************
+
+
+    #*****************************
+    def read(self, size=1):
+        """
+        @note           serves next read record, empty in case of log end
+        """
+        self.check_req(pack_req(REQ_SIZE, size))
+        rec = self.next_rec(DIR_READ)
+        return b"" if ( None == rec ) else rec
+    #*****************************
+
+
+    #*****************************
+    def read_until(self, expected=b"\n", size=None):
+        """
+        @note           serves next read record, empty in case of log end
+        """
+        self.check_req(pack_req(REQ_UNTIL, size, expected))
+        rec = self.next_rec(DIR_READ)
+        return b"" if ( None == rec ) else rec
+    #*****************************
+
+
+    #*****************************
+    def close(self):
+        """
+        @note           dummy, nothing to release
+        """
+        return True
+    #*****************************
+
+#------------------------------------------------------------------------------
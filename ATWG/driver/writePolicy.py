@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          writePolicy.py
+@date:          2026-10-19
+
+@note           set point write coalescing, shared by chamber drivers
+                  * quantize to chamber resolution
+                  * deadband, skip small changes
+                  * rate cap, minimal time between writes
+                  * refresh, forces write after given time
+                  * force, start and shutdown set points bypass deadband
+                    and rate cap
+                  * value counts as written after driver confirmed the
+                    write by 'commit', failed writes are retried
+"""
+
+
+
+#------------------------------------------------------------------------------
+import math     # isnan, isinf
+import time     # write timing
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class writePolicy:
+    """
+    @note:  decides if a new set point is written to the chamber
+    """
+
+    #*****************************
+    def __init__(self, resolution=0, deadband=0, minInterval=0, refresh=float('inf'), clock=time.monotonic):
+        """
+        @note               initializes policy
+
+        @param resolution   chamber set point resolution, 0 disables quantization
+        @param deadband     changes up to this value are not written
+        @param minInterval  minimal time in seconds between two writes
+        @param refresh      maximal time in seconds between two writes
+        @param clock        time source in seconds
+        """
+        self.clock = clock
+        self.cfg = {}
+        self.set(resolution=resolution, deadband=deadband, minInterval=minInterval, refresh=refresh)
+        self.reset()
+    #*****************************
+
+
+    #*****************************
+    def set(self, **kwargs):
+        """
+        @note           updates policy config
+
+        @param kwargs   resolution, deadband, minInterval, refresh
+        @rtype          boolean
+        @return         successful
+        """
+        # check arguments
+        for key, value in kwargs.items():
+            if not ( key in ('resolution', 'deadband', 'minInterval', 'refresh') ):
+                raise ValueError("Unknown write policy argument '" + key + "'")
+            if ( 0 > value ):
+                raise ValueError("Write policy argument '" + key + "' needs to be non-negative")
+            self.cfg[key] = value
+        # number of fracs of resolution, f.e. 0.1 -> 1
+        self.fracs = 0
+        if ( (0 < self.cfg['resolution']) and (False == math.isinf(self.cfg['resolution'])) ):
+            self.fracs = max(0, -math.floor(math.log10(self.cfg['resolution']) + 1e-9))
+        return True
+    #*****************************
+
+
+    #*****************************
+    def reset(self):
+        """
+        @note           forgets last write, next value is always written
+        """
+        self.last_val = float('nan')    # last written, quantized value
+        self.last_time = float('nan')   # time of last write
+        self.stats = {'written': 0, 'skipped': 0, 'deadband': 0, 'rate': 0}
+    #*****************************
+
+
+    #*****************************
+    def quantize(self, value):
+        """
+        @note           rounds value to chamber resolution
+
+        @param value    set point
+        @rtype          float
+        @return         quantized set point
+        """
+        res = self.cfg['resolution']
+        if ( 0 == res ):
+            return value
+        return round(round(value / res) * res, self.fracs)
+    #*****************************
+
+
+    #*****************************
+    def check(self, value, now=None, force=False):
+        """
+        @note           applies policy to new set point, call 'commit'
+                        after successful write
+
+        @param value    requested set point
+        @param now      current time, clock if not provided
+        @param force    write w/o deadband and rate cap, f.e. shutdown
+        @rtype          float
+        @return         quantized set point to write, None if write is skipped
+        """
+        # prepare
+        if ( None == now ):
+            now = self.clock()
+        value = self.quantize(value)
+        # first write
+        if ( (False == force) and (False == math.isnan(self.last_val)) ):
+            age = now - self.last_time
+            # clock went back, f.e. virtual clock bound after start, last write is stale
+            if ( 0 <= age < self.cfg['refresh'] ):
+                # change below deadband, numeric noise of quantization is neglected
+                if ( abs(value - self.last_val) <= self.cfg['deadband'] + 1e-9 ):
+                    self.stats['skipped'] += 1
+                    self.stats['deadband'] += 1
+                    return None
+                # rate cap, value is written with one of the next calls
+                if ( age < self.cfg['minInterval'] ):
+                    self.stats['skipped'] += 1
+                    self.stats['rate'] += 1
+                    return None
+        return value
+    #*****************************
+
+
+    #*****************************
+    def commit(self, value, now=None):
+        """
+        @note           records successful write of checked set point
+
+        @param value    written set point, result of 'check'
+        @param now      current time, clock if not provided
+        """
+        self.last_val = value
+        self.last_time = self.clock() if ( None == now ) else now
+        self.stats['written'] += 1
+    #*****************************
+
+#------------------------------------------------------------------------------
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          monteCarlo.py
+@date:          2026-10-19
+
+@note           Monte Carlo simulation of one profile against varied
+                chamber models
+                  * profile rendered once per worker process
+                  * chamber model parameters drawn uniformly per run
+                  * tracking error statistics aggregated over runs
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Standard
+import math                         # sqrt
+import random                       # parameter variation
+import concurrent.futures           # process pool
+# Self
+from ATWG.waves.waves import waves                  # profile
+from ATWG.driver.sim.simChamber import simChamber   # chamber model
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+# Worker process state, rendered profile is shared by all runs of the worker
+workerProfile = {}
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+def worker_init(waveArgs, num):
+    """
+    @note           renders profile once per worker
+
+    @param waveArgs waves.set() arguments
+    @param num      number of samples
+    """
+    wave = waves()
+    wave.set(**waveArgs)
+    workerProfile['tset'] = wave.render(num)
+    workerProfile['ts'] = waveArgs.get('ts', 1)
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+def worker_run(job):
+    """
+    @note           simulates profile with one chamber model
+
+    @param job      (model, jitter, settle, seed)
+    @rtype          dict
+    @return         model and tracking error of run
+    """
+    # prepare
+    model, jitter, settle, seed = job
+    tset = workerProfile['tset']
+    ts = workerProfile['ts']
+    chamber = simChamber()
+    chamber.set_model(seed=seed, **model)
+    # simulate
+    meas = chamber.simulate(tset=tset, ts=ts, jitter=jitter)
+    # tracking error after settle time
+    first = min(len(tset), round(settle/ts))
+    sqr = 0.0
+    peak = 0.0
+    for k in range(first, len(tset)):
+        err = meas[k] - tset[k]
+        sqr += err*err
+        peak = max(peak, abs(err))
+    num = max(1, len(tset) - first)
+    return {'model': model, 'jitter': jitter, 'rms': math.sqrt(sqr/num), 'max': peak}
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class monteCarlo:
+    """
+    @note:  fans out chamber model variations over a process pool
+    """
+
+    #*****************************
+    def __init__(self, waveArgs, duration, model=None, vary=None, jitter=(0, 0), settle=0, runs=100, seed=0):
+        """
+        @note               configures batch simulation
+
+        @param waveArgs     profile, waves.set() arguments
+        @param duration     simulated time per run in sec
+        @param model        nominal simChamber model
+        @param vary         model parameter to uniform range, f.e. {'tau': (200, 400)}
+        @param jitter       uniform range of tick jitter standard deviation in sec
+        @param settle       start of tracking error evaluation in sec
+        @param runs         number of simulations
+        @param seed         seeds parameter variation
+        """
+        self.waveArgs = dict(waveArgs)
+        self.duration = duration
+        self.model = {'order': 1} if ( None == model ) else dict(model)
+        self.vary = {} if ( None == vary ) else dict(vary)
+        self.jitter = jitter
+        self.settle = settle
+        self.runs = runs
+        self.seed = seed
+        # check variation
+        for key in self.vary:
+            if not ( key in simChamber().model ):
+                raise ValueError("Unknown model argument '" + key + "'")
+    #*****************************
+
+
+    #*****************************
+    def jobs(self):
+        """
+        @note           draws model parameters, reproducible by seed
+
+        @rtype          list
+        @return         worker jobs
+        """
+        rnd = random.Random(self.seed)
+        jobs = []
+        for i in range(self.runs):
+            model = dict(self.model)
+            for key, (low, high) in sorted(self.vary.items()):
+                model[key] = rnd.uniform(low, high)
+            jobs.append((model, rnd.uniform(*self.jitter), self.settle, rnd.getrandbits(32)))
+        return jobs
+    #*****************************
+
+
+    #*****************************
+    def run(self, workers=None):
+        """
+        @note           runs all simulations
+
+        @param workers  number of processes, None: number of CPUs, 0: in process
+        @rtype          dict
+        @return         'runs': result per run, 'stats': aggregated tracking error
+        """
+        # prepare
+        num = round(self.duration / self.waveArgs.get('ts', 1))
+        jobs = self.jobs()
+        # in process, f.e. debugging
+        if ( 0 == workers ):
+            worker_init(self.waveArgs, num)
+            results = list(map(worker_run, jobs))
+        # process pool
+        else:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=worker_init, initargs=(self.waveArgs, num)) as pool:
+                results = list(pool.map(worker_run, jobs, chunksize=max(1, len(jobs)//64)))
+        # release
+        return {'runs': results, 'stats': self.aggregate(results)}
+    #*****************************
+
+
+    #*****************************
+    def aggregate(self, results):
+        """
+        @note           tracking error statistics over runs
+
+        @param results  worker results
+        @rtype          dict
+        @return         per metric min, mean, p50, p95 and max
+        """
+        stats = {}
+        for metric in ('rms', 'max'):
+            vals = sorted(res[metric] for res in results)
+            if ( 0 == len(vals) ):
+                continue
+            stats[metric] = {
+                'min': vals[0],
+                'mean': sum(vals) / len(vals),
+                'p50': vals[min(len(vals)-1, int(0.50*len(vals)))],
+                'p95': vals[min(len(vals)-1, int(0.95*len(vals)))],
+                'max': vals[-1],
+            }
+        return stats
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    myMC = monteCarlo(
+        waveArgs={'wave': "sine", 'ts': 1, 'tp': 86400, 'lowVal': -10, 'highVal': 60},     # one day sine
+        duration=3*86400,                                                                   # three days per run
+        model={'order': 2, 'tau2': 30},                                                     # nominal chamber
+        vary={'tau': (120, 600), 'rise': (2.0, 3.5), 'fall': (-2.0, -1.2), 'noise': (0, 0.1)},
+        jitter=(0, 0.05),
+        settle=3600,
+        runs=100,
+    )
+    print(myMC.run()['stats'])
+#------------------------------------------------------------------------------
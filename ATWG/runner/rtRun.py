@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          rtRun.py
+@date:          2026-10-19
+
+@note           real time run of ATWG
+                  * control loop only ticks, wake up lateness is recorded
+                  * split mode: status rendering, trace logging, rainflow
+                    and thermal dose run in a UI process, fed by the
+                    shared memory telemetry
+                  * optional CPU affinity and SCHED_FIFO on Linux
+                  * 'atwg-cli --sine --chamber=SIM --minTemp=20 --maxTemp=30 --split --cpu=1 --fifo=50'
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Standard
+import os                       # scheduler
+import signal                   # CTRL + C handled by control process
+import time                     # real time
+from array import array         # jitter histogram
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+# Jitter histogram
+RT_JITTER_BIN_SEC = 1e-6    # bin width
+RT_JITTER_BINS = 10000      # bins, later wakes are counted in overflow bin
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+def rt_setup(cpus=None, priority=None):
+    """
+    @note               requests real time scheduling for calling process,
+                        not granted requests are reported, not raised
+
+    @param cpus         CPU numbers for affinity, f.e. [1]
+    @param priority     SCHED_FIFO priority, 1..99
+    @rtype              dict
+    @return             applied affinity and priority, errors
+    """
+    res = {'affinity': None, 'fifo': None, 'errors': []}
+    if ( None != cpus ):
+        if ( hasattr(os, 'sched_setaffinity') ):
+            try:
+                os.sched_setaffinity(0, cpus)
+                res['affinity'] = sorted(os.sched_getaffinity(0))
+            except (OSError, ValueError) as e:
+                res['errors'].append("CPU affinity " + str(list(cpus)) + " not applied: " + str(e))
+        else:
+            res['errors'].append("CPU affinity not supported on this platform")
+    if ( None != priority ):
+        if ( hasattr(os, 'SCHED_FIFO') ):
+            try:
+                os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+                res['fifo'] = priority
+            except (OSError, ValueError) as e:  # f.e. missing CAP_SYS_NICE
+                res['errors'].append("SCHED_FIFO priority " + str(priority) + " not applied: " + str(e))
+        else:
+            res['errors'].append("SCHED_FIFO not supported on this platform")
+    return res
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class jitterStats:
+    """
+    @note:  wake up lateness, bounded memory for arbitrary long runs
+    """
+
+    #*****************************
+    def __init__(self):
+        """
+        @note           empty histogram
+        """
+        self.hist = array('Q', bytes(8 * (RT_JITTER_BINS + 1)))
+        self.num = 0
+        self.sum = 0.0
+        self.max = 0.0
+    #*****************************
+
+
+    #*****************************
+    def add(self, late):
+        """
+        @note           records lateness of one wake up
+
+        @param late     seconds behind due time, early wakes count as zero
+        """
+        late = max(0.0, late)
+        self.hist[min(int(late / RT_JITTER_BIN_SEC), RT_JITTER_BINS)] += 1
+        self.num += 1
+        self.sum += late
+        self.max = max(self.max, late)
+    #*****************************
+
+
+    #*****************************
+    def percentile(self, pct):
+        """
+        @note           lateness percentile, upper bin edge
+
+        @param pct      percent, 0..100
+        @rtype          float
+        @return         seconds, nan if empty
+        """
+        if ( 0 == self.num ):
+            return float('nan')
+        rank = pct / 100 * self.num
+        acc = 0
+        for idx, cnt in enumerate(self.hist):
+            acc += cnt
+            if ( (0 < cnt) and (acc >= rank) ):
+                return self.max if ( RT_JITTER_BINS == idx ) else min((idx + 1) * RT_JITTER_BIN_SEC, self.max)
+        return self.max
+    #*****************************
+
+
+    #*****************************
+    def stats(self):
+        """
+        @note           summary
+
+        @rtype          dict
+        @return         num, mean, p50, p99, max in seconds
+        """
+        mean = self.sum / self.num if ( 0 < self.num ) else float('nan')
+        return {'num': self.num, 'mean': mean, 'p50': self.percentile(50), 'p99': self.percentile(99), 'max': self.max}
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class rtRun:
+    """
+    @note:  drives ATWG tick on real time
+    """
+
+    #*****************************
+    def __init__(self, atwg, clock=time.monotonic, sleep=time.sleep):
+        """
+        @note           prepares loop
+
+        @param atwg     opened ATWG
+        @param clock    time source in seconds
+        @param sleep    sleep function
+        """
+        # check for successfull opening
+        if ( None == atwg.chamber ):
+            raise ValueError("Interfaces not opened, call methode 'open'")
+        if ( (None != atwg.hooks) and ("block" == atwg.hooks.policy) ):
+            raise ValueError("Hook policy 'block' delays control loop, use 'drop' in real time")
+        self.atwg = atwg
+        self.clock = clock
+        self.sleep = sleep
+        self.jitter = jitterStats()
+        self.wakes = 0
+    #*****************************
+
+
+    #*****************************
+    def run(self, duration=float('inf'), render=None):
+        """
+        @note               runs ATWG until stopped by API or duration
+
+        @param duration     run time in seconds
+        @param render       called after every tick, f.e. status print,
+                            None in split mode
+        @rtype              dict
+        @return             run statistics
+        """
+        tstart = now = self.clock()
+        tend = tstart + duration
+        while ( (now < tend) and ("stop" != self.atwg.state) ):
+            twake = self.atwg.tick(now)             # all due updates
+            self.wakes += 1
+            if ( None != render ):
+                render()                            # delays next wake in single process mode
+            self.sleep(max(0, twake - self.clock()))
+            now = self.clock()
+            self.jitter.add(now - twake)
+        return {'wall_sec': now - tstart, 'wakes': self.wakes, 'set': self.atwg.ticks['set'], 'meas': self.atwg.ticks['meas'], 'jitter': self.jitter.stats()}
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+def ui_main(shmName, info, waveArgs, period, traceFile, stop, render=True, doseArgs=None, rainflowArgs=None):
+    """
+    @note               UI process, renders status, writes trace and
+                        counts cycles/dose from shared memory telemetry
+
+    @param shmName      telemetry segment
+    @param info         chamber info
+    @param waveArgs     waveform settings
+    @param period       update period in seconds
+    @param traceFile    telemetry trace, None disables
+    @param stop         event, ends process
+    @param render       print status
+    @param doseArgs     thermal dose settings, None disables
+    @param rainflowArgs rainflow settings, None disables
+    """
+    from ATWG.ATWG import ATWG                          # status formatting
+    from ATWG.analysis.thermalDose import thermalDose   # status of dose
+    from ATWG.analysis.rainflow import rainflow         # cycle counting
+    from ATWG.telemetry.shm import shmReader            # telemetry
+    from ATWG.telemetry.archive import trace_writer     # CSV trace or archive
+    signal.signal(signal.SIGINT, signal.SIG_IGN)    # control process ends run, f.e. on CTRL + C
+    view = ATWG()
+    reader = shmReader(shmName, writerTracker=True)   # spawned by writer
+    trace = None if ( None == traceFile ) else trace_writer(traceFile, info)
+    dose = None if ( None == doseArgs ) else thermalDose(**doseArgs)
+    cycles = None if ( None == rainflowArgs ) else rainflow(**rainflowArgs)
+    seen = 0
+    dropped = 0
+    try:
+        while True:
+            last = stop.wait(period)
+            count, recs = reader.read(start=seen)
+            dropped += count - len(recs) - seen     # overwritten before read
+            seen = count
+            if ( None != trace ):
+                for rec in recs:
+                    trace.write(*rec)
+            if ( None != dose ):
+                for rec in recs:
+                    dose.add(rec[0], rec[2])
+            if ( None != cycles ):
+                for rec in recs:
+                    cycles.add(rec[2])
+            if ( render and (0 < len(recs)) ):
+                rec = recs[-1]
+                print(view.status_text(info=info, waveArgs=waveArgs, tmeas=rec[2], tset=rec[1], grad=rec[4], dose=None if ( None == dose ) else dose.status()), flush=True)
+            if ( last ):
+                break
+    finally:
+        if ( None != trace ):
+            trace.close()
+        reader.close()
+    if ( 0 < dropped ):
+        print("Warning: UI missed " + str(dropped) + " telemetry records")
+    if ( (None != cycles) or (None != dose) ):
+        print(view.analysis_text(cycles=cycles, dose=dose), flush=True)
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class uiProcess:
+    """
+    @note:  UI and logging beside control loop
+    """
+
+    #*****************************
+    def __init__(self, atwg, shmName, period=1, traceFile=None, render=True):
+        """
+        @note               prepares process, chamber and waveform are
+                            only passed as settings
+
+        @param atwg         opened ATWG
+        @param shmName      telemetry segment written by control loop
+        @param period       update period in seconds
+        @param traceFile    telemetry trace, written by UI process
+        @param render       print status
+        """
+        import multiprocessing  # import if required, only split mode
+        info = atwg.chamber.info()
+        rainflowArgs = None
+        if ( None != atwg.cfg_rainflow ):
+            rainflowArgs = {'binWidth': atwg.cfg_rainflow, 'hysteresis': 10**-info['fracs']['temperature']}    # chamber resolution is noise
+        ctx = multiprocessing.get_context("spawn")  # no inherited chamber handles
+        self.stopEvent = ctx.Event()
+        self.proc = ctx.Process(target=ui_main, name="atwg-ui", args=(shmName, info, dict(atwg.wave.waveArgs), period, traceFile, self.stopEvent, render, atwg.cfg_dose, rainflowArgs))
+    #*****************************
+
+
+    #*****************************
+    def start(self):
+        """
+        @note           starts UI process
+        """
+        self.proc.start()
+    #*****************************
+
+
+    #*****************************
+    def stop(self, timeout=10):
+        """
+        @note           last update, afterwards process ends
+
+        @param timeout  maximal wait in seconds
+        @rtype          int
+        @return         exit code of UI process
+        """
+        self.stopEvent.set()
+        self.proc.join(timeout)
+        if ( self.proc.is_alive() ):
+            self.proc.terminate()
+            self.proc.join()
+        return self.proc.exitcode
+    #*****************************
+
+#------------------------------------------------------------------------------
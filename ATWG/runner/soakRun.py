@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          soakRun.py
+@date:          2026-10-19
+
+@note           long run soak of ATWG on a virtual clock
+                  * run is split into windows, per window: RSS, traced
+                    memory, number of GC objects, tick latency percentiles
+                  * first window is warm up, later windows are compared
+                    against the second one
+                  * 'python3 -m ATWG.runner.soakRun --ticks=10000000 --status'
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Standard
+import os               # RSS on Linux
+import sys              # exit code
+import gc               # object count
+import time             # tick latency
+import tracemalloc      # traced memory
+import argparse         # command line
+from array import array # tick latencies of window
+# Self
+from ATWG.runner.virtualRun import virtualRun   # virtual clock binding
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+def rss():
+    """
+    @note           resident set size of process
+
+    @rtype          int
+    @return         bytes, peak RSS if current is not available
+    """
+    try:
+        with open("/proc/self/statm", "r") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource     # POSIX only
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except ImportError:
+        return 0
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class soakRun(virtualRun):
+    """
+    @note:  drives ATWG tick wise on virtual time and samples resources
+    """
+
+    #*****************************
+    def __init__(self, atwg, clock=None, status=True, traceMalloc=False):
+        """
+        @note               binds chamber to the virtual clock, call before
+                            'ATWG.start'
+
+        @param atwg         opened ATWG
+        @param clock        virtual clock, new if not provided
+        @param status       builds status string every tick, as the CLI
+        @param traceMalloc  samples traced memory, slows ticks down
+        """
+        super().__init__(atwg, clock)
+        self.status = status
+        self.traceMalloc = traceMalloc
+        self.limits = {
+            'rss': 4 * 2**20,   # RSS growth in bytes
+            'traced': 64 * 2**10,   # traced memory growth in bytes
+            'objects': 1000,    # GC object growth
+            'creep': 2.0,       # median tick latency growth factor
+        }
+        self.windows = []
+    #*****************************
+
+
+    #*****************************
+    def soak(self, ticks, windows=10):
+        """
+        @note           runs ticks, equally split into windows
+
+        @param ticks    number of ATWG ticks
+        @param windows  number of sampling windows, first is warm up
+        @rtype          dict
+        @return         {'windows': [...], 'failures': [...]}
+        """
+        # check arg
+        if ( 3 > windows ):
+            raise ValueError("Soak needs at least three windows")
+        # prepare
+        num = max(1, ticks // windows)
+        lat = array('d', bytes(8*num))  # reused for every window
+        perf = time.perf_counter
+        tick = self.atwg.tick
+        clock = self.clock
+        self.windows = []
+        if ( self.traceMalloc ):
+            tracemalloc.start()
+        # run
+        try:
+            for win in range(windows):
+                twall = perf()
+                for k in range(num):
+                    now = clock.now()
+                    tstart = perf()
+                    twake = tick(now)
+                    if ( self.status ):
+                        self.atwg.status()
+                    lat[k] = perf() - tstart
+                    clock.sleep(twake - now)
+                self.windows.append(self.sample(lat, perf() - twall))
+        finally:
+            if ( self.traceMalloc ):
+                tracemalloc.stop()
+        # release
+        return {'windows': self.windows, 'failures': self.check()}
+    #*****************************
+
+
+    #*****************************
+    def sample(self, lat, wall):
+        """
+        @note           resource sample at window end
+
+        @param lat      tick latencies of window in sec
+        @param wall     wall time of window in sec
+        @rtype          dict
+        @return         window statistics
+        """
+        srt = sorted(lat)
+        gc.collect()
+        return {
+            'sim_sec': self.clock.now(),
+            'wall_sec': wall,
+            'rss': rss(),
+            'traced': tracemalloc.get_traced_memory()[0] if ( self.traceMalloc ) else 0,
+            'objects': len(gc.get_objects()),
+            'p50': srt[len(srt)//2],
+            'p99': srt[min(len(srt)-1, (99*len(srt))//100)],
+            'max': srt[-1],
+        }
+    #*****************************
+
+
+    #*****************************
+    def check(self):
+        """
+        @note           compares last window against reference window,
+                        first window is warm up
+
+        @rtype          list
+        @return         failure descriptions, empty if passed
+        """
+        failures = []
+        ref = self.windows[1]
+        last = self.windows[-1]
+        for key, unit in (('rss', "bytes"), ('traced', "bytes"), ('objects', "objects")):
+            growth = last[key] - ref[key]
+            if ( growth > self.limits[key] ):
+                failures.append("{key} grew by {growth:d} {unit}, limit {limit:d}".format(key=key, growth=growth, unit=unit, limit=self.limits[key]))
+        # latency creep, median of last windows against reference
+        if ( 0 < ref['p50'] ):
+            creep = min(win['p50'] for win in self.windows[-2:]) / ref['p50']
+            if ( creep > self.limits['creep'] ):
+                failures.append("tick latency crept by factor {creep:.2f}, limit {limit:.2f}".format(creep=creep, limit=self.limits['creep']))
+        return failures
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+    # command line
+    parser = argparse.ArgumentParser(description="ATWG soak run on virtual clock")
+    parser.add_argument("--ticks",       default=10**7, type=int, help="number of ticks")
+    parser.add_argument("--windows",     default=10,    type=int, help="sampling windows, first is warm up")
+    parser.add_argument("--simFile",     default=None,            help="run SH641 driver on dialog file instead of SIM")
+    parser.add_argument("--status",      action='store_true',     help="build status string every tick")
+    parser.add_argument("--tracemalloc", action='store_true',     help="sample traced memory")
+    parser.add_argument("--trace",       default=None,            help="telemetry trace file, f.e. /dev/null")
+    args = parser.parse_args()
+    # prepare
+    from ATWG.ATWG import ATWG
+    myATWG = ATWG()
+    chamberArg, waveArg = myATWG.parse_cli(["--sine", "--chamber=SIM", "--minTemp=10", "--maxTemp=60", "--period=1d"])
+    myATWG.open(chamberArg=chamberArg, waveArg=waveArg)
+    mySoak = soakRun(myATWG, status=args.status, traceMalloc=args.tracemalloc)
+    if ( None != args.simFile ):                    # dialog file, no hardware, only policy on virtual clock
+        from ATWG.driver.espec.sh641 import especShSu
+        myATWG.chamber = especShSu()
+        myATWG.chamber.open(simFile=args.simFile)
+        myATWG.chamber.policy.clock = mySoak.clock.now
+        myATWG.measure = myATWG.chamber.measure
+    if ( None != args.trace ):
+        from ATWG.telemetry.trace import traceWriter
+        myATWG.trace = traceWriter(args.trace)
+    myATWG.start()
+    # run
+    res = mySoak.soak(ticks=args.ticks, windows=args.windows)
+    if ( None != myATWG.trace ):
+        myATWG.trace.close()
+    for win in res['windows']:
+        print("sim {sim_sec:>12.0f}s  wall {wall_sec:7.1f}s  rss {rss:>10d}  traced {traced:>9d}  objects {objects:>7d}  p50 {p50:.2e}s  p99 {p99:.2e}s  max {max:.2e}s".format(**win))
+    for failure in res['failures']:
+        print("Error: " + failure)
+    sys.exit(1 if ( 0 < len(res['failures']) ) else 0)
+#------------------------------------------------------------------------------
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          virtualRun.py
+@date:          2026-10-19
+
+@note           fast forward run of ATWG on a virtual clock
+                  * no real time waiting, runs as fast as the CPU allows
+                  * intended for the SIM chamber
+                  * 'atwg-cli --sine --chamber=SIM --minTemp=20 --maxTemp=30 --period=1d --fastForward=30d --trace=run.csv'
+"""
+
+
+
+#------------------------------------------------------------------------------
+import time     # wall clock for statistics
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class virtualClock:
+    """
+    @note:  time only advances by sleep
+    """
+
+    #*****************************
+    def __init__(self, start=0.0):
+        """
+        @note           initializes clock
+
+        @param start    start time in seconds
+        """
+        self.t = start
+    #*****************************
+
+
+    #*****************************
+    def now(self):
+        """
+        @note           current virtual time
+
+        @rtype          float
+        @return         time in seconds
+        """
+        return self.t
+    #*****************************
+
+
+    #*****************************
+    def sleep(self, sec):
+        """
+        @note           advances virtual time
+
+        @param sec      sleep time in seconds
+        """
+        if ( 0 < sec ):
+            self.t += sec
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class virtualRun:
+    """
+    @note:  drives ATWG tick on virtual time
+    """
+
+    #*****************************
+    def __init__(self, atwg, clock=None):
+        """
+        @note           binds time sources of chamber to the virtual clock,
+                        call before 'ATWG.start'
+
+        @param atwg     opened ATWG
+        @param clock    virtual clock, new if not provided
+        """
+        # check for successfull opening
+        if ( None == atwg.chamber ):
+            raise ValueError("Interfaces not opened, call methode 'open'")
+        # real chamber would get set points as fast as the CPU allows
+        if not ( hasattr(atwg.chamber, 'clock') and hasattr(atwg.chamber, 'sleep') ):
+            raise ValueError("Virtual clock needs simulated chamber, '" + type(atwg.chamber).__name__ + "' has no model time")
+        self.atwg = atwg
+        self.clock = virtualClock() if ( None == clock ) else clock
+        # chamber timing follows virtual clock
+        if ( None != getattr(self.atwg.chamber, 'policy', None) ):
+            self.atwg.chamber.policy.clock = self.clock.now
+        self.atwg.chamber.clock = self.clock.now
+        self.atwg.chamber.sleep = self.clock.sleep
+    #*****************************
+
+
+    #*****************************
+    def run(self, duration):
+        """
+        @note               runs ATWG for given virtual time
+
+        @param duration     simulated time in seconds
+        @rtype              dict
+        @return             run statistics
+        """
+        # prepare
+        twall = time.perf_counter()
+        now = self.clock.now()
+        tend = now + duration
+        wakes = 0
+        # control loop
+        while ( (now < tend) and ("stop" != self.atwg.state) ):   # API can stop
+            twake = self.atwg.tick(now)     # all due updates
+            wakes += 1
+            self.clock.sleep(twake - now)   # jump to next due update
+            now = self.clock.now()
+        # release statistics
+        return {'sim_sec': duration, 'wall_sec': time.perf_counter() - twall, 'wakes': wakes, 'set': self.atwg.ticks['set'], 'meas': self.atwg.ticks['meas']}
+    #*****************************
+
+#------------------------------------------------------------------------------
@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          apiServer.py
+@date:          2026-10-19
+
+@note           local status/control API of ATWG
+                  * asyncio HTTP server in own thread, TCP or Unix socket
+                  * handlers only read the snapshot published by 'ATWG.tick',
+                    clients add no latency to the control loop
+                  * GET  /state, /clima, /wave, /progress, /loop -> JSON
+                  * GET  /rainflow, /dose, /hooks -> cycle histogram, thermal
+                    dose, hook dispatch statistics, if enabled
+                  * POST /pause, /resume, /stop -> queued for next tick
+                  * 'curl http://127.0.0.1:8080/state'
+                    'curl --unix-socket /tmp/atwg.sock -X POST http://atwg/pause'
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Standard
+import os           # unix socket cleanup
+import math         # isnan
+import json         # response encoding
+import asyncio      # event loop
+import threading    # server runs beside control loop
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+# Protocol
+API_UNIX_PREFIX = "unix:"                                       # address prefix of unix socket
+API_GET = ("state", "clima", "wave", "progress", "loop")        # readable resources, state is all
+API_POST = ("pause", "resume", "stop")                          # accepted commands
+API_ANALYSIS = {"rainflow": ("cycles", "Rainflow counting"), "dose": ("dose", "Thermal dose"), "hooks": ("hooks", "User hooks")}   # ATWG attribute, read by report
+API_REQ_MAX = 8192                                              # maximal request header size
+API_REASON = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 503: "Service Unavailable"}
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class apiServer:
+    """
+    @note:  serves ATWG snapshots and accepts commands
+    """
+
+    #*****************************
+    def __init__(self, atwg, address="127.0.0.1:8080"):
+        """
+        @note           prepares server, call after 'ATWG.open'
+
+        @param atwg     opened ATWG
+        @param address  'host:port', port 0 selects free port, or 'unix:path'
+        """
+        # check for successfull opening
+        if ( (None == atwg.chamber) or (None == atwg.wave) ):
+            raise ValueError("Interfaces not opened, call methode 'open'")
+        self.atwg = atwg
+        self.address = address
+        # static part, waveform is fixed after open
+        self.wave = dict(atwg.wave.waveArgs)
+        self.wave['chamber'] = atwg.chamber.info()['name']
+        # encoded response of last snapshot, shared by all clients
+        self.lastSnap = None
+        self.lastDoc = None
+        self.lastBody = {}      # encoded resources of last snapshot, built on first request
+        # event loop
+        self.loop = None
+        self.server = None
+        self.thread = None
+        self.ready = threading.Event()
+        self.error = None
+    #*****************************
+
+
+    #*****************************
+    def start(self):
+        """
+        @note           starts server thread and enables snapshot publishing
+
+        @rtype          string
+        @return         bound address, f.e. '127.0.0.1:41234'
+        """
+        self.thread = threading.Thread(target=self.serve, name="atwg-api", daemon=True)
+        self.thread.start()
+        self.ready.wait()
+        if ( None != self.error ):
+            raise ValueError("API server failed on '" + self.address + "': " + str(self.error))
+        self.atwg.api = self    # tick publishes from now on
+        return self.address
+    #*****************************
+
+
+    #*****************************
+    def stop(self):
+        """
+        @note           stops server, publishing ends
+        """
+        self.atwg.api = None
+        if ( (None != self.loop) and self.thread.is_alive() ):
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+        if ( self.address.startswith(API_UNIX_PREFIX) and os.path.exists(self.address[len(API_UNIX_PREFIX):]) ):
+            os.remove(self.address[len(API_UNIX_PREFIX):])
+    #*****************************
+
+
+    #*****************************
+    def serve(self):
+        """
+        @note           event loop of server thread
+        """
+        self.loop = asyncio.new_event_loop()
+        try:
+            if ( self.address.startswith(API_UNIX_PREFIX) ):
+                self.server = self.loop.run_until_complete(asyncio.start_unix_server(self.handle, path=self.address[len(API_UNIX_PREFIX):], limit=API_REQ_MAX))
+            else:
+                host, sep, port = self.address.rpartition(":")
+                self.server = self.loop.run_until_complete(asyncio.start_server(self.handle, host=host, port=int(port), limit=API_REQ_MAX))
+                host, port = self.server.sockets[0].getsockname()[0:2]
+                self.address = host + ":" + str(port)   # resolves port 0
+        except (OSError, ValueError, OverflowError) as e:   # f.e. port in use or out of range
+            self.error = e
+            self.ready.set()
+            self.loop.close()
+            return
+        self.ready.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            self.server.close()
+            self.loop.run_until_complete(self.server.wait_closed())
+            self.loop.close()
+    #*****************************
+
+
+    #*****************************
+    async def handle(self, reader, writer):
+        """
+        @note           serves one request, connection is closed afterwards
+
+        @param reader   client stream
+        @param writer   client stream
+        """
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+            code, doc = self.request(head.split(b"\r\n", 1)[0])
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            code, doc = 400, {'error': "Malformed request"}
+        except ConnectionError:
+            writer.close()
+            return
+        body = doc if ( isinstance(doc, bytes) ) else json.dumps(doc).encode()   # snapshot resources are cached encoded
+        writer.write(("HTTP/1.1 {:d} {}\r\nContent-Type: application/json\r\nContent-Length: {:d}\r\nConnection: close\r\n\r\n".format(code, API_REASON[code], len(body))).encode() + body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+    #*****************************
+
+
+    #*****************************
+    def request(self, line):
+        """
+        @note           dispatches request line
+
+        @param line     f.e. b'GET /state HTTP/1.1'
+        @rtype          tuple
+        @return         status code, JSON document or encoded snapshot
+                        resource
+        """
+        parts = line.decode(errors="replace").split()
+        if ( 3 != len(parts) ):
+            return 400, {'error': "Malformed request"}
+        method, res = parts[0], parts[1].strip("/")
+        # read
+        if ( res in API_GET ):
+            if ( "GET" != method ):
+                return 405, {'error': "Use GET for '/" + res + "'"}
+            body = self.encoded(res)
+            if ( None == body ):
+                return 503, {'error': "No snapshot published yet"}
+            return 200, body
+        # online analysis, report is thread safe
+        if ( res in API_ANALYSIS ):
+            if ( "GET" != method ):
+                return 405, {'error': "Use GET for '/" + res + "'"}
+            attr, name = API_ANALYSIS[res]
+            if ( None == getattr(self.atwg, attr) ):
+                return 404, {'error': name + " not enabled"}
+            doc = getattr(self.atwg, attr).report()
+            return 200, {key: (None if ( isinstance(val, float) and math.isnan(val) ) else val) for key, val in doc.items()}
+        # command, applied by next tick
+        if ( res in API_POST ):
+            if ( "POST" != method ):
+                return 405, {'error': "Use POST for '/" + res + "'"}
+            self.atwg.commands.append(res)
+            return 202, {'command': res}
+        return 404, {'error': "Unknown resource '/" + res + "'"}
+    #*****************************
+
+
+    #*****************************
+    def document(self):
+        """
+        @note           converts last snapshot to JSON document, built once
+                        per snapshot and shared by all requests
+
+        @rtype          dict
+        @return         state, clima, wave, progress, loop; None if no snapshot
+        """
+        snap = self.atwg.snapshot   # single read, snapshot is immutable
+        if ( snap is self.lastSnap ):
+            return self.lastDoc
+        if ( None == snap ):
+            return None
+        num = lambda val: None if ( math.isnan(val) ) else val  # JSON has no nan
+        doc = {
+            'state': snap.state,
+            'time': snap.time,
+            'clima': {'tmeas': num(snap.tmeas), 'humidity': num(snap.humidity), 'tset': num(snap.tset), 'grad': num(snap.grad)},
+            'wave': self.wave,
+            'progress': {'elapsed_sec': snap.elapsed, 'phase': snap.phase},
+            'loop': {'wakes': snap.wakes, 'set': snap.set, 'meas': snap.meas, 'written': snap.written, 'skipped': snap.skipped,
+                     'tick_sec': snap.tick_sec, 'tick_max_sec': snap.tick_max_sec},
+        }
+        self.lastSnap, self.lastDoc, self.lastBody = snap, doc, {}
+        return doc
+    #*****************************
+
+
+    #*****************************
+    def encoded(self, res):
+        """
+        @note           JSON encoded resource of last snapshot, encoded once
+                        per snapshot and shared by all requests
+
+        @param res      resource, f.e. 'state'
+        @rtype          bytes
+        @return         response body; None if no snapshot
+        """
+        doc = self.document()
+        if ( None == doc ):
+            return None
+        body = self.lastBody.get(res)
+        if ( None == body ):
+            body = json.dumps(doc if ( "state" == res ) else doc[res]).encode()
+            self.lastBody[res] = body
+        return body
+    #*****************************
+
+#------------------------------------------------------------------------------
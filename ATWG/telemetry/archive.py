@@ -0,0 +1,476 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          archive.py
+@date:          2026-10-19
+
+@note           columnar telemetry archive, long term storage of ATWG runs
+                  * columns of trace.py quantized to integers:
+                    time 1ms, temperatures/humidity chamber resolution,
+                    gradient 1e-6 C/s
+                  * per column delta and zigzag varint encoded
+                  * blocks carry count, min/max per column and payload
+                    sizes per column, queries decode only the overlapping
+                    blocks and only the requested columns
+                  * index of all block headers at file end, w/o index,
+                    f.e. after crash, block headers are scanned
+                  * layout version 1, little endian:
+                      header   : magic 'ATWA', version H, number of columns H,
+                                 quantum per column d
+                      block    : count I, min/max per column q, size per column I,
+                                 column payloads
+                      index    : number of blocks I, per block offset Q and header
+                      trailer  : index offset Q, magic 'ATWI'
+                  * existing archive is overwritten by default as the CSV
+                    trace; a continued archive shifts the time of the new
+                    run behind the last record, f.e. monotonic clock
+                    restarted after reboot
+                  * 'python3 -m ATWG.telemetry.archive --convert run.csv run.atwa'
+                    'python3 -m ATWG.telemetry.archive --range=3600,7200 run.atwa'
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Standard
+import os                       # file size
+import sys                      # stdout
+import math                     # isnan
+import struct                   # binary layout
+import bisect                   # range search in time column
+import argparse                 # command line
+from itertools import accumulate    # delta decoding
+# Self
+from ATWG.telemetry.trace import TRACE_COLS, TRACE_HEADER, traceWriter, traceReader    # columns, csv
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+# Layout
+ARC_EXT = ".atwa"                                       # file extension, selects archive in 'trace_writer'
+ARC_MAGIC = b"ATWA"                                     # file identifier
+ARC_VERSION = 1                                         # incremented on layout change
+ARC_NCOLS = len(TRACE_COLS)                             # time, tset, tmeas, humidity, grad
+ARC_HEADER = struct.Struct("<4sHH" + "d" * ARC_NCOLS)   # magic, version, columns, quanta
+ARC_BLOCK = struct.Struct("<I" + "q" * (2 * ARC_NCOLS) + "I" * ARC_NCOLS)   # count, min/max, sizes
+ARC_INDEX = struct.Struct("<Q")                         # block offset
+ARC_TRAILER = struct.Struct("<Q4s")                     # index offset, magic
+ARC_TRAILER_MAGIC = b"ATWI"                             # index present
+ARC_NAN = -(1 << 62)                                    # quantized nan
+ARC_QUANTA = (1e-3, 0.1, 0.1, 0.1, 1e-6)                # default quantum per column
+ARC_ZIGZAG1 = [(code >> 1) ^ -(code & 1) for code in range(128)]    # single byte varint to delta
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+def varint_encode(vals, out):
+    """
+    @note           delta and zigzag varint encoding
+
+    @param vals     integers
+    @param out      bytearray, encoded values are appended
+    """
+    last = 0
+    append = out.append
+    for val in vals:
+        delta = val - last
+        last = val
+        zz = (delta << 1) ^ (delta >> 63)   # zigzag, small magnitudes -> small codes
+        while ( 0x80 <= zz ):
+            append((zz & 0x7f) | 0x80)
+            zz >>= 7
+        append(zz)
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+def varint_decode(buf, num):
+    """
+    @note           inverse of 'varint_encode'
+
+    @param buf      encoded bytes
+    @param num      number of values
+    @rtype          list
+    @return         integers
+    """
+    # only single byte codes, f.e. slow temperature change or nan column
+    if ( len(buf) == num ):
+        return list(accumulate(map(ARC_ZIGZAG1.__getitem__, buf)))
+    vals = [0] * num
+    last = 0
+    pos = 0
+    for idx in range(num):
+        zz = 0
+        shift = 0
+        while True:
+            byte = buf[pos]
+            pos += 1
+            zz |= (byte & 0x7f) << shift
+            if ( byte < 0x80 ):
+                break
+            shift += 7
+        last += (zz >> 1) ^ -(zz & 1)
+        vals[idx] = last
+    return vals
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+def trace_writer(traceFile, info=None):
+    """
+    @note               telemetry writer selected by file extension
+
+    @param traceFile    '*.atwa' archive, otherwise CSV trace
+    @param info         chamber info, archive quantizes to chamber resolution
+    @rtype              archiveWriter | traceWriter
+    @return             opened writer
+    """
+    if ( traceFile.endswith(ARC_EXT) ):
+        resolution = ARC_QUANTA[1] if ( None == info ) else 10**-info['fracs']['temperature']
+        return archiveWriter(traceFile, resolution=resolution)
+    return traceWriter(traceFile)
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class archiveWriter:
+    """
+    @note:  writes telemetry archive, same call as traceWriter
+    """
+
+    #*****************************
+    def __init__(self, arcFile, resolution=0.1, buffered=4096, append=False):
+        """
+        @note               creates archive
+
+        @param arcFile      path to archive
+        @param resolution   quantum of temperatures and humidity
+        @param buffered     records per block
+        @param append       continue existing archive, time of new run
+                            starts after last record, otherwise overwritten
+        """
+        self.arcFile = arcFile
+        self.buffered = buffered
+        self.cols = [[] for i in range(ARC_NCOLS)]
+        self.index = []     # block offset and header, written on close
+        self.rows = 0
+        self.shift = 0.0    # time offset of this run, None: set by first record
+        # continue archive, index is rewritten on close
+        if ( append and os.path.isfile(arcFile) and (0 < os.path.getsize(arcFile)) ):
+            reader = archiveReader(arcFile)
+            self.quanta = reader.quanta
+            self.rows = sum(blk['count'] for blk in reader.blocks)
+            self.tlast = reader.info()['tstop']
+            self.shift = None if ( self.tlast == self.tlast ) else 0.0     # nan: empty archive
+            self.fH = open(arcFile, 'r+b')
+            for blk in reader.blocks:
+                self.fH.seek(blk['offset'])
+                self.index.append(ARC_INDEX.pack(blk['offset']) + self.fH.read(ARC_BLOCK.size))
+            self.fH.seek(reader.end)
+            self.fH.truncate()
+        else:
+            self.quanta = (ARC_QUANTA[0], resolution, resolution, resolution, ARC_QUANTA[4])
+            self.fH = open(arcFile, 'wb')
+            self.fH.write(ARC_HEADER.pack(ARC_MAGIC, ARC_VERSION, ARC_NCOLS, *self.quanta))
+        self.scale = [1 / quantum for quantum in self.quanta]
+    #*****************************
+
+
+    #*****************************
+    def write(self, time, tset, tmeas, humidity, grad):
+        """
+        @note           appends one telemetry record
+        """
+        if ( None == self.shift ):      # first record of continued run, overlapping run moves behind last record
+            self.shift = (self.tlast + self.quanta[0] - time) if ( time <= self.tlast ) else 0.0
+        time += self.shift
+        for col, scale, val in zip(self.cols, self.scale, (time, tset, tmeas, humidity, grad)):
+            col.append(ARC_NAN if ( val != val ) else round(val * scale))    # val != val: nan
+        self.rows += 1
+        if ( self.buffered <= len(self.cols[0]) ):
+            self.flush()
+    #*****************************
+
+
+    #*****************************
+    def flush(self):
+        """
+        @note           writes buffered records as block
+        """
+        if ( 0 == len(self.cols[0]) ):
+            return
+        payloads = []
+        minmax = []
+        for col in self.cols:
+            buf = bytearray()
+            varint_encode(col, buf)
+            payloads.append(buf)
+            vals = [val for val in col if ( ARC_NAN != val )]
+            minmax += [min(vals), max(vals)] if ( 0 < len(vals) ) else [ARC_NAN, ARC_NAN]
+        head = ARC_BLOCK.pack(len(self.cols[0]), *minmax, *[len(buf) for buf in payloads])
+        self.index.append(ARC_INDEX.pack(self.fH.tell()) + head)
+        self.fH.write(head)
+        for buf in payloads:
+            self.fH.write(buf)
+        self.fH.flush()
+        for col in self.cols:
+            col.clear()
+    #*****************************
+
+
+    #*****************************
+    def close(self):
+        """
+        @note           writes last block and index
+        """
+        self.flush()
+        indexOfs = self.fH.tell()
+        self.fH.write(struct.pack("<I", len(self.index)))
+        self.fH.writelines(self.index)  # repeats block headers, query reads only index
+        self.fH.write(ARC_TRAILER.pack(indexOfs, ARC_TRAILER_MAGIC))
+        self.fH.close()
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class archiveReader:
+    """
+    @note:  range queries on telemetry archive
+    """
+
+    #*****************************
+    def __init__(self, arcFile):
+        """
+        @note           reads header and block index
+
+        @param arcFile  path to archive
+        """
+        self.arcFile = arcFile
+        self.blocks = []    # per block: offset, count, min/max per column, payload sizes
+        with open(arcFile, 'rb') as fH:
+            head = fH.read(ARC_HEADER.size)
+            if ( (ARC_HEADER.size != len(head)) or (ARC_MAGIC != head[0:4]) ):
+                raise ValueError("File '" + arcFile + "' is no telemetry archive")
+            magic, version, ncols, *quanta = ARC_HEADER.unpack(head)
+            if ( (ARC_VERSION != version) or (ARC_NCOLS != ncols) ):
+                raise ValueError("File '" + arcFile + "' has unsupported archive version " + str(version))
+            self.quanta = tuple(quanta)
+            size = fH.seek(0, os.SEEK_END)
+            # index
+            if ( size >= ARC_HEADER.size + ARC_TRAILER.size ):
+                fH.seek(size - ARC_TRAILER.size)
+                indexOfs, magic = ARC_TRAILER.unpack(fH.read(ARC_TRAILER.size))
+                if ( ARC_TRAILER_MAGIC == magic ):
+                    fH.seek(indexOfs)
+                    num = struct.unpack("<I", fH.read(4))[0]
+                    entry = ARC_INDEX.size + ARC_BLOCK.size
+                    raw = fH.read(num * entry)
+                    for i in range(num):
+                        self.add_block(ARC_INDEX.unpack_from(raw, i*entry)[0], ARC_BLOCK.unpack_from(raw, i*entry + ARC_INDEX.size))
+                    self.end = indexOfs
+                    return
+            # unclosed archive, scan block headers
+            ofs = ARC_HEADER.size
+            while ( ofs + ARC_BLOCK.size <= size ):
+                fH.seek(ofs)
+                head = ARC_BLOCK.unpack(fH.read(ARC_BLOCK.size))
+                length = ARC_BLOCK.size + sum(head[1+2*ARC_NCOLS:])
+                if ( ofs + length > size ):
+                    break   # incomplete last block
+                self.add_block(ofs, head)
+                ofs += length
+            self.end = ofs
+    #*****************************
+
+
+    #*****************************
+    def add_block(self, ofs, head):
+        """
+        @note           adds block header to index
+
+        @param ofs      file offset of block
+        @param head     unpacked block header
+        """
+        self.blocks.append({
+            'offset': ofs,
+            'count': head[0],
+            'min': [self.value(head[1+2*i], i) for i in range(ARC_NCOLS)],
+            'max': [self.value(head[2+2*i], i) for i in range(ARC_NCOLS)],
+            'sizes': head[1+2*ARC_NCOLS:],
+        })
+    #*****************************
+
+
+    #*****************************
+    def value(self, quant, col):
+        """
+        @note           quantized integer to value
+
+        @param quant    integer
+        @param col      column number
+        @rtype          float
+        @return         value, nan if not available
+        """
+        return float('nan') if ( ARC_NAN == quant ) else quant * self.quanta[col]
+    #*****************************
+
+
+    #*****************************
+    def decode(self, fH, blk, cols):
+        """
+        @note           decodes requested columns of one block
+
+        @param fH       opened archive
+        @param blk      block from index
+        @param cols     column numbers
+        @rtype          dict
+        @return         column number to list of values
+        """
+        res = {}
+        ofs = blk['offset'] + ARC_BLOCK.size
+        for col in range(ARC_NCOLS):
+            if ( col in cols ):
+                fH.seek(ofs)
+                quanta = varint_decode(fH.read(blk['sizes'][col]), blk['count'])
+                quantum = self.quanta[col]
+                res[col] = [float('nan') if ( ARC_NAN == q ) else q * quantum for q in quanta]
+            ofs += blk['sizes'][col]
+        return res
+    #*****************************
+
+
+    #*****************************
+    def range(self, tstart=float('-inf'), tstop=float('inf'), cols=TRACE_COLS):
+        """
+        @note           records in time range, only overlapping blocks
+                        are decoded
+
+        @param tstart   first time, inclusive
+        @param tstop    last time, inclusive
+        @param cols     column names
+        @rtype          tuple
+        @return         one tuple per record, values in order of cols
+        """
+        for blk in self.columns(tstart, tstop, cols):
+            yield from zip(*[blk[col] for col in cols])
+    #*****************************
+
+
+    #*****************************
+    def columns(self, tstart=float('-inf'), tstop=float('inf'), cols=TRACE_COLS):
+        """
+        @note           iterates block wise over columns, same as
+                        'traceReader.blocks'
+
+        @param tstart   first time, inclusive
+        @param tstop    last time, inclusive
+        @param cols     column names
+        @rtype          dict
+        @return         column name to list of values, per block
+        """
+        nums = [TRACE_COLS.index(col) for col in cols]
+        with open(self.arcFile, 'rb') as fH:
+            for blk in self.blocks:
+                if ( (blk['max'][0] < tstart) or (blk['min'][0] > tstop) ):
+                    continue
+                res = self.decode(fH, blk, set([0] + nums))
+                first = bisect.bisect_left(res[0], tstart - self.quanta[0]/2)
+                last = bisect.bisect_right(res[0], tstop + self.quanta[0]/2)
+                if ( (0 < first) or (len(res[0]) > last) ):
+                    res = {num: vals[first:last] for num, vals in res.items()}
+                yield {TRACE_COLS[num]: res[num] for num in nums}
+    #*****************************
+
+
+    #*****************************
+    def overview(self, num=1000):
+        """
+        @note           downsampled overview from index, no block is decoded
+
+        @param num      maximal number of points, neighboring blocks are merged
+        @rtype          list
+        @return         per point: tstart, tstop, count, min and max per column
+        """
+        group = max(1, math.ceil(len(self.blocks) / num))
+        res = []
+        for first in range(0, len(self.blocks), group):
+            blks = self.blocks[first:first+group]
+            pt = {'tstart': blks[0]['min'][0], 'tstop': blks[-1]['max'][0], 'count': sum(blk['count'] for blk in blks)}
+            for col in range(1, ARC_NCOLS):
+                mins = [blk['min'][col] for blk in blks if not math.isnan(blk['min'][col])]
+                maxs = [blk['max'][col] for blk in blks if not math.isnan(blk['max'][col])]
+                pt[TRACE_COLS[col] + "_min"] = min(mins) if ( 0 < len(mins) ) else float('nan')
+                pt[TRACE_COLS[col] + "_max"] = max(maxs) if ( 0 < len(maxs) ) else float('nan')
+            res.append(pt)
+        return res
+    #*****************************
+
+
+    #*****************************
+    def info(self):
+        """
+        @note           archive summary
+
+        @rtype          dict
+        @return         blocks, rows, tstart, tstop over all blocks, bytes
+        """
+        tmin = [blk['min'][0] for blk in self.blocks if ( blk['min'][0] == blk['min'][0] )]    # w/o nan
+        tmax = [blk['max'][0] for blk in self.blocks if ( blk['max'][0] == blk['max'][0] )]
+        return {
+            'blocks': len(self.blocks),
+            'rows': sum(blk['count'] for blk in self.blocks),
+            'tstart': min(tmin) if ( 0 < len(tmin) ) else float('nan'),
+            'tstop': max(tmax) if ( 0 < len(tmax) ) else float('nan'),
+            'bytes': os.path.getsize(self.arcFile),
+        }
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="ATWG telemetry archive")
+    parser.add_argument("--convert",    nargs=2, default=None, help="CSV trace to archive, f.e. run.csv run.atwa")
+    parser.add_argument("--resolution", default=0.1, type=float, help="quantum of temperatures on convert")
+    parser.add_argument("--range",      default=None, help="print records as CSV, f.e. 3600,7200")
+    parser.add_argument("--overview",   default=None, type=int, help="print downsampled overview with given points")
+    parser.add_argument("archive",      nargs='?', default=None, help="archive for --range, --overview, info")
+    args = parser.parse_args()
+    if ( None != args.convert ):
+        arc = archiveWriter(args.convert[1], resolution=args.resolution, append=False)
+        for rec in traceReader(args.convert[0]).rows():
+            arc.write(*rec)
+        arc.close()
+        print("Info: {:d} records, {:d} bytes".format(arc.rows, os.path.getsize(args.convert[1])))
+    elif ( None != args.archive ):
+        arc = archiveReader(args.archive)
+        if ( None != args.range ):
+            tstart, tstop = [float(val) for val in args.range.split(",")]
+            sys.stdout.write(TRACE_HEADER)
+            for rec in arc.range(tstart, tstop):
+                sys.stdout.write(",".join(map(str, rec)) + "\n")
+        elif ( None != args.overview ):
+            for pt in arc.overview(args.overview):
+                print(pt)
+        else:
+            print(arc.info())
+    else:
+        parser.print_help()
+#------------------------------------------------------------------------------
@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          hooks.py
+@date:          2026-10-19
+
+@note           user hooks of ATWG tick, executed off the control path
+                  * events: tick, segment change of set point (rise, fall,
+                    hold) and peak of set point (max, min)
+                  * 'ATWG.tick' only detects the event and queues an
+                    immutable record, O(1) w/o waiting
+                  * callbacks run in a bounded pool of worker threads,
+                    one worker keeps the event order
+                  * full queue: 'drop' discards the event and counts it,
+                    'block' waits for a free slot (backpressure), only
+                    allowed on virtual clock
+                  * failing callbacks are counted, the worker continues
+                  * callbacks share the interpreter with the control loop,
+                    blocking I/O is fine, heavy computation belongs into
+                    an own process
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Standard
+import queue                    # bounded event queue
+import threading                # workers beside control loop
+from collections import namedtuple  # event record
+# Self
+from ATWG.analysis.trackError import SEG_KINDS, SEG_GRAD_EPS    # segment of set point gradient
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+# Events
+HOOK_EVENTS = ("tick", "segment", "peak")       # callback kinds
+HOOK_POLICIES = ("drop", "block")               # full queue behavior
+hookRec = namedtuple('hookRec', ['event', 'time', 'tset', 'tmeas', 'humidity', 'grad', 'segment', 'peak'])   # peak is max/min, only peak event
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class hookPool:
+    """
+    @note:  dispatches tick events to user callbacks
+    """
+
+    #*****************************
+    def __init__(self, workers=1, depth=1024, policy="drop"):
+        """
+        @note           starts workers
+
+        @param workers  number of worker threads
+        @param depth    maximal queued events
+        @param policy   full queue, 'drop' or 'block'
+        """
+        if ( 1 > workers ):
+            raise ValueError("Hook pool needs at least one worker")
+        if ( 1 > depth ):
+            raise ValueError("Hook queue depth needs to be positive")
+        if not ( policy in HOOK_POLICIES ):
+            raise ValueError("Unknown hook policy '" + str(policy) + "', use " + ", ".join(HOOK_POLICIES))
+        self.workers = workers
+        self.depth = depth
+        self.policy = policy
+        self.callbacks = {event: () for event in HOOK_EVENTS}   # replaced on add, workers read w/o lock
+        self.queue = queue.Queue(maxsize=depth)
+        # statistics
+        self.queued = 0         # accepted events, control loop only
+        self.dropped = 0        # discarded events, control loop only
+        self.done = 0           # processed events, workers
+        self.errors = 0         # failed callbacks, workers
+        self.lastError = None   # last callback exception
+        self.lock = threading.Lock()    # worker statistics
+        # set point tracking
+        self.segment = None     # rise, fall, hold
+        self.dir = 0            # direction of last non hold segment
+        self.lastSet = None     # set point of previous update, extreme on reversal
+        # workers
+        self.threads = [threading.Thread(target=self.worker, name="atwg-hook-" + str(i), daemon=True) for i in range(workers)]
+        for thread in self.threads:
+            thread.start()
+    #*****************************
+
+
+    #*****************************
+    def add(self, event, fn):
+        """
+        @note           registers callback, called with hookRec
+
+        @param event    tick, segment, peak
+        @param fn       callback
+        @rtype          callable
+        @return         callback, usable as decorator
+        """
+        if not ( event in HOOK_EVENTS ):
+            raise ValueError("Unknown hook event '" + str(event) + "', use " + ", ".join(HOOK_EVENTS))
+        if not ( callable(fn) ):
+            raise ValueError("Hook of '" + event + "' is not callable")
+        self.callbacks[event] = self.callbacks[event] + (fn,)
+        return fn
+    #*****************************
+
+
+    #*****************************
+    def submit(self, rec):
+        """
+        @note           queues event, never waits with policy 'drop'
+
+        @param rec      hookRec
+        @rtype          boolean
+        @return         queued
+        """
+        if ( "block" == self.policy ):
+            self.queue.put(rec)
+        else:
+            try:
+                self.queue.put_nowait(rec)
+            except queue.Full:
+                self.dropped += 1
+                return False
+        self.queued += 1
+        return True
+    #*****************************
+
+
+    #*****************************
+    def notify(self, now, tset, tmeas, humidity, grad, updated):
+        """
+        @note           detects events of current tick, called by
+                        'ATWG.tick'
+
+        @param now      current time in seconds
+        @param tset     set temperature
+        @param tmeas    measured temperature
+        @param humidity measured humidity
+        @param grad     set point gradient per second
+        @param updated  set point updated in this tick
+        """
+        callbacks = self.callbacks
+        if ( updated ):
+            kind = SEG_KINDS[(grad > SEG_GRAD_EPS) - (grad < -SEG_GRAD_EPS)]
+            if ( (0 < len(callbacks['peak'])) and ("hold" != kind) ):
+                dir = 1 if ( "rise" == kind ) else -1
+                if ( -dir == self.dir ):    # reversal, previous set point was extreme
+                    self.submit(hookRec("peak", now, self.lastSet, tmeas, humidity, grad, kind, "max" if ( 1 == self.dir ) else "min"))
+            if ( "hold" != kind ):
+                self.dir = 1 if ( "rise" == kind ) else -1
+            if ( kind != self.segment ):
+                self.segment = kind
+                if ( 0 < len(callbacks['segment']) ):
+                    self.submit(hookRec("segment", now, tset, tmeas, humidity, grad, kind, None))
+            self.lastSet = tset
+        if ( 0 < len(callbacks['tick']) ):
+            self.submit(hookRec("tick", now, tset, tmeas, humidity, grad, self.segment, None))
+    #*****************************
+
+
+    #*****************************
+    def worker(self):
+        """
+        @note           runs callbacks until stop record
+        """
+        while True:
+            rec = self.queue.get()
+            if ( None == rec ):     # stop
+                self.queue.task_done()
+                return
+            for fn in self.callbacks[rec.event]:
+                try:
+                    fn(rec)
+                except Exception as e:
+                    with self.lock:
+                        self.errors += 1
+                        self.lastError = repr(e)
+            with self.lock:
+                self.done += 1
+            self.queue.task_done()
+    #*****************************
+
+
+    #*****************************
+    def drain(self):
+        """
+        @note           waits until all queued events are processed
+        """
+        self.queue.join()
+    #*****************************
+
+
+    #*****************************
+    def report(self):
+        """
+        @note           dispatch statistics, safe to call from other
+                        threads, f.e. API server
+
+        @rtype          dict
+        @return         counters and settings
+        """
+        with self.lock:
+            done, errors, lastError = self.done, self.errors, self.lastError
+        return {
+            'workers': self.workers,
+            'depth': self.depth,
+            'policy': self.policy,
+            'callbacks': {event: len(fns) for event, fns in self.callbacks.items()},
+            'queued': self.queued,
+            'dropped': self.dropped,
+            'pending': self.queue.qsize(),
+            'done': done,
+            'errors': errors,
+            'last_error': lastError,
+        }
+    #*****************************
+
+
+    #*****************************
+    def close(self, timeout=10):
+        """
+        @note           processes queued events and stops workers
+
+        @param timeout  maximal wait per worker in seconds
+        """
+        for thread in self.threads:
+            self.queue.put(None, timeout=timeout)
+        for thread in self.threads:
+            thread.join(timeout)
+    #*****************************
+
+#------------------------------------------------------------------------------
@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          shm.py
+@date:          2026-10-19
+
+@note           telemetry export in shared memory
+                  * latest records of the run in a ring, one per measurement
+                  * readers attach by name, no sockets, no serialization
+                  * seqlock: writer makes 'seq' odd before and even after an
+                    update, a reader copy is consistent if 'seq' was even
+                    and unchanged around the copy
+                  * layout version 1, little endian:
+                      header, 64 bytes
+                        0  4s  magic 'ATWG'
+                        4  H   version
+                        6  H   header size
+                        8  I   ring capacity in records
+                       12  I   record size in bytes
+                       16  Q   seq, odd while written
+                       24  Q   number of written records, next slot is
+                               count % capacity
+                       32      reserved
+                      ring, capacity * record
+                        record: 5 x double, columns of TRACE_COLS
+                        time, tset, tmeas, humidity, grad
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Standard
+import struct                                   # binary layout
+from multiprocessing import shared_memory       # segment
+# Self
+from ATWG.telemetry.trace import TRACE_COLS     # record columns
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+# Layout
+SHM_MAGIC = b"ATWG"                                     # segment identifier
+SHM_VERSION = 1                                         # incremented on layout change
+SHM_HEADER = struct.Struct("<4sHHII")                   # magic, version, header size, capacity, record size
+SHM_HEADER_SIZE = 64                                    # header incl. reserved
+SHM_SEQ_OFS = 16                                        # offset of seq
+SHM_COUNT_OFS = 24                                      # offset of count
+SHM_U64 = struct.Struct("<Q")                           # seq and count
+SHM_REC = struct.Struct("<" + "d" * len(TRACE_COLS))    # record
+SHM_READ_RETRY = 1000                                   # retries on concurrent write
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+# Segments created in this process, their tracking belongs to the writer
+shmOwned = set()
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class shmWriter:
+    """
+    @note:  publishes telemetry in shared memory, single writer
+    """
+
+    #*****************************
+    def __init__(self, name, capacity=4096):
+        """
+        @note               creates segment, existing segment is reused if
+                            large enough
+
+        @param name         segment name, f.e. 'atwg'
+        @param capacity     number of records in ring
+        """
+        if ( 1 > capacity ):
+            raise ValueError("Shared memory needs at least one record")
+        size = SHM_HEADER_SIZE + capacity * SHM_REC.size
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            self.shm = shared_memory.SharedMemory(name=name)
+            if ( self.shm.size < size ):
+                self.shm.close()
+                raise ValueError("Shared memory '" + name + "' exists with smaller size")
+        shmOwned.add(self.shm.name)
+        self.buf = self.shm.buf
+        self.capacity = capacity
+        self.seq = 0
+        self.count = 0
+        # header, seq and count are zero
+        self.buf[:SHM_HEADER_SIZE] = bytes(SHM_HEADER_SIZE)
+        SHM_HEADER.pack_into(self.buf, 0, SHM_MAGIC, SHM_VERSION, SHM_HEADER_SIZE, capacity, SHM_REC.size)
+    #*****************************
+
+
+    #*****************************
+    def write(self, time, tset, tmeas, humidity, grad):
+        """
+        @note           appends one telemetry record, same call as traceWriter
+        """
+        buf = self.buf
+        self.seq += 1   # odd, readers retry
+        SHM_U64.pack_into(buf, SHM_SEQ_OFS, self.seq)
+        SHM_REC.pack_into(buf, SHM_HEADER_SIZE + (self.count % self.capacity) * SHM_REC.size, time, tset, tmeas, humidity, grad)
+        self.count += 1
+        SHM_U64.pack_into(buf, SHM_COUNT_OFS, self.count)
+        self.seq += 1   # even, consistent
+        SHM_U64.pack_into(buf, SHM_SEQ_OFS, self.seq)
+    #*****************************
+
+
+    #*****************************
+    def close(self, unlink=True):
+        """
+        @note           detaches segment
+
+        @param unlink   removes segment, attached readers keep their mapping
+        """
+        self.buf = None
+        self.shm.close()
+        if ( unlink ):
+            self.shm.unlink()
+        shmOwned.discard(self.shm.name)
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class shmReader:
+    """
+    @note:  reads telemetry from shared memory, any number of readers
+    """
+
+    #*****************************
+    def __init__(self, name, writerTracker=False):
+        """
+        @note                   attaches to segment of running writer
+
+        @param name             segment name
+        @param writerTracker    resource tracker is shared with writer,
+                                f.e. reader runs in process started by writer
+        """
+        self.shm = shared_memory.SharedMemory(name=name)
+        # segment lifetime belongs to writer, not to resource tracker of reader
+        if not ( writerTracker or (self.shm.name in shmOwned) ):
+            try:
+                from multiprocessing import resource_tracker
+                resource_tracker.unregister(self.shm._name, "shared_memory")
+            except (ImportError, AttributeError):
+                pass
+        self.buf = self.shm.buf
+        magic, version, headerSize, self.capacity, recSize = SHM_HEADER.unpack_from(self.buf, 0)
+        if ( SHM_MAGIC != magic ):
+            self.close()
+            raise ValueError("Shared memory '" + name + "' is no ATWG telemetry")
+        if ( (SHM_VERSION != version) or (SHM_HEADER_SIZE != headerSize) or (SHM_REC.size != recSize) ):
+            self.close()
+            raise ValueError("Shared memory '" + name + "' has unsupported layout version " + str(version))
+    #*****************************
+
+
+    #*****************************
+    def read(self, num=1, start=None):
+        """
+        @note           consistent copy of the latest records
+
+        @param num      maximal number of records, limited by capacity
+        @param start    index of first record, f.e. count of last read,
+                        older records than in ring are skipped, num unused
+        @rtype          tuple
+        @return         number of written records, list of records
+                        (time, tset, tmeas, humidity, grad), oldest first
+        """
+        buf = self.buf
+        for i in range(SHM_READ_RETRY):
+            seq = SHM_U64.unpack_from(buf, SHM_SEQ_OFS)[0]
+            if ( seq & 1 ):
+                continue    # write in progress
+            count = SHM_U64.unpack_from(buf, SHM_COUNT_OFS)[0]
+            first = max(0, count - min(num, self.capacity)) if ( None == start ) else max(start, count - self.capacity)
+            recs = [SHM_REC.unpack_from(buf, SHM_HEADER_SIZE + (idx % self.capacity) * SHM_REC.size) for idx in range(first, count)]
+            if ( seq == SHM_U64.unpack_from(buf, SHM_SEQ_OFS)[0] ):
+                return count, recs
+        raise ValueError("No consistent read after " + str(SHM_READ_RETRY) + " retries")
+    #*****************************
+
+
+    #*****************************
+    def latest(self):
+        """
+        @note           latest record
+
+        @rtype          tuple
+        @return         time, tset, tmeas, humidity, grad; None if empty
+        """
+        count, recs = self.read(1)
+        return recs[0] if ( 0 < count ) else None
+    #*****************************
+
+
+    #*****************************
+    def close(self):
+        """
+        @note           detaches segment
+        """
+        self.buf = None
+        self.shm.close()
+    #*****************************
+
+#------------------------------------------------------------------------------
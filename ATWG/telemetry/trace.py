@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          trace.py
+@date:          2026-10-19
+
+@note           telemetry trace of an ATWG run
+                  * one CSV line per chamber measurement
+                  * columns: time,tset,tmeas,humidity,grad
+                    time in seconds, temperatures in C, gradient in C/s
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Trace format
+TRACE_COLS = ("time", "tset", "tmeas", "humidity", "grad")  # column order
+TRACE_HEADER = ",".join(TRACE_COLS) + "\n"                  # first line
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class traceWriter:
+    """
+    @note:  writes telemetry trace
+    """
+
+    #*****************************
+    def __init__(self, traceFile, buffered=1024):
+        """
+        @note               creates trace, existing file is overwritten
+
+        @param traceFile    path to trace
+        @param buffered     number of buffered lines before write
+        """
+        self.fH = open(traceFile, 'w')
+        self.fH.write(TRACE_HEADER)
+        self.buf = []
+        self.buffered = buffered
+        self.rows = 0
+    #*****************************
+
+
+    #*****************************
+    def write(self, time, tset, tmeas, humidity, grad):
+        """
+        @note           appends one telemetry record
+        """
+        self.buf.append("%.3f,%.4f,%.4f,%.2f,%.6e\n" % (time, tset, tmeas, humidity, grad))
+        self.rows += 1
+        if ( self.buffered <= len(self.buf) ):
+            self.flush()
+    #*****************************
+
+
+    #*****************************
+    def flush(self):
+        """
+        @note           writes buffered lines to file
+        """
+        self.fH.writelines(self.buf)
+        self.buf.clear()
+        self.fH.flush()
+    #*****************************
+
+
+    #*****************************
+    def close(self):
+        """
+        @note           flushes and closes trace
+        """
+        self.flush()
+        self.fH.close()
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class traceReader:
+    """
+    @note:  reads telemetry trace
+    """
+
+    #*****************************
+    def __init__(self, traceFile):
+        """
+        @note               opens trace
+
+        @param traceFile    path to trace
+        """
+        self.traceFile = traceFile
+        with open(self.traceFile, 'r') as fH:
+            if ( TRACE_HEADER != fH.readline() ):
+                raise ValueError("File '" + traceFile + "' is not a telemetry trace")
+    #*****************************
+
+
+    #*****************************
+    def rows(self):
+        """
+        @note           iterates over records
+
+        @rtype          tuple
+        @return         time, tset, tmeas, humidity, grad
+        """
+        with open(self.traceFile, 'r') as fH:
+            fH.readline()   # skip header
+            for line in fH:
+                yield tuple(map(float, line.split(",")))
+    #*****************************
+
+
+    #*****************************
+    def blocks(self, num=65536):
+        """
+        @note           iterates in blocks of columns, bounded memory
+
+        @param num      maximal records per block
+        @rtype          dict
+        @return         column name to list of values
+        """
+        with open(self.traceFile, 'r') as fH:
+            fH.readline()   # skip header
+            while True:
+                lines = fH.readlines(num * 48)  # size hint, approx line length
+                if ( 0 == len(lines) ):
+                    break
+                cols = zip(*(map(float, line.split(",")) for line in lines))
+                yield dict(zip(TRACE_COLS, map(list, cols)))
+    #*****************************
+
+#------------------------------------------------------------------------------
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          lookahead.py
+@date:          2026-10-19
+
+@note           feedforward of chamber lag, the chamber set point leads
+                the waveform so that the measured temperature follows it
+                  * lag model: dead time, first order time constant and
+                    slew rate limits of the chamber
+                  * shift: set point is the waveform dead time plus time
+                    constant ahead
+                  * shape: set point is the inverted first order lag of
+                    the waveform dead time ahead, u = r + tau * dr/dt,
+                    gradient limited to the chamber slew rates
+                  * three 'waves.peek' per set point, no state
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Lag compensation
+LOOKAHEAD_MODES = ("shift", "shape")    # pre-shifted or pre-shaped set point
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class lookahead:
+    """
+    @note:  chamber set point from waveform lookahead
+    """
+
+    #*****************************
+    def __init__(self, wave, tau=0.0, tau2=0.0, deadtime=0.0, rise=float('+inf'), fall=float('-inf'), tmin=float('-inf'), tmax=float('+inf'), mode="shape"):
+        """
+        @note               initializes lag model
+
+        @param wave         initialized waveform
+        @param tau          chamber time constant in sec
+        @param tau2         sensor time constant in sec, adds to tau
+        @param deadtime     set point to chamber reaction in sec
+        @param rise         heating rate in C/min
+        @param fall         cooling rate in C/min
+        @param tmin         minimal chamber set point in C
+        @param tmax         maximal chamber set point in C
+        @param mode         shift or shape
+        """
+        if ( not mode in LOOKAHEAD_MODES ):
+            raise ValueError("Unsupported lookahead mode '" + str(mode) + "', use " + ", ".join(LOOKAHEAD_MODES))
+        if ( (0 > tau) or (0 > tau2) or (0 > deadtime) ):
+            raise ValueError("Lag model needs non-negative times")
+        if ( (0 >= rise) or (0 <= fall) ):
+            raise ValueError("Rise slew rate needs to be positive, fall negative")
+        self.wave = wave
+        self.mode = mode
+        self.ts = wave.waveDescr['x']['ts']
+        self.tau = tau + tau2               # first order approximation of chamber and sensor
+        self.rise = rise / 60               # C/sec
+        self.fall = fall / 60
+        self.tmin = tmin
+        self.tmax = tmax
+        # steps ahead of value returned by last 'waves.next'
+        lead = deadtime if ( "shape" == mode ) else deadtime + self.tau
+        self.k = round(lead / self.ts) - 1
+    #*****************************
+
+
+    #*****************************
+    def setpoint(self):
+        """
+        @note           chamber set point for waveform value of last
+                        'waves.next' call
+
+        @rtype          float
+        @return         set temperature in C
+        """
+        peek = self.wave.peek
+        if ( "shift" == self.mode ):
+            u = peek(self.k)
+        else:
+            cur = peek(self.k)
+            grad = (peek(self.k + 1) - peek(self.k - 1)) / (2 * self.ts)   # central difference
+            u = cur + self.tau * min(max(grad, self.fall), self.rise)       # chamber can not follow faster ramps
+        return min(max(u, self.tmin), self.tmax)
+    #*****************************
+
+#------------------------------------------------------------------------------
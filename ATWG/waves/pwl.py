@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          pwl.py
+@date:          2026-10-19
+
+@note           error bounded piecewise linear compression
+                  * feasible cone: each ramp is as long as the slope
+                    range through all its samples stays non-empty
+                  * connected ramps, breakpoints on sample times
+                  * error bound holds at the sample times only, between
+                    samples the input is unknown
+                  * time quantum, f.e. chamber program resolution, places
+                    breakpoints only on multiples of it; bound holds
+                    nevertheless for every sample
+                  * segment lookup via bisect
+"""
+
+
+
+#------------------------------------------------------------------------------
+import bisect               # segment lookup
+from array import array     # breakpoints
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class pwl:
+    """
+    @note:  piecewise linear function, built from samples
+    """
+
+    #*****************************
+    def __init__(self):
+        """
+        @note           initializes empty function
+        """
+        self.times = array('d')     # breakpoint times in sec
+        self.values = array('d')    # breakpoint values
+    #*****************************
+
+
+    #*****************************
+    def compress(self, samples, ts=1, maxError=0.05, t0=0, quantum=None):
+        """
+        @note           builds ramps, every sample is reproduced within
+                        maxError; last breakpoint is last sample, even
+                        if not on the time quantum
+
+        @param samples  equidistant samples
+        @param ts       sample time in sec
+        @param maxError maximal absolute deviation at sample times
+        @param t0       time of first sample
+        @param quantum  breakpoint time resolution in sec from t0,
+                        multiple of ts, None: every sample
+        @rtype          int
+        @return         number of ramps
+        """
+        # check args
+        if ( 0 > maxError ):
+            raise ValueError("Max error needs to be non-negative")
+        if ( 0 == len(samples) ):
+            raise ValueError("No samples to compress provided")
+        step = 1                        # breakpoint grid in samples
+        if ( None != quantum ):
+            step = round(quantum / ts)
+            if ( (1 > step) or (abs(step*ts - quantum) > 1e-9 * quantum) ):
+                raise ValueError("Time quantum " + str(quantum) + "s is no multiple of sample time " + str(ts) + "s")
+        # prepare
+        self.times = array('d', [t0])
+        self.values = array('d', [samples[0]])
+        anchor = 0                      # sample index of ramp start
+        anchorVal = samples[0]          # ramp start value, may differ from sample
+        lo = float('-inf')              # slope cone
+        hi = float('inf')
+        grid = None                     # last breakpoint candidate on grid with its cone
+        # walk over samples
+        k = 1
+        while ( k < len(samples) ):
+            dk = k - anchor
+            klo = (samples[k] - maxError - anchorVal) / dk
+            khi = (samples[k] + maxError - anchorVal) / dk
+            # sample fits into cone
+            if ( (klo <= hi) and (khi >= lo) ):
+                lo = max(lo, klo)
+                hi = min(hi, khi)
+                if ( 0 == k % step ):
+                    grid = (k, lo, hi)
+                k += 1
+                continue
+            # close ramp at last grid sample, slope through it as close as cone allows
+            if ( None == grid ):
+                raise ValueError("Samples within time quantum exceed max error " + str(maxError) + " at " + str(t0 + k*ts) + "s")
+            end, lo, hi = grid
+            slope = min(max((samples[end] - anchorVal) / (end - anchor), lo), hi)
+            anchorVal += slope * (end - anchor)
+            anchor = end
+            self.times.append(t0 + end*ts)
+            self.values.append(anchorVal)
+            lo = float('-inf')
+            hi = float('inf')
+            grid = None
+            k = end + 1
+        # last ramp
+        end = len(samples) - 1
+        if ( end > anchor ):
+            slope = min(max((samples[end] - anchorVal) / (end - anchor), lo), hi)
+            self.times.append(t0 + end*ts)
+            self.values.append(anchorVal + slope * (end - anchor))
+        return len(self.times) - 1
+    #*****************************
+
+
+    #*****************************
+    def eval(self, t):
+        """
+        @note           value at given time, held constant outside
+
+        @param t        time in sec
+        @rtype          float
+        @return         interpolated value
+        """
+        # outside
+        if ( t <= self.times[0] ):
+            return self.values[0]
+        if ( t >= self.times[-1] ):
+            return self.values[-1]
+        # segment
+        i = bisect.bisect_right(self.times, t) - 1
+        return self.values[i] + (self.values[i+1] - self.values[i]) * (t - self.times[i]) / (self.times[i+1] - self.times[i])
+    #*****************************
+
+
+    #*****************************
+    def render(self, num, ts=1):
+        """
+        @note           samples function from first breakpoint on
+
+        @param num      number of samples
+        @param ts       sample time in sec
+        @rtype          array
+        @return         values
+        """
+        return array('d', (self.eval(self.times[0] + k*ts) for k in range(num)))
+    #*****************************
+
+
+    #*****************************
+    def ramps(self):
+        """
+        @note           ramp list, f.e. for chamber program compile
+
+        @rtype          list
+        @return         list of (startVal, endVal, duration in sec)
+        """
+        return [(self.values[i], self.values[i+1], self.times[i+1] - self.times[i]) for i in range(len(self.times) - 1)]
+    #*****************************
+
+#------------------------------------------------------------------------------
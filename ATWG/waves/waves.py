@@ -17,7 +17,37 @@
 
 
 #------------------------------------------------------------------------------
-import math     # sine
+import math                 # sine
+from array import array     # rendered waveform
+from .pwl import pwl        # ramp compression
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class waveRec:
+    """
+    @note:  slot based waveform value, reused by next(rec), item access as
+            for the dict interface
+    """
+    __slots__ = ('val', 'grad')
+
+    #*****************************
+    def __init__(self, val=float('nan'), grad=float('nan')):
+        self.val = val
+        self.grad = grad
+    #*****************************
+
+    #*****************************
+    def __getitem__(self, key):
+        return getattr(self, key)
+    #*****************************
+
+    #*****************************
+    def __setitem__(self, key, value):
+        setattr(self, key, value)
+    #*****************************
+
 #------------------------------------------------------------------------------
 
 
@@ -95,36 +125,38 @@ class waves:
 
 
     #*****************************
-    def next(self):
+    def next(self, rec=None):
         """
         @note       go one discrete time step forward
 
-        @return     dict with new temperature and gradient
+        @param rec  waveRec to fill, avoids dict per step
+        @return     dict or rec with new temperature and gradient
         """
-        # init
-        newVal = {}
+        # init, given record is filled in place
+        new = {} if ( None == rec ) else rec
         # in case of non intinilaized waveform is waveArgs not avialable
         try:
             # dispatch
             if ( "sine" == self.waveArgs['wave'] ):
-                (self.iterator, newVal) = self.sine(descr=(self.iterator,self.waveDescr))       # update
+                self.iterator = self.sine_step(self.iterator, self.waveDescr, new)        # update
             elif ( "trapezoid" == self.waveArgs['wave'] ):
-                (self.iterator, newVal) = self.trapezoid(descr=(self.iterator,self.waveDescr))  # update
+                self.iterator = self.trapezoid_step(self.iterator, self.waveDescr, new)   # update
             else:
                 raise ValueError("Unsupported waveform")
         except:
             raise ValueError("Uninitialized waveform")
         # return new vals
-        return newVal
+        return new
     #*****************************
 
 
     #*****************************
-    def sine(self, descr=None, **kwargs):
+    def sine(self, descr=None, rec=None, **kwargs):
         """
         @note           initializes and calculates next value
 
         @param descr    Sample/Update time of waveform  in seconds
+        @param rec      filled with next value instead of new dict
         @param ts       Sample/Update time of waveform in base time units (f.e. seconds)
         @param tp       Period time of waveform in base time units (f.e. seconds)
         @param lowVal   minimal value
@@ -196,25 +228,41 @@ class waves:
             # disassemble descriptor
             iterator, wave = descr
             # calculate next time step
-            new = {}
-            new['val'] = wave['y']['ofs'] + wave['y']['amp']*(math.sin(2*math.pi*((iterator)*(float(1)/wave['x']['n']))))                       # calculate discrete sine value for n
-            new['grad'] = wave['y']['amp']*(2*math.pi*(float(1)/wave['x']['n']))*(math.cos(2*math.pi*((iterator)*(float(1)/wave['x']['n']))))   # calc gradient, derived discrete sine
-            # prepare for next calc
-            iterator += 1
-            # jump to sine start
-            if ( iterator > wave['x']['n']-1 ):
-                iterator -= wave['x']['n']
+            new = {} if ( None == rec ) else rec
             # assign to release tupple
-            return (iterator, new)
+            return (self.sine_step(iterator, wave, new), new)
     #*****************************
 
 
     #*****************************
-    def trapezoid(self, descr=None, **kwargs):
+    def sine_step(self, iterator, wave, new):
+        """
+        @note           calculates value at iterator, w/o allocation
+
+        @param iterator current waveform iterator
+        @param wave     wave descriptor
+        @param new      dict or waveRec, filled with value and gradient
+        @rtype          int
+        @return         next iterator
+        """
+        new['val'] = wave['y']['ofs'] + wave['y']['amp']*(math.sin(2*math.pi*((iterator)*(float(1)/wave['x']['n']))))                       # calculate discrete sine value for n
+        new['grad'] = wave['y']['amp']*(2*math.pi*(float(1)/wave['x']['n']))*(math.cos(2*math.pi*((iterator)*(float(1)/wave['x']['n']))))   # calc gradient, derived discrete sine
+        # prepare for next calc
+        iterator += 1
+        # jump to sine start
+        if ( iterator > wave['x']['n']-1 ):
+            iterator -= wave['x']['n']
+        return iterator
+    #*****************************
+
+
+    #*****************************
+    def trapezoid(self, descr=None, rec=None, **kwargs):
         """
         @note               generates discrete trapezoid waveform
 
         @param descr        waveform descriptor, generated by this function in init phase
+        @param rec          filled with next value instead of new dict
         @param ts           Sample/Update time of waveform  in seconds
         @param tp           Period time of waveform in seconds
         @param lowVal       minimal value of trapezoid
@@ -299,19 +347,247 @@ class waves:
             # disassemble descriptor
             iterator, wave = descr
             # calc waveform
-            new = {}
-            for foo, y in wave['y'].items():
-                # match part of waveform
-                if ( y['start'] <= iterator <= y['stop'] ):
-                    new['val'] = y['val'] + y['grad'] * (iterator-y['start'])   # new value value
-                    new['grad'] = y['grad'] / wave['x']['ts']                   # gradient per sec
-            # inc wave iterator, prepare for next calc
-            iterator += 1
-            # jump to start
-            if ( iterator > wave['x']['n']-1 ):
-                iterator -= wave['x']['n']
+            new = {} if ( None == rec ) else rec
             # assign to release tupple
-            return (iterator, new)
+            return (self.trapezoid_step(iterator, wave, new), new)
+    #*****************************
+
+
+    #*****************************
+    def trapezoid_step(self, iterator, wave, new):
+        """
+        @note           calculates value at iterator, w/o allocation
+
+        @param iterator current waveform iterator
+        @param wave     wave descriptor
+        @param new      dict or waveRec, filled with value and gradient
+        @rtype          int
+        @return         next iterator
+        """
+        for y in wave['y'].values():
+            # match part of waveform
+            if ( y['start'] <= iterator <= y['stop'] ):
+                new['val'] = y['val'] + y['grad'] * (iterator-y['start'])   # new value value
+                new['grad'] = y['grad'] / wave['x']['ts']                   # gradient per sec
+        # inc wave iterator, prepare for next calc
+        iterator += 1
+        # jump to start
+        if ( iterator > wave['x']['n']-1 ):
+            iterator -= wave['x']['n']
+        return iterator
+    #*****************************
+
+
+
+    #*****************************
+    def sample(self, iterator):
+        """
+        @note           value of waveform at given iterator, w/o changing
+                        the waveform state
+
+        @param iterator discrete time step, wrapped to period
+        @return         waveform value
+        """
+        n = self.waveDescr['x']['n']
+        if ( "sine" == self.waveArgs['wave'] ):
+            return self.waveDescr['y']['ofs'] + self.waveDescr['y']['amp']*(math.sin(2*math.pi*((iterator % n)*(float(1)/n))))
+        elif ( "trapezoid" == self.waveArgs['wave'] ):
+            y = self.segment(iterator % n)
+            return y['val'] + y['grad'] * ((iterator % n)-y['start'])
+        raise ValueError("Uninitialized waveform")
+    #*****************************
+
+
+    #*****************************
+    def peek(self, k=0):
+        """
+        @note           lookahead, value k discrete steps after the value
+                        of the next 'next' call, w/o changing the waveform
+                        state; negative k looks back
+
+        @param k        discrete time steps
+        @return         waveform value
+        """
+        return self.sample(self.iterator + k)
+    #*****************************
+
+
+    #*****************************
+    def render(self, num):
+        """
+        @note           renders next num values of waveform, w/o changing
+                        the waveform state
+
+        @param num      number of samples
+        @return         array of values
+        """
+        return array('d', (self.sample(self.iterator+k) for k in range(num)))
+    #*****************************
+
+
+    #*****************************
+    def segment(self, iterator):
+        """
+        @note           trapezoid part containing the iterator
+
+        @param iterator discrete time step in first period
+        @return         segment dict
+        """
+        for y in self.waveDescr['y'].values():
+            if ( y['start'] <= iterator <= y['stop'] ):
+                return y
+        raise ValueError("Iterator " + str(iterator) + " outside of waveform")
+    #*****************************
+
+
+    #*****************************
+    def ramps(self, iterator, num, maxError=0, quantum=None):
+        """
+        @note           linear pieces of the waveform, the samples of a piece
+                        are the linear interpolation from its start to its
+                        end value; non-linear waveforms are compressed, the
+                        deviation is bound at the sample times
+
+        @param iterator first discrete time step
+        @param num      number of discrete time steps
+        @param maxError allowed deviation of compressed waveforms
+        @param quantum  time resolution of piece ends of compressed
+                        waveforms in sec, f.e. chamber program
+        @return         list of (startVal, endVal, duration in sec)
+        """
+        # prepare
+        n = self.waveDescr['x']['n']
+        ts = self.waveDescr['x']['ts']
+        # non-linear, end of last piece is first sample after range
+        if ( "trapezoid" != self.waveArgs['wave'] ):
+            ramps = pwl()
+            ramps.compress(array('d', (self.sample(iterator+k) for k in range(num+1))), ts=ts, maxError=maxError, quantum=quantum)
+            return ramps.ramps()
+        pieces = []
+        j = iterator
+        # walk over segments
+        while ( j < iterator + num ):
+            y = self.segment(j % n)
+            stop = min(j - (j % n) + y['stop'], iterator + num - 1)    # piece end, unwrapped
+            start = (j % n) - y['start']
+            end = stop - j + start + 1                                  # first sample after piece
+            pieces.append((y['val'] + y['grad']*start, y['val'] + y['grad']*end, (stop - j + 1) * ts))
+            j = stop + 1
+        return pieces
+    #*****************************
+
+
+    #*****************************
+    def skip(self, num):
+        """
+        @note           moves waveform num discrete time steps forward
+                        w/o calculating the values
+
+        @param num      number of skipped steps
+        @return         True
+        """
+        self.iterator = (self.iterator + num) % self.waveDescr['x']['n']
+        return True
+    #*****************************
+
+
+    #*****************************
+    def ticks_to_change(self, ref, resolution):
+        """
+        @note               number of discrete steps until the waveform leaves
+                            the quantization step of ref, used to sleep
+                            until the next chamber set point change
+
+        @param ref          last applied value
+        @param resolution   quantization, f.e. chamber resolution
+        @return             steps from current iterator, limited to one period
+        """
+        # no quantization, every step is a change
+        if ( 0 >= resolution ):
+            return 0
+        # prepare
+        n = self.waveDescr['x']['n']
+        q = round(ref/resolution)                               # quantization step of reference
+        edges = ((q-0.5)*resolution, (q+0.5)*resolution)        # leaving one edge is a change
+        changed = lambda j: ( q != round(self.sample(j)/resolution) )
+        # current value already changed
+        if ( changed(self.iterator) ):
+            return 0
+        # dispatch
+        if ( "sine" == self.waveArgs['wave'] ):
+            num = self.sine_leave(changed, edges)
+        elif ( "trapezoid" == self.waveArgs['wave'] ):
+            num = self.trapezoid_leave(changed, edges)
+        else:
+            raise ValueError("Uninitialized waveform")
+        return min(num, n)
+    #*****************************
+
+
+    #*****************************
+    def sine_leave(self, changed, edges):
+        """
+        @note           finds first changed sine sample, the continuous sine
+                        crosses an edge before a discrete sample can change
+
+        @see            ticks_to_change()
+        """
+        # prepare
+        n = self.waveDescr['x']['n']
+        amp = self.waveDescr['y']['amp']
+        ofs = self.waveDescr['y']['ofs']
+        scale = n / (2*math.pi)                 # phase to iterator
+        pos = float(self.iterator)
+        # walk over edge crossings
+        while ( pos < self.iterator + n ):
+            cross = float('inf')
+            for edge in edges:
+                # sine never reaches edge
+                if ( (0 == amp) or (1 < abs((edge-ofs)/amp)) ):
+                    continue
+                phi = math.asin((edge-ofs)/amp)
+                for base in (phi, math.pi-phi):
+                    x = base * scale
+                    x += math.ceil((pos-x)/n) * n   # first crossing not before pos
+                    cross = min(cross, x)
+            if ( math.isinf(cross) ):
+                break
+            # discrete samples around crossing, iterator is not necessarily integer
+            for num in range(max(0, math.floor(cross-self.iterator)), math.ceil(cross-self.iterator)+2):
+                if ( changed(self.iterator+num) ):
+                    return num
+            pos = cross + 1e-6
+        return n
+    #*****************************
+
+
+    #*****************************
+    def trapezoid_leave(self, changed, edges):
+        """
+        @note           finds first changed trapezoid sample, segment wise
+
+        @see            ticks_to_change()
+        """
+        # prepare
+        n = self.waveDescr['x']['n']
+        j = self.iterator
+        # walk over segments
+        while ( j < self.iterator + n ):
+            y = self.segment(j % n)
+            stop = j - (j % n) + y['stop']  # segment end, unwrapped
+            # constant segment, first sample decides
+            if ( 0 == y['grad'] ):
+                if ( changed(j) ):
+                    return j - self.iterator
+            # ramp, estimate crossing of edge in slope direction
+            else:
+                edge = edges[1] if ( 0 < y['grad'] ) else edges[0]
+                est = j - (j % n) + y['start'] + math.floor((edge - y['val']) / y['grad'])
+                for k in range(max(j, est), stop+1):
+                    if ( changed(k) ):
+                        return k - self.iterator
+            j = stop + 1
+        return n
     #*****************************
 
 #------------------------------------------------------------------------------
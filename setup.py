@@ -45,6 +45,10 @@ setuptools.setup(
               "ATWG.driver",
               "ATWG.driver.espec",
               "ATWG.driver.sim",
+              "ATWG.driver.trace",
+              "ATWG.runner",
+              "ATWG.telemetry",
+              "ATWG.analysis",
               ],                                        # define package to add
     package_data={"ATWG": ["driver/espec/*.yml"],},     # adds .yml config files to package
     classifiers=[
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          bench.py
+@date:          2026-10-19
+
+@note           Benchmark suite of the control loop hot paths
+                  run ./test/bench/bench.py                           measure and print
+                  run ./test/bench/bench.py --save=baseline.json      store baseline
+                  run ./test/bench/bench.py --compare=baseline.json   report against baseline,
+                                                                      exit code 1 on regression
+                baselines are machine specific, compare only runs of the
+                same machine and Python version
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Standard
+import sys        # python path handling
+import os         # platform independent paths
+import timeit     # measures execution time
+import argparse   # command line
+import json       # baseline file
+import platform   # baseline environment
+# Self
+sys.path.append(os.path.abspath((os.path.dirname(os.path.abspath(__file__)) + "/../../"))) # add project root to lib search path
+from ATWG.ATWG import ATWG                              # generator
+from ATWG.waves.waves import waves, waveRec             # waveform
+from ATWG.waves.lookahead import lookahead              # set point feedforward
+from ATWG.driver.espec.sh641 import especShSu           # dialog file chamber
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+def atwg(chamber, simFile):
+    """
+    @note           started ATWG, ESPEC runs on dialog file
+
+    @param chamber  'SIM' or 'ESPEC_SH641'
+    @param simFile  dialog file of ESPEC
+    @rtype          ATWG
+    @return         generator after first tick
+    """
+    dut = ATWG()
+    chamberArg, waveArg = dut.parse_cli(["--sine", "--minTemp=10", "--maxTemp=60", "--period=1h", "--chamber=SIM"])
+    dut.open(chamberArg=chamberArg, waveArg=waveArg)
+    if ( "ESPEC_SH641" == chamber ):
+        dut.chamber = especShSu()
+        dut.chamber.open(simFile=simFile)
+        dut.measure = dut.chamber.measure
+    dut.chamber_update()
+    return dut
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+def cases():
+    """
+    @note           benchmark cases, deterministic input
+
+    @rtype          dict
+    @return         name to callable
+    """
+    # prepare
+    simFile = os.path.abspath(os.path.dirname(os.path.abspath(__file__)) + "/../unit/sh641/sh641_dialog.yml")
+    sine = waves()
+    sine.set(wave="sine", ts=1, tp=3600, lowVal=10, highVal=60)
+    trapezoid = waves()
+    trapezoid.set(wave="trapezoid", ts=1, tp=3600, lowVal=10, highVal=60, tr=600, tf=600, dutyCycle=0.5)
+    rec = waveRec()
+    shapeSine = lookahead(sine, tau=300, deadtime=60, rise=2.9, fall=-1.7)
+    shapeTrapezoid = lookahead(trapezoid, tau=300, deadtime=60, rise=2.9, fall=-1.7)
+    sim = atwg("SIM", simFile)
+    espec = atwg("ESPEC_SH641", simFile)
+    # cases
+    return {
+        'waves.next sine':          sine.next,
+        'waves.next trapezoid':     trapezoid.next,
+        'waves.next sine rec':      lambda: sine.next(rec=rec),
+        'lookahead sine':           shapeSine.setpoint,
+        'lookahead trapezoid':      shapeTrapezoid.setpoint,
+        'time_to_sec':              lambda: sim.time_to_sec("1.5day 2.5h"),
+        'sec_to_time':              lambda: sim.sec_to_time(sec=138600),
+        'normalize_gradient':       lambda: sim.normalize_gradient(grad_sec=0.04),
+        'sh641 parse meas':         lambda: espec.chamber.parse("26.4,0.0,140.0,-50.0"),
+        'sh641 parse ack':          lambda: espec.chamber.parse("OK:TEMP,S25"),
+        'status':                   sim.status,
+        'chamber_update SIM':       sim.chamber_update,
+        'chamber_update SH641 sim': espec.chamber_update,
+    }
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+def measure(case, repeat=5):
+    """
+    @note           best of repeat, loop count calibrated to >=0.2s
+
+    @param case     callable
+    @param repeat   number of runs
+    @rtype          float
+    @return         ns per call
+    """
+    timer = timeit.Timer(case)
+    num, sec = timer.autorange()
+    return 1e9 * min([sec] + timer.repeat(repeat=repeat-1, number=num)) / num
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+def report(results, baseline=None, threshold=1.25):
+    """
+    @note               formats results, w/ baseline as comparison
+
+    @param results      name to ns per call
+    @param baseline     stored baseline results
+    @param threshold    slowdown factor reported as regression
+    @rtype              tuple
+    @return             report text, regressed case names
+    """
+    lines = []
+    regressed = []
+    if ( None == baseline ):
+        lines.append("{:<26} {:>12}".format("case", "ns/call"))
+        for name, ns in results.items():
+            lines.append("{:<26} {:>12.1f}".format(name, ns))
+        return "\n".join(lines), regressed
+    lines.append("{:<26} {:>12} {:>12} {:>7}  {}".format("case", "baseline", "ns/call", "ratio", "state"))
+    for name, ns in results.items():
+        if not ( name in baseline ):
+            lines.append("{:<26} {:>12} {:>12.1f} {:>7}  {}".format(name, "-", ns, "-", "new"))
+            continue
+        ratio = ns / baseline[name]
+        state = "ok"
+        if ( ratio > threshold ):
+            state = "REGRESSION"
+            regressed.append(name)
+        elif ( ratio < 1/threshold ):
+            state = "faster"
+        lines.append("{:<26} {:>12.1f} {:>12.1f} {:>7.2f}  {}".format(name, baseline[name], ns, ratio, state))
+    return "\n".join(lines), regressed
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+    # command line
+    parser = argparse.ArgumentParser(description="ATWG hot path benchmarks")
+    parser.add_argument("--save",      default=None, help="store results as baseline")
+    parser.add_argument("--compare",   default=None, help="compare against baseline")
+    parser.add_argument("--threshold", default=1.25, type=float, help="slowdown factor reported as regression")
+    parser.add_argument("--filter",    default="",   help="only cases containing this string")
+    parser.add_argument("--repeat",    default=5,    type=int, help="runs per case, best is taken")
+    args = parser.parse_args()
+    # measure
+    results = {}
+    for name, case in cases().items():
+        if ( args.filter in name ):
+            results[name] = measure(case, repeat=args.repeat)
+    # baseline
+    baseline = None
+    if ( None != args.compare ):
+        with open(args.compare, "r") as fh:
+            stored = json.load(fh)
+        baseline = stored['results']
+        if ( stored['python'] != platform.python_version() ):
+            print("Warning: baseline of Python " + stored['python'] + ", running " + platform.python_version())
+    text, regressed = report(results, baseline=baseline, threshold=args.threshold)
+    print(text)
+    if ( None != args.save ):
+        with open(args.save, "w") as fh:
+            json.dump({'python': platform.python_version(), 'machine': platform.machine(), 'results': results}, fh, indent=2)
+    sys.exit(1 if ( 0 < len(regressed) ) else 0)
+#------------------------------------------------------------------------------
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          sh641Codec_bench.py
+@date:          2026-10-19
+
+@note           Benchmark for sh641Codec.py
+                  run ./test/bench/sh641/sh641Codec_bench.py
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Standard
+import sys        # python path handling
+import os         # platform independent paths
+import timeit     # measures execution time
+# Self
+sys.path.append(os.path.abspath((os.path.dirname(os.path.abspath(__file__)) + "/../../../"))) # add project root to lib search path
+from ATWG.driver.espec.sh641Codec import sh641Codec                                           # codec under test
+from ATWG.driver.espec.sh641 import especShSu                                                 # dict interface
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+    # prepare
+    simFile = os.path.abspath(os.path.dirname(os.path.abspath(__file__)) + "/../../unit/sh641/sh641_dialog.yml")
+    codec = sh641Codec()
+    chamber = especShSu()
+    chamber.open(simFile=simFile)
+    num = 100000
+    # cases
+    cases = {
+        'decode meas': lambda: codec.decode(b"26.4,0.0,140.0,-50.0"),
+        'decode ack':  lambda: codec.decode(b"OK:TEMP,S25"),
+        'parse meas':  lambda: chamber.parse("26.4,0.0,140.0,-50.0"),
+        'parse ack':   lambda: chamber.parse("OK:TEMP,S25"),
+        'get_clima':   chamber.get_clima,
+    }
+    # run, best of five
+    for name, case in cases.items():
+        sec = min(timeit.repeat(case, number=num, repeat=5))
+        print("{name:<12}: {ns:8.1f} ns/call".format(name=name, ns=1e9*sec/num))
+#------------------------------------------------------------------------------
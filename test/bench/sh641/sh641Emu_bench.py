@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          sh641Emu_bench.py
+@date:          2026-10-19
+
+@note           End-to-end benchmark of the SH641 driver via pty emulator
+                  run ./test/bench/sh641/sh641Emu_bench.py
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Standard
+import sys        # python path handling
+import os         # platform independent paths
+import timeit     # measures execution time
+# Self
+sys.path.append(os.path.abspath((os.path.dirname(os.path.abspath(__file__)) + "/../../../"))) # add project root to lib search path
+from ATWG.driver.espec.sh641Emu import sh641Emu                                               # chamber emulator
+from ATWG.driver.espec.sh641 import especShSu                                                 # driver under test
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+    # with and w/o baud rate delay of the default interface config
+    for baudrate in (0, 9600):
+        emu = sh641Emu(baudrate=baudrate)
+        chamber = especShSu()
+        chamber.open(port=emu.open())
+        num = 200
+        temps = iter(range(10**9))
+        cases = {
+            'get_clima': chamber.get_clima,
+            'set_clima': lambda: chamber.set_clima(clima={'temperature': next(temps)}),
+        }
+        for name, case in cases.items():
+            sec = min(timeit.repeat(case, number=num, repeat=3))
+            print("{baud:>5} baud {name:<10}: {us:8.1f} us/call".format(baud=baudrate, name=name, us=1e6*sec/num))
+        chamber.close()
+        emu.close()
+#------------------------------------------------------------------------------
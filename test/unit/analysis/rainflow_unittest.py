@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          rainflow_unittest.py
+@date:          2026-10-19
+
+@note           Unittest for rainflow.py
+                  run ./test/unit/analysis/rainflow_unittest.py
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Standard
+import sys        # python path handling
+import os         # platform independent paths
+import unittest   # performs test
+import math       # sine
+import tempfile   # trace file
+import random     # end of data histories
+# Self
+sys.path.append(os.path.abspath((os.path.dirname(os.path.abspath(__file__)) + "/../../../"))) # add project root to lib search path
+from ATWG.analysis.rainflow import rainflow                                                   # Python Script under test
+from ATWG.analysis.trackError import open_reader                                              # CSV trace or archive
+from ATWG.telemetry.trace import traceWriter                                                  # CSV trace
+from ATWG.telemetry.archive import archiveWriter                                              # archive
+from ATWG.ATWG import ATWG                                                                    # live counting
+from ATWG.runner.virtualRun import virtualRun                                                 # fast forward
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class TestRainflow(unittest.TestCase):
+
+    #*****************************
+    def astm(self, vals):
+        """
+        @note   reference, rainflow counting of ASTM E1049-85 5.4.4,
+                history of reversals w/o plateaus
+
+        @return {range: cycles}
+        """
+        points = [vals[0]] + [cur for prev, cur, nxt in zip(vals, vals[1:], vals[2:]) if ( 0 > (cur - prev) * (nxt - cur) )] + [vals[-1]]
+        res = {}
+        stack = []
+        for point in points:
+            stack.append(point)
+            while ( 3 <= len(stack) ):
+                x = abs(stack[-1] - stack[-2])
+                y = abs(stack[-2] - stack[-3])
+                if ( x < y ):
+                    break
+                if ( 3 == len(stack) ):     # y contains starting point
+                    res[y] = res.get(y, 0) + 0.5
+                    del stack[0]
+                else:
+                    res[y] = res.get(y, 0) + 1
+                    del stack[-3:-1]
+        for first, second in zip(stack, stack[1:]):
+            res[abs(second - first)] = res.get(abs(second - first), 0) + 0.5
+        return res
+    #*****************************
+
+
+    #*****************************
+    def test_astm(self):
+        """
+        @note   example of ASTM E1049-85, figure 6
+        """
+        dut = rainflow(binWidth=1)
+        dut.add_block([-2, 1, -3, 5, -1, 3, -4, 4, -2])
+        res = dut.report()
+        self.assertEqual(res['cycles'], 4)
+        self.assertEqual(res['full'], 1)
+        self.assertEqual(res['half'], 6)
+        self.assertEqual(res['max_range'], 9)
+        self.assertDictEqual({hist['range_lo']: hist['cycles'] for hist in res['hist']}, {3: 0.5, 4: 1.5, 6: 0.5, 8: 1.0, 9: 0.5})
+        self.assertListEqual(res['residue'], [-2, 1, -3, 5, -4, 4, -2])   # end of data is reversal
+        # w/o residue only closed cycle
+        res = dut.report(residue=False)
+        self.assertEqual(res['cycles'], 1)
+        self.assertListEqual(res['hist'], [{'range_lo': 4, 'range_hi': 5, 'cycles': 1, 'full': 1, 'half': 0}])
+    #*****************************
+
+
+    #*****************************
+    def test_end(self):
+        """
+        @note   last extreme closes cycles at end of data
+        """
+        vals = [18, 4, 7, 5, 16, 8, -12, 3, -14, -18]
+        dut = rainflow(binWidth=1)
+        dut.add_block(vals)
+        res = dut.report()
+        self.assertDictEqual({hist['range_lo']: hist['cycles'] for hist in res['hist']}, self.astm(vals))
+        self.assertDictEqual({hist['range_lo']: hist['cycles'] for hist in res['hist']}, {2: 1, 12: 1, 15: 1, 36: 0.5})
+        self.assertEqual(res['max_range'], 36)
+        self.assertListEqual(res['residue'], [18, -18])
+        self.assertEqual(dut.report(residue=False)['full'], 2)     # not yet confirmed
+        # counter continues after report
+        dut.add_block([20, -30])
+        self.assertDictEqual({hist['range_lo']: hist['cycles'] for hist in dut.report()['hist']}, self.astm(vals + [20, -30]))
+        # random histories
+        rnd = random.Random(1049)
+        for i in range(200):
+            vals = [rnd.randint(-20, 20)]
+            while ( len(vals) < 30 ):
+                val = rnd.randint(-20, 20)
+                if ( val != vals[-1] ):
+                    vals.append(val)
+            dut = rainflow(binWidth=1)
+            dut.add_block(vals)
+            self.assertDictEqual({hist['range_lo']: hist['cycles'] for hist in dut.report()['hist']}, self.astm(vals), vals)
+    #*****************************
+
+
+    #*****************************
+    def test_hysteresis(self):
+        """
+        @note   noise below hysteresis is no cycle, residue stays small
+        """
+        dut = rainflow(binWidth=2, hysteresis=0.25)
+        for t in range(24*3600):
+            noise = 0.2 if ( t % 2 ) else 0     # 1 count of 0.2C resolution
+            dut.add(25 + 10 * math.sin(2*math.pi*t/3600) + noise)
+        dut.add(float('nan'))
+        self.assertEqual(dut.num, 24*3600)
+        res = dut.report(residue=False)
+        self.assertEqual(res['full'], 23)
+        self.assertEqual(len(res['hist']), 1)
+        self.assertEqual(res['hist'][0]['range_lo'], 20)
+        self.assertLessEqual(len(res['residue']), 4)
+        # w/o hysteresis every sample is reversal
+        dut = rainflow(binWidth=2)
+        dut.add_block([25, 25.2, 25, 25.2, 25])
+        self.assertEqual(dut.report()['hist'][0]['full'], 1)
+        with self.assertRaises(ValueError) as cm:
+            rainflow(binWidth=0)
+        self.assertEqual(str(cm.exception), "Bin width needs to be positive")
+    #*****************************
+
+
+    #*****************************
+    def test_feed(self):
+        """
+        @note   CSV trace and archive give same histogram
+        """
+        with tempfile.TemporaryDirectory() as tmpDir:
+            res = []
+            for name, writer in (("run.csv", traceWriter), ("run.atwa", archiveWriter)):
+                trace = writer(os.path.join(tmpDir, name))
+                for t in range(4*3600 + 300):     # ends apart of bin edge, archive is 0.1C quantized
+                    trace.write(t, 35, 35 + 25 * math.sin(2*math.pi*t/3600), float('nan'), 0)
+                trace.close()
+                res.append(rainflow(binWidth=5, hysteresis=0.1).feed(open_reader(os.path.join(tmpDir, name))))
+            self.assertEqual(res[0]['cycles'], res[1]['cycles'])
+            self.assertListEqual([hist['cycles'] for hist in res[0]['hist']], [hist['cycles'] for hist in res[1]['hist']])
+            self.assertEqual(res[1]['hist'][-1]['range_lo'], 50)
+    #*****************************
+
+
+    #*****************************
+    def test_live(self):
+        """
+        @note   counted in ATWG tick from measured temperature
+        """
+        atwg = ATWG()
+        chamberArg, waveArg = atwg.parse_cli(["--sine", "--chamber=SIM", "--minTemp=20", "--maxTemp=30", "--period=1h", "--rainflow=1C"])
+        self.assertEqual(atwg.cfg_rainflow, 1)
+        atwg.open(chamberArg=chamberArg, waveArg=waveArg)
+        atwg.cycles = rainflow(binWidth=atwg.cfg_rainflow, hysteresis=0.1)
+        atwg.start()
+        virtualRun(atwg).run(6*3600)
+        res = atwg.cycles.report()
+        self.assertEqual(atwg.cycles.num, atwg.ticks['meas'])
+        self.assertGreaterEqual(res['full'], 4)      # largest cycle stays in residue
+        self.assertGreaterEqual(res['cycles'], 5.5)
+        self.assertAlmostEqual(res['max_range'], 10, delta=0.5)
+        atwg.stop()
+        atwg.close()
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+#------------------------------------------------------------------------------
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          sysId_unittest.py
+@date:          2026-10-19
+
+@note           Unittest for sysId.py
+                  run ./test/unit/analysis/sysId_unittest.py
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Standard
+import sys        # python path handling
+import os         # platform independent paths
+import unittest   # performs test
+import math       # sine
+import tempfile   # trace and inventory file
+# Self
+sys.path.append(os.path.abspath((os.path.dirname(os.path.abspath(__file__)) + "/../../../"))) # add project root to lib search path
+os.environ["ATWG_CACHE_DIR"] = ""                                                             # no config disk cache in user home
+from ATWG.analysis.sysId import sysId                                                         # Python Script under test
+from ATWG.analysis.trackError import open_reader                                              # CSV trace or archive
+from ATWG.telemetry.trace import traceWriter                                                  # CSV trace
+from ATWG.driver.sim.simChamber import simChamber                                             # chamber under identification
+from ATWG.driver.configCache import configCache                                               # model storage
+from ATWG.ATWG import ATWG                                                                    # model usage
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class TestSysId(unittest.TestCase):
+
+    #*****************************
+    def steps(self, noise=0, **model):
+        """
+        @note   hourly set point steps, large steps are slew rate limited
+        """
+        tset = []
+        for val in (20, 60, 30, 32, 28, 30, -10, 40, 41, 39, 20, 50, 20) * 2:
+            tset += [val] * 3600
+        sim = simChamber()
+        sim.set_model(seed=1, order=1, noise=noise, **model)
+        return tset, [round(val, 1) for val in sim.simulate(tset, ts=1, start=20)]  # chamber resolution
+    #*****************************
+
+
+    #*****************************
+    def test_fit(self):
+        """
+        @note   time constant, dead time and asymmetric slew rates
+        """
+        tset, tmeas = self.steps(noise=0.05, tau=420, deadtime=90, rise=2.5, fall=-1.4)
+        dut = sysId(step=10, maxDead=600)
+        dut.add_block(range(len(tset)), tset, tmeas)
+        res = dut.fit()
+        self.assertAlmostEqual(res['tau'], 420, delta=0.05*420)
+        self.assertAlmostEqual(res['deadtime'], 90, delta=10)
+        self.assertAlmostEqual(res['rise'], 2.5, delta=0.05)
+        self.assertAlmostEqual(res['fall'], -1.4, delta=0.05)
+        self.assertDictEqual(res['model'], {'order': 1, 'tau': res['tau'], 'deadtime': res['deadtime'], 'rise': res['rise'], 'fall': res['fall']})
+        # slow sine never reaches slew rate
+        tset = [30 + 10*math.sin(2*math.pi*t/3600) for t in range(12*3600)]
+        sim = simChamber()
+        sim.set_model(order=1, tau=300, deadtime=60, rise=2.5, fall=-1.4)
+        dut = sysId()
+        dut.add_block(range(len(tset)), tset, sim.simulate(tset, ts=1))
+        res = dut.fit()
+        self.assertAlmostEqual(res['tau'], 300, delta=0.05*300)
+        self.assertIsNone(res['rise'])
+        self.assertIsNone(res['fall'])
+        self.assertNotIn('rise', res['model'])
+        # errors
+        with self.assertRaises(ValueError) as cm:
+            sysId().fit()
+        self.assertEqual(str(cm.exception), "Too few samples for identification, 0 resampled")
+        with self.assertRaises(ValueError) as cm:
+            sysId(step=0)
+        self.assertEqual(str(cm.exception), "Resample step needs to be positive")
+    #*****************************
+
+
+    #*****************************
+    def test_feed(self):
+        """
+        @note   CSV trace with gap, resampled
+        """
+        tset, tmeas = self.steps(tau=300, deadtime=60, rise=3.0, fall=-2.0)
+        with tempfile.TemporaryDirectory() as tmpDir:
+            traceFile = os.path.join(tmpDir, "run.csv")
+            trace = traceWriter(traceFile)
+            for t, (u, x) in enumerate(zip(tset, tmeas)):
+                if not ( 36000 <= t < 40000 ):      # chamber offline
+                    trace.write(t, u, x, float('nan'), 0)
+            trace.close()
+            dut = sysId(step=5, maxDead=300)
+            res = dut.feed(open_reader(traceFile))
+        self.assertEqual(len(dut.x), (len(tset) - 4000) // 5 + 61)    # gap is padded for longest dead time
+        self.assertEqual(sum(1 for val in dut.x if ( val != val )), 61)
+        self.assertAlmostEqual(res['tau'], 300, delta=0.05*300)
+        self.assertAlmostEqual(res['deadtime'], 60, delta=5)
+        self.assertAlmostEqual(res['rise'], 3.0, delta=0.05)
+    #*****************************
+
+
+    #*****************************
+    def test_store(self):
+        """
+        @note   model stored in inventory, used by SIM and lookahead
+        """
+        with tempfile.TemporaryDirectory() as tmpDir:
+            invFile = os.path.join(tmpDir, "lab.yml")
+            with open(invFile, 'w') as fH:
+                fH.write("chambers:\n  twin1:\n    driver: SIM\n")
+            cache = configCache(cacheDir="")
+            model = {'order': 1, 'tau': 412.5, 'deadtime': 85, 'rise': 2.41, 'fall': -1.38}
+            cache.store_model(invFile, "twin1", model)
+            self.assertDictEqual(cache.inventory(invFile, "twin1"), {'driver': "SIM", 'model': model})
+            with self.assertRaises(ValueError) as cm:
+                cache.store_model(invFile, "oven9", model)
+            self.assertEqual(str(cm.exception), "Chamber 'oven9' not in inventory '" + invFile + "'")
+            # comments and other entries stay, model is replaced in place
+            lab = ("# lab inventory, maintained by hand\n"
+                   "chambers:\n"
+                   "    oven1:              # hall 2\n"
+                   "        driver: ESPEC_SH641\n"
+                   "        model:\n"
+                   "            order: 1    # old fit\n"
+                   "            tau: 100.0\n"
+                   "\n"
+                   "        port: /dev/ttyUSB1  # front panel\n"
+                   "    oven2:\n"
+                   "        driver: ESPEC_SH641\n"
+                   "    flow: {driver: SIM}\n")
+            with open(invFile, 'w') as fH:
+                fH.write(lab)
+            cache.store_model(invFile, "oven1", model)
+            cache.store_model(invFile, "oven2", {'order': 1, 'tau': 300})
+            with open(invFile, 'r') as fH:
+                text = fH.read()
+            self.assertEqual(text, lab.replace("            order: 1    # old fit\n            tau: 100.0\n",
+                                               "            order: 1\n            tau: 412.5\n            deadtime: 85.0\n            rise: 2.41\n            fall: -1.38\n")
+                                      .replace("    flow:", "        model:\n            order: 1\n            tau: 300.0\n    flow:"))
+            self.assertDictEqual(cache.inventory(invFile, "oven1"), {'driver': "ESPEC_SH641", 'model': model, 'port': "/dev/ttyUSB1"})
+            with self.assertRaises(ValueError) as cm:
+                cache.store_model(invFile, "flow", model)
+            self.assertEqual(str(cm.exception), "Inventory entry 'flow' is no block mapping, update '" + invFile + "' manually")
+            with open(invFile, 'w') as fH:
+                fH.write("chambers:\n  twin1:\n    driver: SIM\n")
+            cache.store_model(invFile, "twin1", model)
+            # simulated twin and lookahead
+            atwg = ATWG()
+            chamberArg, waveArg = atwg.parse_cli(["--sine", "--minTemp=20", "--maxTemp=40", "--chamber=twin1", "--inventory=" + invFile, "--lookahead=mode=shape"])
+            atwg.open(chamberArg=chamberArg, waveArg=waveArg)
+            self.assertEqual(atwg.chamber.model['tau'], 412.5)
+            self.assertEqual(atwg.chamber.info()['temperature']['slewrate']['rise'], 2.41)
+            lag = atwg.lag_model()
+            self.assertEqual((lag['tau'], lag['deadtime'], lag['rise'], lag['fall']), (412.5, 85, 2.41, -1.38))
+            self.assertEqual(atwg.ahead.tau, 412.5)
+            # command line wins
+            atwg = ATWG()
+            chamberArg, waveArg = atwg.parse_cli(["--sine", "--minTemp=20", "--maxTemp=40", "--chamber=twin1", "--inventory=" + invFile, "--simModel=tau=1m"])
+            atwg.open(chamberArg=chamberArg, waveArg=waveArg)
+            self.assertEqual((atwg.chamber.model['tau'], atwg.chamber.model['deadtime']), (60, 85))
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+#------------------------------------------------------------------------------
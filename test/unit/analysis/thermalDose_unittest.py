@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          thermalDose_unittest.py
+@date:          2026-10-19
+
+@note           Unittest for thermalDose.py
+                  run ./test/unit/analysis/thermalDose_unittest.py
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Standard
+import sys        # python path handling
+import os         # platform independent paths
+import unittest   # performs test
+import math       # exp
+import tempfile   # trace file
+# Self
+sys.path.append(os.path.abspath((os.path.dirname(os.path.abspath(__file__)) + "/../../../"))) # add project root to lib search path
+from ATWG.analysis.thermalDose import thermalDose, DOSE_BOLTZMANN_EV                          # Python Script under test
+from ATWG.analysis.trackError import open_reader                                              # CSV trace or archive
+from ATWG.telemetry.trace import traceWriter                                                  # CSV trace
+from ATWG.telemetry.archive import archiveWriter                                              # archive
+from ATWG.ATWG import ATWG                                                                    # live accumulation
+from ATWG.runner.virtualRun import virtualRun                                                 # fast forward
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class TestThermalDose(unittest.TestCase):
+
+    #*****************************
+    def test_factor(self):
+        """
+        @note   acceleration factor, 0.7eV from 25C to 125C
+        """
+        dut = thermalDose(ea=0.7, tref=25)
+        self.assertEqual(dut.factor(25), 1)
+        self.assertAlmostEqual(dut.factor(125), math.exp(0.7/DOSE_BOLTZMANN_EV*(1/298.15-1/398.15)))
+        self.assertAlmostEqual(dut.factor(125), 937, delta=1)
+        self.assertLess(dut.factor(-40), 1)
+        self.assertEqual(thermalDose(ea=0).factor(125), 1)  # w/o activation time only
+        with self.assertRaises(ValueError) as cm:
+            dut.factor(-300)
+        self.assertEqual(str(cm.exception), "Temperature -300C is below absolute zero")
+        with self.assertRaises(ValueError) as cm:
+            thermalDose(binWidth=0)
+        self.assertEqual(str(cm.exception), "Bin width needs to be positive")
+    #*****************************
+
+
+    #*****************************
+    def test_dose(self):
+        """
+        @note   step profile, equivalent time and histogram
+        """
+        dut = thermalDose(ea=0.7, tref=25, binWidth=10, maxGap=60)
+        for t in range(3600):       # 1h at 25C
+            dut.add(t, 25.4)
+        for t in range(3600, 5400): # 0.5h at 85C
+            dut.add(t, 85)
+        dut.add(5400, float('nan')) # measurement failed, 1s lost
+        dut.add(5401, 85)
+        dut.add(9000, 85)           # gap, not counted
+        res = dut.report()
+        self.assertEqual(res['elapsed_sec'], 5400)
+        self.assertEqual(dut.num, 5402)
+        self.assertAlmostEqual(res['equivalent_sec'], 3600*dut.factor(25.4) + 1800*dut.factor(85))
+        self.assertAlmostEqual(res['af'], dut.factor(85))
+        self.assertAlmostEqual(res['af_mean'], res['equivalent_sec']/5400)
+        self.assertListEqual(res['hist'], [{'temp_lo': 20, 'temp_hi': 30, 'sec': 3600}, {'temp_lo': 80, 'temp_hi': 90, 'sec': 1800}])
+        self.assertDictEqual(dut.status(), {'equivalent_sec': res['equivalent_sec'], 'tref': 25, 'af': res['af']})
+    #*****************************
+
+
+    #*****************************
+    def test_feed(self):
+        """
+        @note   CSV trace and archive give same dose
+        """
+        with tempfile.TemporaryDirectory() as tmpDir:
+            res = []
+            for name, writer in (("run.csv", traceWriter), ("run.atwa", archiveWriter)):
+                trace = writer(os.path.join(tmpDir, name))
+                for t in range(2*3600):
+                    trace.write(t, 35, 35 + 25 * math.sin(2*math.pi*t/3600), float('nan'), 0)
+                trace.close()
+                res.append(thermalDose(ea=0.7, tref=35).feed(open_reader(os.path.join(tmpDir, name))))
+            self.assertEqual(res[0]['elapsed_sec'], 2*3600-1)
+            self.assertAlmostEqual(res[0]['equivalent_sec'], res[1]['equivalent_sec'], delta=res[0]['equivalent_sec']*1e-3)   # 0.1C quantized
+            self.assertGreater(res[0]['af_mean'], 1)    # convex, hot half dominates
+    #*****************************
+
+
+    #*****************************
+    def test_live(self):
+        """
+        @note   accumulated in ATWG tick, shown in status
+        """
+        atwg = ATWG()
+        chamberArg, waveArg = atwg.parse_cli(["--sine", "--chamber=SIM", "--minTemp=20", "--maxTemp=30", "--period=1h", "--dose=ea=0.7eV,tref=55C,bin=5C"])
+        self.assertDictEqual(atwg.cfg_dose, {'ea': 0.7, 'tref': 55, 'binWidth': 5})
+        atwg.open(chamberArg=chamberArg, waveArg=waveArg)
+        atwg.dose = thermalDose(**atwg.cfg_dose)
+        atwg.start()
+        virtualRun(atwg).run(3600)
+        res = atwg.dose.report()
+        self.assertEqual(atwg.dose.num, atwg.ticks['meas'])
+        self.assertEqual(res['elapsed_sec'], 3599)
+        self.assertLess(res['af_mean'], 0.2)    # 30C below reference
+        self.assertIn("    Stress   : " + atwg.sec_to_time(sec=round(res['equivalent_sec'])) + " @ +55.00 °C, AF ", atwg.status())
+        atwg.stop()
+        atwg.close()
+        with self.assertRaises(ValueError) as cm:
+            ATWG().parse_cli(["--sine", "--minTemp=20", "--maxTemp=30", "--dose=tmax=30"])
+        self.assertEqual(str(cm.exception), "Unknown thermal dose setting 'tmax'")
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+#------------------------------------------------------------------------------
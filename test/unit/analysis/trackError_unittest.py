@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          trackError_unittest.py
+@date:          2026-10-19
+
+@note           Unittest for trackError.py
+                  run ./test/unit/analysis/trackError_unittest.py
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Standard
+import sys        # python path handling
+import os         # platform independent paths
+import unittest   # performs test
+import math       # sine
+import tempfile   # trace file
+# Self
+sys.path.append(os.path.abspath((os.path.dirname(os.path.abspath(__file__)) + "/../../../"))) # add project root to lib search path
+from ATWG.analysis.trackError import trackError, open_reader                                  # Python Script under test
+from ATWG.telemetry.trace import traceWriter                                                  # CSV trace
+from ATWG.telemetry.archive import archiveWriter                                              # archive
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class TestTrackError(unittest.TestCase):
+
+    #*****************************
+    def sine(self, t, delay=0):
+        """
+        @note   1h sine, 10..60C
+        """
+        return 35 + 25 * math.sin(2*math.pi*(t-delay)/3600)
+    #*****************************
+
+
+    #*****************************
+    def test_lag(self):
+        """
+        @note   delayed measurement, lag and error statistics
+        """
+        dut = trackError(tol=5, maxLag=1800, decimate=30)
+        for t in range(6*3600):
+            dut.add(t, self.sine(t), self.sine(t, delay=300))
+        res = dut.report()
+        self.assertEqual(res['samples'], 6*3600)
+        self.assertEqual(res['duration_sec'], 6*3600-1)
+        self.assertAlmostEqual(res['lag']['sec'], 300, delta=10)
+        self.assertAlmostEqual(res['lag']['corr'], 1, places=2)
+        # error of delayed sine: 2*A*sin(pi*delay/tp)
+        amp = 2 * 25 * math.sin(math.pi*300/3600)
+        self.assertAlmostEqual(res['max'], amp, delta=0.01)
+        self.assertAlmostEqual(res['rms'], amp/math.sqrt(2), delta=0.01)
+        self.assertAlmostEqual(res['in_tol_frac'], 2/math.pi*math.asin(5/amp), delta=0.01)
+        # segments
+        self.assertEqual(res['kinds']['rise']['count'] + res['kinds']['fall']['count'], 13)
+    #*****************************
+
+
+    #*****************************
+    def test_segments(self):
+        """
+        @note   trapezoid, per segment statistics
+        """
+        dut = trackError(tol=0.5)
+        # 10min ramp up, 20min hold, 10min ramp down, 20min hold
+        t = 0
+        for cyc in range(3):
+            for i in range(600):
+                dut.add(t, 20+i/20, 20+i/20-1, 1/20); t += 1     # 1C behind while rising
+            for i in range(1200):
+                dut.add(t, 50, 50.2, 0); t += 1
+            for i in range(600):
+                dut.add(t, 50-i/20, 50-i/20+1, -1/20); t += 1
+            for i in range(1200):
+                dut.add(t, 20, float('nan'), 0); t += 1         # w/o measurement
+        res = dut.report()
+        self.assertEqual(res['samples'], 3*2400)
+        self.assertEqual(res['kinds']['rise']['count'], 3)
+        self.assertEqual(res['kinds']['fall']['count'], 3)
+        self.assertEqual(res['kinds']['hold']['count'], 3)
+        self.assertAlmostEqual(res['kinds']['rise']['rms'], 1)
+        self.assertAlmostEqual(res['kinds']['hold']['max'], 0.2)
+        self.assertEqual(res['kinds']['hold']['in_tol_frac'], 1)
+        self.assertEqual(res['kinds']['rise']['in_tol_frac'], 0)
+        self.assertEqual(len(res['segments']), 9)
+        self.assertListEqual([seg['kind'] for seg in res['segments'][0:3]], ["rise", "hold", "fall"])
+        self.assertEqual(res['segments'][1]['tstart'], 600)
+        self.assertEqual(res['segments'][1]['tstop'], 1799)
+        with self.assertRaises(ValueError) as cm:
+            trackError(tol=-1)
+        self.assertEqual(str(cm.exception), "Tolerance needs to be non-negative")
+    #*****************************
+
+
+    #*****************************
+    def test_feed(self):
+        """
+        @note   CSV trace and archive give same result
+        """
+        with tempfile.TemporaryDirectory() as tmpDir:
+            res = []
+            for name, writer in (("run.csv", traceWriter), ("run.atwa", archiveWriter)):
+                trace = writer(os.path.join(tmpDir, name))
+                for t in range(7200):
+                    trace.write(t, self.sine(t), self.sine(t, delay=120), float('nan'), 25*2*math.pi/3600*math.cos(2*math.pi*t/3600))
+                trace.close()
+                res.append(trackError(tol=1, keepSegments=False).feed(open_reader(os.path.join(tmpDir, name))))
+            self.assertNotIn('segments', res[0])
+            self.assertEqual(res[0]['samples'], res[1]['samples'])
+            self.assertAlmostEqual(res[0]['rms'], res[1]['rms'], delta=0.01)     # archive 0.1C quantized
+            self.assertAlmostEqual(res[0]['lag']['sec'], 120, delta=10)
+            self.assertAlmostEqual(res[1]['lag']['sec'], 120, delta=10)
+            self.assertEqual(res[0]['kinds']['rise']['count'], res[1]['kinds']['rise']['count'])
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+#------------------------------------------------------------------------------
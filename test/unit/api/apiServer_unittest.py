@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          apiServer_unittest.py
+@date:          2026-10-19
+
+@note           Unittest for apiServer.py
+                  run ./test/unit/api/apiServer_unittest.py
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Standard
+import sys          # python path handling
+import os           # platform independent paths
+import unittest     # performs test
+import json         # response decoding
+import socket       # unix socket client
+import tempfile     # unix socket path
+import http.client  # TCP client
+# Self
+sys.path.append(os.path.abspath((os.path.dirname(os.path.abspath(__file__)) + "/../../../"))) # add project root to lib search path
+from ATWG.telemetry.apiServer import apiServer                                                # Python Script under test
+from ATWG.ATWG import ATWG                                                                    # generator
+from ATWG.runner.virtualRun import virtualRun                                                 # virtual clock
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class TestApiServer(unittest.TestCase):
+
+    #*****************************
+    def open(self):
+        """
+        @note   opened ATWG on SIM chamber, bound to virtual clock
+        """
+        atwg = ATWG()
+        chamberArg, waveArg = atwg.parse_cli(["--sine", "--chamber=SIM", "--minTemp=10", "--maxTemp=60", "--period=1h", "--api=127.0.0.1:0"])
+        atwg.open(chamberArg=chamberArg, waveArg=waveArg)
+        run = virtualRun(atwg)
+        return atwg, run
+    #*****************************
+
+
+    #*****************************
+    def http(self, address, method, res):
+        """
+        @note   single request on TCP
+        """
+        host, port = address.split(":")
+        conn = http.client.HTTPConnection(host, int(port), timeout=5)
+        conn.request(method, res)
+        rsp = conn.getresponse()
+        doc = json.loads(rsp.read())
+        conn.close()
+        return rsp.status, doc
+    #*****************************
+
+
+    #*****************************
+    def test_tcp(self):
+        """
+        @note   state read and pause/resume/stop
+        """
+        atwg, run = self.open()
+        self.assertEqual(atwg.cfg_api, "127.0.0.1:0")
+        dut = apiServer(atwg, atwg.cfg_api)
+        address = dut.start()
+        self.assertNotEqual(address, "127.0.0.1:0")
+        # no tick yet
+        self.assertEqual(self.http(address, "GET", "/state")[0], 503)
+        # run
+        atwg.start()
+        run.run(600)
+        code, doc = self.http(address, "GET", "/state")
+        self.assertEqual(code, 200)
+        self.assertEqual(doc['state'], "run")
+        self.assertEqual(doc['progress']['elapsed_sec'], 599)
+        self.assertAlmostEqual(doc['progress']['phase'], atwg.wave.iterator/3600)
+        phase = doc['progress']['phase']
+        self.assertEqual(doc['loop']['wakes'], 600)
+        self.assertEqual(doc['loop']['set'], 600)
+        self.assertEqual(doc['wave']['wave'], "sine")
+        self.assertEqual(doc['wave']['chamber'], "SIM")
+        self.assertIsNone(doc['clima']['humidity'])     # nan is null
+        self.assertEqual(self.http(address, "GET", "/clima")[1], doc['clima'])
+        self.assertIs(dut.document(), dut.document())   # built once per snapshot
+        self.assertIs(dut.encoded("clima"), dut.encoded("clima"))   # encoded once per snapshot
+        self.assertEqual(json.loads(dut.encoded("state")), doc)
+        # pause, set point holds
+        self.assertEqual(self.http(address, "POST", "/pause"), (202, {'command': "pause"}))
+        run.run(100)
+        code, doc = self.http(address, "GET", "/loop")
+        self.assertEqual(atwg.state, "pause")
+        self.assertEqual(doc['set'], 600)
+        self.assertEqual(doc['meas'], 700)
+        self.assertEqual(atwg.snapshot.phase, phase)
+        # resume, waveform continues
+        self.http(address, "POST", "/resume")
+        run.run(100)
+        self.assertEqual(atwg.state, "run")
+        self.assertEqual(atwg.ticks['set'], 700)
+        self.assertAlmostEqual(atwg.snapshot.phase, (phase + 100/3600) % 1)
+        # stop ends run
+        self.http(address, "POST", "/stop")
+        stats = run.run(100)
+        self.assertEqual(atwg.state, "stop")
+        self.assertEqual(stats['wakes'], 1)
+        # errors
+        self.assertEqual(self.http(address, "GET", "/pause")[0], 405)
+        self.assertEqual(self.http(address, "POST", "/state")[0], 405)
+        self.assertEqual(self.http(address, "GET", "/foo")[0], 404)
+        self.assertEqual(self.http(address, "GET", "/rainflow"), (404, {'error': "Rainflow counting not enabled"}))
+        self.assertEqual(self.http(address, "GET", "/dose"), (404, {'error': "Thermal dose not enabled"}))
+        self.assertEqual(self.http(address, "GET", "/hooks"), (404, {'error': "User hooks not enabled"}))
+        dut.stop()
+        self.assertIsNone(atwg.api)
+        with self.assertRaises(ValueError) as cm:
+            atwg.command("jump", 0)
+        self.assertEqual(str(cm.exception), "Unknown command 'jump'")
+    #*****************************
+
+
+    #*****************************
+    @unittest.skipUnless(hasattr(socket, 'AF_UNIX'), "requires unix sockets")
+    def test_unix(self):
+        """
+        @note   request on unix socket
+        """
+        atwg, run = self.open()
+        with tempfile.TemporaryDirectory() as tmpDir:
+            path = os.path.join(tmpDir, "atwg.sock")
+            dut = apiServer(atwg, "unix:" + path)
+            dut.start()
+            atwg.start()
+            run.run(10)
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(path)
+            sock.sendall(b"GET /progress HTTP/1.1\r\nHost: atwg\r\n\r\n")
+            rsp = b""
+            while True:
+                data = sock.recv(4096)
+                if ( 0 == len(data) ):
+                    break
+                rsp += data
+            sock.close()
+            head, sep, body = rsp.partition(b"\r\n\r\n")
+            self.assertTrue(head.startswith(b"HTTP/1.1 200 OK"))
+            self.assertEqual(json.loads(body)['elapsed_sec'], 9)
+            dut.stop()
+            self.assertFalse(os.path.exists(path))
+    #*****************************
+
+
+    #*****************************
+    def test_no_publish(self):
+        """
+        @note   w/o server no snapshot is built
+        """
+        atwg, run = self.open()
+        atwg.start()
+        run.run(10)
+        self.assertIsNone(atwg.snapshot)
+        with self.assertRaises(ValueError) as cm:
+            apiServer(atwg, "127.0.0.1:99999").start()
+        self.assertTrue(str(cm.exception).startswith("API server failed on '127.0.0.1:99999'"))
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+#------------------------------------------------------------------------------
@@ -22,13 +22,51 @@
 import sys        # python path handling
 import os         # platform independent paths
 import unittest   # performs test
+import math       # isnan
+import tempfile   # trace file
 # Self
 sys.path.append(os.path.abspath((os.path.dirname(os.path.abspath(__file__)) + "/../../../")))   # add project root to lib search path
+os.environ["ATWG_CACHE_DIR"] = ""                                                             # no config disk cache in user home
+from ATWG.runner.virtualRun import virtualRun                                                   # policy on virtual clock
+from ATWG.telemetry.trace import traceWriter, traceReader                                        # telemetry while paused
 from ATWG.ATWG import ATWG                                                                      # Python Script under test
 #------------------------------------------------------------------------------
 
 
 
+#------------------------------------------------------------------------------
+class plainChamber:
+    """
+    @note:  plugin driver w/o set point write policy, writes every set point
+    """
+    def __init__(self):
+        self.temperature = 20.0
+        self.written = 0
+        self.isOpen = False
+        self.clock = None   # model time, bound by virtualRun
+        self.sleep = None
+    def open(self, port=""):
+        self.isOpen = True
+        return True
+    def close(self):
+        self.isOpen = False
+        return True
+    def start(self):
+        return True
+    def stop(self):
+        return True
+    def info(self):
+        return {'name': "PLAIN", 'fracs': {'temperature': 1, 'humidity': 1}}
+    def get_clima(self):
+        return {'temperature': self.temperature, 'humidity': float('nan')}
+    def set_clima(self, clima=None):
+        self.temperature = clima['temperature']
+        self.written += 1
+        return True
+#------------------------------------------------------------------------------
+
+
+
 #------------------------------------------------------------------------------
 class TestATWG(unittest.TestCase):
 
@@ -124,6 +162,9 @@ class TestATWG(unittest.TestCase):
         chamberArg, waveArg = dut.parse_cli(["--sine", "--riseTime=5sec", "--minTemp=5C", "--maxTemp=10c", "--chamber=ESPEC_SH641"])
         self.assertDictEqual(waveArg, {'ts': 1, 'tp': 3600, 'wave': 'sine', 'lowVal': 5, 'highVal': 10, 'tr': 5, 'initVal': 10})
         self.assertDictEqual(chamberArg, {'chamber': 'ESPEC_SH641', 'port': ""})
+        # write policy
+        chamberArg, waveArg = dut.parse_cli(["--sine", "--minTemp=5C", "--maxTemp=10c", "--writeDeadband=0.2C", "--writeInterval=10s", "--writeRefresh=5m"])
+        self.assertDictEqual(chamberArg, {'chamber': 'SIM', 'port': "", 'policy': {'deadband': 0.2, 'minInterval': 10, 'refresh': 300}})
     #*****************************
     
     
@@ -166,6 +207,58 @@ class TestATWG(unittest.TestCase):
         self.assertEqual(str(cm.exception), "Unsupported waveform 'unknown' requested")
         # open in sim mode with sine wave
         self.assertTrue(dut.open(chamberArg={'chamber': 'SIM', 'port': ""}, waveArg={'ts': 1, 'tp': 3600, 'wave': 'sine'}))
+        # exception: offload w/o chamber program memory
+        dut.cfg_offload = True
+        with self.assertRaises(ValueError) as cm:
+            dut.open(chamberArg={'chamber': 'SIM', 'port': ""}, waveArg={'ts': 1, 'tp': 3600, 'wave': 'sine'})
+        self.assertEqual(str(cm.exception), "Chamber 'SIM' supports no program offload")
+    #*****************************
+
+
+    #*****************************
+    def test_no_policy(self):
+        """
+        @note   plugin driver w/o set point write policy
+        """
+        chamberArg = {'chamber': 'PLAIN', 'port': ""}
+        waveArg = {'ts': 1, 'tp': 3600, 'wave': 'sine', 'highVal': 30, 'lowVal': 20, 'initVal': 25}
+        # policy settings and event driven update need policy
+        dut = ATWG()
+        dut.registry.register("PLAIN", plainChamber)
+        with self.assertRaises(ValueError) as cm:
+            dut.open(chamberArg=dict(chamberArg, policy={'resolution': 0.1}), waveArg=waveArg)
+        self.assertEqual(str(cm.exception), "Chamber 'PLAIN' has no set point write policy")
+        dut.cfg_event_driven = True
+        with self.assertRaises(ValueError) as cm:
+            dut.open(chamberArg=chamberArg, waveArg=waveArg)
+        self.assertEqual(str(cm.exception), "Event driven update needs set point write policy, 'PLAIN' has none")
+        self.assertFalse(dut.chamber.isOpen)    # checked before interface is opened
+        # unsupported options leave no open interface
+        dut = ATWG()
+        dut.registry.register("PLAIN", plainChamber)
+        dut.cfg_offload = True
+        with self.assertRaises(ValueError) as cm:
+            dut.open(chamberArg=chamberArg, waveArg=waveArg)
+        self.assertEqual(str(cm.exception), "Chamber 'PLAIN' supports no program offload")
+        self.assertFalse(dut.chamber.isOpen)
+        dut.cfg_offload = False
+        with self.assertRaises(ValueError) as cm:
+            dut.open(chamberArg=chamberArg, waveArg=dict(waveArg, wave="unknown"))
+        self.assertEqual(str(cm.exception), "Unsupported waveform 'unknown' requested")
+        self.assertFalse(dut.chamber.isOpen)    # closed after failed setup
+        # periodic run on virtual clock, every set point is written
+        dut = ATWG()
+        dut.registry.register("PLAIN", plainChamber)
+        dut.api = True  # publish snapshots
+        self.assertTrue(dut.open(chamberArg=chamberArg, waveArg=waveArg))
+        run = virtualRun(dut)
+        self.assertTrue(dut.start())
+        run.run(600)
+        self.assertEqual(dut.snapshot.written, dut.ticks['set'])
+        self.assertEqual(dut.snapshot.skipped, 0)
+        self.assertEqual(dut.chamber.written, dut.ticks['set'] + 1)     # start
+        self.assertTrue(dut.stop())
+        self.assertEqual(dut.chamber.temperature, 25)
     #*****************************
     
     
@@ -196,6 +289,16 @@ class TestATWG(unittest.TestCase):
         # check, initVal added cause default comes from parse_cli
         self.assertTrue(dut.open(chamberArg={'chamber': 'SIM', 'port': ""}, waveArg={'ts': 1, 'tp': 3600, 'wave': 'sine', 'initVal': 25}))
         self.assertTrue(dut.stop())
+        # shutdown set point bypasses rate cap
+        dut = ATWG()
+        chamberArg, waveArg = dut.parse_cli(["--sine", "--chamber=SIM", "--minTemp=20", "--maxTemp=40", "--startTemp=20", "--period=90m", "--writeInterval=1h"])
+        self.assertTrue(dut.open(chamberArg=chamberArg, waveArg=waveArg))
+        run = virtualRun(dut)
+        self.assertTrue(dut.start())
+        run.run(3600 + 600)
+        self.assertNotEqual(dut.chamber.last_set_temp, 20)
+        self.assertTrue(dut.stop())
+        self.assertEqual(dut.chamber.last_set_temp, 20)
     #*****************************
     
     
@@ -235,6 +338,55 @@ class TestATWG(unittest.TestCase):
     #*****************************
     
     
+    #*****************************
+    def test_pause_first(self):
+        """
+        @note   pause before first set point, telemetry w/o set point
+        """
+        dut = ATWG()
+        self.assertTrue(dut.open(chamberArg={'chamber': 'SIM', 'port': ""}, waveArg={'ts': 1, 'tp': 3600, 'wave': 'sine'}))
+        with tempfile.TemporaryDirectory() as tmpDir:
+            traceFile = os.path.join(tmpDir, "run.csv")
+            dut.trace = traceWriter(traceFile)
+            dut.commands.append("pause")
+            self.assertEqual(dut.tick(0.0), 1)
+            self.assertEqual(dut.state, "pause")
+            self.assertNotIn('set', dut.clima)
+            dut.trace.close()
+            rows = list(traceReader(traceFile).rows())
+            self.assertEqual(len(rows), 1)
+            self.assertTrue(math.isnan(rows[0][1]))     # tset
+    #*****************************
+
+
+    #*****************************
+    def test_tick(self):
+        """
+        @note   checks periodic and event driven update of one day sine
+        """
+        # periodic, every sample time
+        dut = ATWG()
+        self.assertTrue(dut.open(chamberArg={'chamber': 'SIM', 'port': ""}, waveArg={'ts': 1, 'tp': 86400, 'wave': 'sine', 'highVal': 30, 'lowVal': 20}))
+        now = 0
+        while ( now < 86400 ):
+            now = dut.tick(now)
+        self.assertDictEqual(dut.ticks, {'set': 86400, 'meas': 86400})
+        # event driven, set point only on chamber visible change, measurement every minute
+        dut = ATWG()
+        dut.cfg_event_driven = True
+        dut.cfg_tmeas_sec = 60
+        self.assertTrue(dut.open(chamberArg={'chamber': 'SIM', 'port': ""}, waveArg={'ts': 1, 'tp': 86400, 'wave': 'sine', 'highVal': 30, 'lowVal': 20}))
+        dut.chamber.policy.set(resolution=0.1)
+        now = 0
+        while ( now < 86400 ):
+            now = dut.tick(now)
+        self.assertEqual(dut.ticks['meas'], 1440)
+        self.assertLess(dut.ticks['set'], 86400/200)
+        self.assertEqual(dut.ticks['set'], dut.chamber.policy.stats['written'])    # every update changes chamber
+        self.assertEqual(dut.wave.iterator, dut.tnext['set'] % 86400)              # waveform in time
+    #*****************************
+
+
     #*****************************
     def test_close(self):
         """
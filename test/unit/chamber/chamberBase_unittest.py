@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          chamberBase_unittest.py
+@date:          2026-10-19
+
+@note           Unittest for chamberBase.py
+                  run ./test/unit/chamber/chamberBase_unittest.py
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Standard
+import sys          # python path handling
+import os           # platform independent paths
+import unittest     # performs test
+import math         # isnan
+import gc           # clears free lists before snapshot
+import tracemalloc  # allocation check
+# Self
+sys.path.append(os.path.abspath((os.path.dirname(os.path.abspath(__file__)) + "/../../../"))) # add project root to lib search path
+os.environ["ATWG_CACHE_DIR"] = ""                                                             # no config disk cache in user home
+from ATWG.driver.chamberBase import chamberBase, climaRec                                     # Python Script under test
+from ATWG.driver.espec.sh641 import especShSu                                                 # ported driver
+from ATWG.ATWG import ATWG                                                                    # control tick
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class TestChamberBase(unittest.TestCase):
+
+    #*****************************
+    # common const
+    simFile = os.path.abspath(os.path.dirname(os.path.abspath(__file__)) + "/../sh641/sh641_dialog.yml")
+    #*****************************
+
+
+    #*****************************
+    def test_climaRec(self):
+        """
+        @note   slots and dict style access
+        """
+        dut = climaRec(temperature=25)
+        self.assertEqual(dut['temperature'], 25)
+        self.assertTrue(math.isnan(dut.humidity))
+        dut['humidity'] = 40
+        self.assertDictEqual(dut.as_dict(), {'temperature': 25, 'humidity': 40})
+        with self.assertRaises(AttributeError):
+            dut.pressure = 1
+        with self.assertRaises(TypeError):
+            chamberBase()   # driver w/o measure
+    #*****************************
+
+
+    #*****************************
+    def atwg(self, chamber):
+        """
+        @note   opened ATWG, ESPEC runs on dialog file
+        """
+        dut = ATWG()
+        chamberArg, waveArg = dut.parse_cli(["--sine", "--minTemp=10", "--maxTemp=60", "--period=10m", "--chamber=SIM"])
+        self.assertTrue(dut.open(chamberArg=chamberArg, waveArg=waveArg))
+        if ( "SIM" == chamber ):
+            dut.chamber.set_model(order=1, tau=60)
+        else:
+            dut.chamber = especShSu()
+            dut.chamber.open(simFile=TestChamberBase.simFile)
+            dut.measure = dut.chamber.measure
+        return dut
+    #*****************************
+
+
+    #*****************************
+    def test_tick(self):
+        """
+        @note   steady state ticks of several chambers reuse records,
+                nothing is retained and transient memory per tick is small
+        """
+        duts = [self.atwg(chamber) for chamber in ("SIM", "SIM", "ESPEC_SH641")]
+        # warm up
+        for i in range(100):
+            for dut in duts:
+                dut.chamber_update()
+        # records are reused
+        for dut in duts:
+            self.assertIs(dut.clima['get'], dut.chamber.meas)
+            self.assertIs(dut.clima['set'], dut.setRec)
+        self.assertEqual(duts[2].clima['get']['temperature'], 26.4)
+        # steady state
+        gc.collect()
+        tracemalloc.start()
+        self.addCleanup(tracemalloc.stop)
+        filters = [tracemalloc.Filter(True, os.path.join("*", "ATWG", "*"))]
+        start = tracemalloc.take_snapshot().filter_traces(filters)
+        peak = 0
+        for i in range(1000):
+            for dut in duts:
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+                dut.chamber_update()
+                peak = max(peak, tracemalloc.get_traced_memory()[1] - before)
+        gc.collect()
+        stop = tracemalloc.take_snapshot().filter_traces(filters)
+        growth = sum(stat.size_diff for stat in stop.compare_to(start, 'filename'))
+        self.assertLess(growth, 1024)   # replaced values only, independent from number of ticks
+        self.assertLess(peak, 2048)     # transient per tick, f.e. floats and response bytes
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+#------------------------------------------------------------------------------
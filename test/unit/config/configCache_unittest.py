@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          configCache_unittest.py
+@date:          2026-10-19
+
+@note           Unittest for configCache.py
+                  run ./test/unit/config/configCache_unittest.py
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Standard
+import sys        # python path handling
+import os         # platform independent paths
+import unittest   # performs test
+import tempfile   # config and cache files
+# Self
+sys.path.append(os.path.abspath((os.path.dirname(os.path.abspath(__file__)) + "/../../../"))) # add project root to lib search path
+os.environ["ATWG_CACHE_DIR"] = ""                                                             # no config disk cache in user home
+from ATWG.driver.configCache import configCache, CFG_CACHE_ENV, CFG_SHIPPED_DIR               # Python Script under test
+from ATWG.driver.espec.sh641Const import IF_CFG_SCHEMA                                        # SH641 interface schema
+from ATWG.ATWG import ATWG                                                                    # inventory usage
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class TestConfigCache(unittest.TestCase):
+
+    #*****************************
+    def setUp(self):
+        """
+        @note   temporary config and cache directory
+        """
+        tmpDir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpDir.cleanup)
+        self.tmpDir = tmpDir.name
+        self.cacheDir = os.path.join(self.tmpDir, "cache")
+        self.cfgFile = os.path.join(self.tmpDir, "itf.yml")
+        self.write(self.cfgFile, "baudrate: 9600\ndatabit: 8\nparity: N\nrs232:\n  posix: /dev/ttyUSB0\n  nt: COM1\nstopbit: 1\ntiout_sec: 5\n")
+    #*****************************
+
+
+    #*****************************
+    def write(self, fileName, content, mtime=None):
+        """
+        @note   writes file w/ defined modification time
+        """
+        with open(fileName, "w") as fh:
+            fh.write(content)
+        if ( None != mtime ):
+            os.utime(fileName, ns=(mtime, mtime))
+    #*****************************
+
+
+    #*****************************
+    def test_load(self):
+        """
+        @note   parsed once, memory and disk hit, invalidated by mtime
+        """
+        dut = configCache(cacheDir=self.cacheDir)
+        cfg = dut.load(self.cfgFile, schema=IF_CFG_SCHEMA)
+        self.assertEqual(cfg['rs232']['posix'], "/dev/ttyUSB0")
+        self.assertEqual(cfg['tiout_sec'], 5)
+        # memory hit, caller gets copy
+        cfg['rs232']['posix'] = "/dev/ttyUSB1"
+        self.assertEqual(dut.load(self.cfgFile)['rs232']['posix'], "/dev/ttyUSB0")
+        self.assertDictEqual(dut.stats, {'mem': 1, 'disk': 0, 'parse': 1})
+        # new process, disk hit
+        dut = configCache(cacheDir=self.cacheDir)
+        self.assertEqual(dut.load(self.cfgFile)['baudrate'], 9600)
+        self.assertDictEqual(dut.stats, {'mem': 0, 'disk': 1, 'parse': 0})
+        # changed file
+        self.write(self.cfgFile, "baudrate: 19200\n", mtime=os.stat(self.cfgFile).st_mtime_ns + 10**9)
+        self.assertEqual(dut.load(self.cfgFile)['baudrate'], 19200)
+        self.assertEqual(dut.stats['parse'], 1)
+        # w/o disk cache
+        dut = configCache(cacheDir="")
+        dut.load(self.cfgFile)
+        dut.load(self.cfgFile)
+        self.assertDictEqual(dut.stats, {'mem': 1, 'disk': 0, 'parse': 1})
+    #*****************************
+
+
+    #*****************************
+    def test_user_cache(self):
+        """
+        @note   user cache holds only shipped configs, deleted configs
+                are evicted
+        """
+        env = {key: os.environ.pop(key, None) for key in (CFG_CACHE_ENV, "XDG_CACHE_HOME")}
+        self.addCleanup(lambda: [os.environ.__setitem__(key, val) for key, val in env.items() if ( None != val )])
+        os.environ["XDG_CACHE_HOME"] = self.tmpDir
+        dut = configCache()
+        self.assertEqual(dut.cacheDir, os.path.join(self.tmpDir, "atwg"))
+        # temporary config, memory only
+        dut.load(self.cfgFile)
+        self.assertFalse(os.path.isdir(dut.cacheDir))
+        # shipped config, disk cached
+        shipped = os.path.join(CFG_SHIPPED_DIR, "espec", "sh641InterfaceDefault.yml")
+        dut.load(shipped, schema=IF_CFG_SCHEMA)
+        self.assertEqual(len(os.listdir(dut.cacheDir)), 1)
+        self.assertEqual(configCache().disk_load(shipped, dut.mem[shipped][0]), dut.mem[shipped][1])
+        # explicit cache directory holds every config, orphans are evicted on store
+        dut = configCache(cacheDir=dut.cacheDir)
+        dut.load(self.cfgFile)
+        self.assertEqual(len(os.listdir(dut.cacheDir)), 2)
+        os.remove(self.cfgFile)
+        self.write(os.path.join(dut.cacheDir, "foreign.json"), "{}")
+        self.write(os.path.join(self.tmpDir, "other.yml"), "baudrate: 9600\n")
+        dut.load(os.path.join(self.tmpDir, "other.yml"))
+        self.assertEqual(len(os.listdir(dut.cacheDir)), 3)  # shipped, other, foreign
+        self.assertEqual(dut.evict(), 0)
+    #*****************************
+
+
+    #*****************************
+    def test_check(self):
+        """
+        @note   schema violations
+        """
+        dut = configCache(cacheDir="")
+        self.write(self.cfgFile, "baudrate: fast\n")
+        with self.assertRaises(ValueError) as cm:
+            dut.load(self.cfgFile, schema={'baudrate': (int,)})
+        self.assertEqual(str(cm.exception), "Configuration '" + self.cfgFile + "' entry 'baudrate' has unsupported type 'str'")
+        with self.assertRaises(ValueError) as cm:
+            dut.load(self.cfgFile, schema={'parity': (str,)})
+        self.assertEqual(str(cm.exception), "Configuration '" + self.cfgFile + "' misses 'parity'")
+        with self.assertRaises(FileNotFoundError):
+            dut.load(os.path.join(self.tmpDir, "missing.yml"))
+    #*****************************
+
+
+    #*****************************
+    def test_inventory(self):
+        """
+        @note   chamber entries and ATWG selection
+        """
+        invFile = os.path.join(self.tmpDir, "lab.yml")
+        self.write(invFile, "chambers:\n  oven1:\n    driver: ESPEC_SH641\n    port: /dev/ttyUSB1\n    timeout: 2\n  sim1:\n    driver: SIM\n  bad:\n    driver: SIM\n    speed: 1\n  twin:\n    driver: SIM\n    baudrate: 9600\n    timeout: 2\n")
+        dut = configCache(cacheDir="")
+        self.assertDictEqual(dut.inventory(invFile, "oven1"), {'driver': 'ESPEC_SH641', 'port': '/dev/ttyUSB1', 'timeout': 2})
+        with self.assertRaises(ValueError) as cm:
+            dut.inventory(invFile, "oven2")
+        self.assertEqual(str(cm.exception), "Chamber 'oven2' not in inventory '" + invFile + "'")
+        with self.assertRaises(ValueError) as cm:
+            dut.inventory(invFile, "bad")
+        self.assertEqual(str(cm.exception), "Inventory entry 'bad' has unknown key 'speed'")
+        # ATWG selects driver by inventory
+        atwg = ATWG()
+        chamberArg, waveArg = atwg.parse_cli(["--sine", "--minTemp=10", "--maxTemp=60", "--chamber=sim1", "--inventory=" + invFile])
+        self.assertEqual(chamberArg['inventory'], invFile)
+        self.assertTrue(atwg.open(chamberArg=chamberArg, waveArg=waveArg))
+        self.assertEqual(atwg.chamber.info()['name'], "SIM")
+        # interface settings not supported by driver
+        atwg = ATWG()
+        chamberArg, waveArg = atwg.parse_cli(["--sine", "--minTemp=10", "--maxTemp=60", "--chamber=twin", "--inventory=" + invFile])
+        with self.assertRaises(ValueError) as cm:
+            atwg.open(chamberArg=chamberArg, waveArg=waveArg)
+        self.assertEqual(str(cm.exception), "Chamber driver 'SIM' supports no interface setting 'baudrate', 'timeout' of inventory entry 'twin'")
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+#------------------------------------------------------------------------------
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          writePolicy_unittest.py
+@date:          2026-10-19
+
+@note           Unittest for writePolicy.py
+                  run ./test/unit/policy/writePolicy_unittest.py
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Standard
+import sys        # python path handling
+import os         # platform independent paths
+import unittest   # performs test
+# Self
+sys.path.append(os.path.abspath((os.path.dirname(os.path.abspath(__file__)) + "/../../../"))) # add project root to lib search path
+from ATWG.driver.writePolicy import writePolicy                                               # Python Script under test
+from ATWG.waves.waves import waves                                                            # slow waveform
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class TestWritePolicy(unittest.TestCase):
+
+    #*****************************
+    def write(self, dut, value, now, force=False):
+        """
+        @note   check and successful write
+        """
+        value = dut.check(value, now=now, force=force)
+        if ( None != value ):
+            dut.commit(value, now=now)
+        return value
+    #*****************************
+
+
+    #*****************************
+    def test_set(self):
+        """
+        @note   checks config
+        """
+        dut = writePolicy(resolution=0.1)
+        self.assertEqual(dut.fracs, 1)
+        self.assertTrue(dut.set(resolution=0.05))
+        self.assertEqual(dut.fracs, 2)
+        self.assertTrue(dut.set(resolution=1))
+        self.assertEqual(dut.fracs, 0)
+        # exceptions
+        with self.assertRaises(ValueError) as cm:
+            dut.set(foo=1)
+        self.assertEqual(str(cm.exception), "Unknown write policy argument 'foo'")
+        with self.assertRaises(ValueError) as cm:
+            dut.set(deadband=-1)
+        self.assertEqual(str(cm.exception), "Write policy argument 'deadband' needs to be non-negative")
+    #*****************************
+
+
+    #*****************************
+    def test_quantize(self):
+        """
+        @note   checks quantization and deadband
+        """
+        dut = writePolicy(resolution=0.1)
+        self.assertEqual(self.write(dut, 35.21, now=0), 35.2)
+        self.assertEqual(self.write(dut, 35.24, now=1), None)     # same chamber set point
+        self.assertEqual(self.write(dut, 35.26, now=2), 35.3)
+        # deadband
+        dut.set(deadband=0.1)
+        self.assertEqual(self.write(dut, 35.36, now=3), None)
+        self.assertEqual(self.write(dut, 35.46, now=4), 35.5)
+        self.assertDictEqual(dut.stats, {'written': 3, 'skipped': 2, 'deadband': 2, 'rate': 0})
+    #*****************************
+
+
+    #*****************************
+    def test_rate(self):
+        """
+        @note   checks rate cap and refresh
+        """
+        dut = writePolicy(resolution=0.1, minInterval=10, refresh=60)
+        self.assertEqual(self.write(dut, 20, now=0), 20)
+        self.assertEqual(self.write(dut, 21, now=5), None)    # rate capped
+        self.assertEqual(self.write(dut, 21, now=10), 21)     # written later
+        self.assertEqual(self.write(dut, 21, now=69), None)   # unchanged
+        self.assertEqual(self.write(dut, 21, now=70), 21)     # refresh
+        self.assertDictEqual(dut.stats, {'written': 3, 'skipped': 2, 'deadband': 1, 'rate': 1})
+        # reset
+        dut.reset()
+        self.assertEqual(self.write(dut, 21, now=71), 21)
+    #*****************************
+
+
+    #*****************************
+    def test_force(self):
+        """
+        @note   forced write and failed write
+        """
+        dut = writePolicy(resolution=0.1, deadband=1, minInterval=3600)
+        self.assertEqual(self.write(dut, 27, now=0), 27)
+        self.assertEqual(self.write(dut, 20, now=1), None)              # rate capped
+        self.assertEqual(self.write(dut, 20, now=1, force=True), 20)    # shutdown
+        self.assertEqual(self.write(dut, 20.5, now=2, force=True), 20.5)    # deadband
+        # failed write is not committed, retried with next call
+        dut = writePolicy(resolution=0.1)
+        self.assertEqual(dut.check(30, now=0), 30)
+        self.assertEqual(self.write(dut, 30, now=1), 30)
+        self.assertEqual(self.write(dut, 30, now=2), None)
+        self.assertDictEqual(dut.stats, {'written': 1, 'skipped': 1, 'deadband': 1, 'rate': 0})
+        # clock rebound after write, f.e. monotonic clock to virtual clock
+        dut = writePolicy(resolution=0.1, minInterval=60)
+        self.assertEqual(self.write(dut, 27, now=1e6), 27)
+        self.assertEqual(self.write(dut, 28, now=10), 28)
+        self.assertEqual(self.write(dut, 29, now=20), None)             # rate capped on new clock
+    #*****************************
+
+
+    #*****************************
+    def test_slow_wave(self):
+        """
+        @note   one day sine from 20C to 30C, only chamber visible changes
+                are written
+        """
+        wave = waves()
+        wave.set(wave="sine", ts=1, tp=86400, lowVal=20, highVal=30)
+        dut = writePolicy(resolution=0.1)
+        for i in range(86400):
+            self.write(dut, wave.next()['val'], now=i)
+        self.assertLess(dut.stats['written'], 86400 / 200)
+        self.assertEqual(dut.stats['written'] + dut.stats['skipped'], 86400)
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+#------------------------------------------------------------------------------
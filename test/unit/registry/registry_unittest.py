@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          registry_unittest.py
+@date:          2026-10-19
+
+@note           Unittest for registry.py
+                  run ./test/unit/registry/registry_unittest.py
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Standard
+import sys          # python path handling
+import os           # platform independent paths
+import unittest     # performs test
+import tempfile     # plugin directory
+import subprocess   # clean interpreter for import checks
+# Self
+projRoot = os.path.abspath((os.path.dirname(os.path.abspath(__file__)) + "/../../../"))
+sys.path.append(projRoot)                                                                     # add project root to lib search path
+os.environ["ATWG_CACHE_DIR"] = ""                                                             # no config disk cache in user home
+from ATWG.driver.registry import driverRegistry, DRV_PLUGIN_ENV                               # Python Script under test
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class TestRegistry(unittest.TestCase):
+
+    #*****************************
+    def run_python(self, code, env=None):
+        """
+        @note   runs code in fresh interpreter, returns stdout/stderr
+        """
+        res = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=projRoot, env=env, capture_output=True, text=True)
+        self.assertEqual(res.returncode, 0, res.stderr)
+        return res.stdout, res.stderr
+    #*****************************
+
+
+    #*****************************
+    def test_builtin(self):
+        """
+        @note   builtin drivers w/o discovery, case insensitive
+        """
+        dut = driverRegistry()
+        self.assertEqual(dut.names(discover=False), ["SIM", "ESPEC_SH641"])
+        self.assertEqual(dut.load("sim").__name__, "simChamber")
+        self.assertIs(dut.load("SIM"), dut.load("Sim"))
+        self.assertFalse(dut.discovered)
+        with self.assertRaises(ValueError) as cm:
+            dut.create("unknown")
+        self.assertEqual(str(cm.exception), "Unsupported climate chmaber 'unknown' selected")
+        self.assertTrue(dut.discovered)
+    #*****************************
+
+
+    #*****************************
+    def test_plugin(self):
+        """
+        @note   driver from plugin directory, imported on selection
+        """
+        with tempfile.TemporaryDirectory() as tmpDir:
+            with open(os.path.join(tmpDir, "MY_CHAMBER.py"), "w") as fh:
+                fh.write("class myChamber:\n    pass\nATWG_DRIVER = myChamber\n")
+            with open(os.path.join(tmpDir, "broken.py"), "w") as fh:
+                fh.write("raise ImportError('not imported until selected')\n")
+            os.environ[DRV_PLUGIN_ENV] = tmpDir
+            self.addCleanup(os.environ.pop, DRV_PLUGIN_ENV)
+            dut = driverRegistry()
+            self.assertEqual(dut.names(), ["SIM", "ESPEC_SH641", "MY_CHAMBER", "broken"])
+            self.assertEqual(type(dut.create("my_chamber")).__name__, "myChamber")
+            with self.assertRaises(ImportError):
+                dut.load("broken")
+        # registered class
+        dut = driverRegistry()
+        dut.register("SIM", dict)
+        self.assertIs(dut.load("SIM"), dict)
+    #*****************************
+
+
+    #*****************************
+    def test_import_budget(self):
+        """
+        @note   CLI start w/ SIM chamber pulls neither serial/yaml nor
+                entry point metadata, import time is bounded
+        """
+        code = ("import sys, time\n"
+                "tstart = time.perf_counter()\n"
+                "from ATWG.ATWG import ATWG\n"
+                "from ATWG.runner.virtualRun import virtualRun\n"
+                "from ATWG.telemetry.trace import traceWriter\n"
+                "print(time.perf_counter() - tstart)\n"
+                "atwg = ATWG()\n"
+                "chamberArg, waveArg = atwg.parse_cli(['--sine', '--chamber=SIM', '--minTemp=10', '--maxTemp=60'])\n"
+                "atwg.open(chamberArg=chamberArg, waveArg=waveArg)\n"
+                "print(' '.join(mod for mod in ('serial', 'yaml', 'importlib.metadata') if mod in sys.modules))\n")
+        stdout, stderr = self.run_python(code)
+        tload, heavy = (stdout.splitlines() + [""])[:2]
+        self.assertEqual(heavy, "")
+        self.assertLess(float(tload), 0.5)  # generous for slow CI runners
+        # ATWG own modules, '-X importtime' line: 'import time: self [us] | cumulative | module'
+        own = 0
+        for line in stderr.splitlines():
+            fields = line.split("|")
+            if ( (3 == len(fields)) and fields[2].strip().startswith("ATWG") ):
+                own += int(fields[0].split(":")[1])
+        self.assertLess(own, 200e3)
+        # 'atwg-cli' itself, optional features import only if required
+        code = ("import sys, runpy\n"
+                "sys.argv = ['atwg-cli', '--sine', '--chamber=SIM', '--minTemp=10', '--maxTemp=60', '--period=1h', '--fastForward=10m']\n"
+                "try:\n"
+                "    runpy.run_path('atwg-cli', run_name='__main__')\n"
+                "except SystemExit:\n"
+                "    pass\n"
+                "print(' '.join(mod for mod in ('serial', 'yaml', 'importlib.metadata', 'asyncio', 'multiprocessing', 'ATWG.runner.rtRun', 'ATWG.telemetry.apiServer', 'ATWG.telemetry.shm', 'ATWG.telemetry.archive', 'ATWG.analysis.rainflow', 'ATWG.analysis.thermalDose') if mod in sys.modules))\n")
+        stdout, stderr = self.run_python(code)
+        self.assertEqual(stdout.splitlines()[-1], "")
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+#------------------------------------------------------------------------------
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          monteCarlo_unittest.py
+@date:          2026-10-19
+
+@note           Unittest for monteCarlo.py
+                  run ./test/unit/runner/monteCarlo_unittest.py
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Standard
+import sys        # python path handling
+import os         # platform independent paths
+import unittest   # performs test
+# Self
+sys.path.append(os.path.abspath((os.path.dirname(os.path.abspath(__file__)) + "/../../../"))) # add project root to lib search path
+from ATWG.runner.monteCarlo import monteCarlo                                                 # Python Script under test
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class TestMonteCarlo(unittest.TestCase):
+
+    #*****************************
+    def setUp(self):
+        """
+        @note   six hour sine, chamber time constant varied
+        """
+        self.args = {
+            'waveArgs': {'wave': "sine", 'ts': 10, 'tp': 6*3600, 'lowVal': -10, 'highVal': 30},
+            'duration': 6*3600,
+            'model': {'order': 1},
+            'vary': {'tau': (60, 600)},
+            'runs': 4,
+            'seed': 1,
+        }
+    #*****************************
+
+
+    #*****************************
+    def test_init(self):
+        """
+        @note   unknown model parameter
+        """
+        with self.assertRaises(ValueError) as cm:
+            monteCarlo(**dict(self.args, vary={'foo': (0, 1)}))
+        self.assertEqual(str(cm.exception), "Unknown model argument 'foo'")
+    #*****************************
+
+
+    #*****************************
+    def test_jobs(self):
+        """
+        @note   parameter draws are reproducible by seed
+        """
+        dut = monteCarlo(**self.args)
+        jobs = dut.jobs()
+        self.assertEqual(len(jobs), 4)
+        self.assertEqual(jobs, monteCarlo(**self.args).jobs())
+        for model, jitter, settle, seed in jobs:
+            self.assertTrue(60 <= model['tau'] <= 600)
+            self.assertEqual(model['order'], 1)
+            self.assertEqual(jitter, 0)
+        self.assertNotEqual(jobs, monteCarlo(**dict(self.args, seed=2)).jobs())
+    #*****************************
+
+
+    #*****************************
+    def test_run(self):
+        """
+        @note   pool and in process runs are equal, error grows w/ time constant
+        """
+        dut = monteCarlo(**self.args)
+        pool = dut.run(workers=2)
+        local = dut.run(workers=0)
+        self.assertEqual(pool['runs'], local['runs'])
+        # slower chamber tracks worse
+        runs = sorted(pool['runs'], key=lambda res: res['model']['tau'])
+        self.assertLess(runs[0]['rms'], runs[-1]['rms'])
+        # statistics
+        stats = pool['stats']
+        self.assertEqual(stats['rms']['min'], runs[0]['rms'])
+        self.assertEqual(stats['rms']['max'], runs[-1]['rms'])
+        self.assertTrue(stats['rms']['min'] <= stats['rms']['mean'] <= stats['rms']['max'])
+        self.assertTrue(stats['max']['p50'] <= stats['max']['p95'])
+    #*****************************
+
+
+    #*****************************
+    def test_jitter(self):
+        """
+        @note   tick jitter is applied
+        """
+        dut = monteCarlo(**dict(self.args, model={'order': 1, 'tau': 300}, vary={}, jitter=(0.5, 1), runs=2))
+        res = dut.run(workers=0)
+        self.assertTrue(0.5 <= res['runs'][0]['jitter'] <= 1)
+        self.assertNotEqual(res['runs'][0]['rms'], res['runs'][1]['rms'])
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+#------------------------------------------------------------------------------
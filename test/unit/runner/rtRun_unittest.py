@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          rtRun_unittest.py
+@date:          2026-10-19
+
+@note           Unittest for rtRun.py
+                  run ./test/unit/runner/rtRun_unittest.py
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Standard
+import sys        # python path handling
+import os         # platform independent paths
+import unittest   # performs test
+import math       # isnan
+import tempfile   # trace file
+import io         # captured UI output
+import signal     # restore CTRL + C handler
+import threading  # stop event of in process UI
+from contextlib import redirect_stdout  # captured UI output
+# Self
+sys.path.append(os.path.abspath((os.path.dirname(os.path.abspath(__file__)) + "/../../../"))) # add project root to lib search path
+from ATWG.runner.rtRun import rtRun, rt_setup, jitterStats, uiProcess, ui_main                # Python Script under test
+from ATWG.runner.virtualRun import virtualClock                                               # deterministic clock
+from ATWG.telemetry.shm import shmWriter                                                      # UI feed
+from ATWG.telemetry.trace import traceReader                                                  # UI trace
+from ATWG.ATWG import ATWG                                                                    # generator
+from ATWG.analysis.rainflow import rainflow                                                   # reference cycles
+from ATWG.analysis.thermalDose import thermalDose                                             # reference dose
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class TestRtRun(unittest.TestCase):
+
+    #*****************************
+    def open(self, cli=[]):
+        """
+        @note   opened ATWG on SIM chamber
+        """
+        atwg = ATWG()
+        chamberArg, waveArg = atwg.parse_cli(["--sine", "--chamber=SIM", "--minTemp=10", "--maxTemp=60", "--period=1h"] + cli)
+        atwg.open(chamberArg=chamberArg, waveArg=waveArg)
+        return atwg
+    #*****************************
+
+
+    #*****************************
+    def test_jitter(self):
+        """
+        @note   histogram percentiles
+        """
+        dut = jitterStats()
+        self.assertTrue(math.isnan(dut.stats()['p50']))
+        for i in range(98):
+            dut.add(10e-6)
+        dut.add(-1)     # early
+        dut.add(0.5)    # overflow bin
+        stats = dut.stats()
+        self.assertEqual(stats['num'], 100)
+        self.assertAlmostEqual(stats['p50'], 11e-6)
+        self.assertAlmostEqual(stats['p99'], 11e-6)
+        self.assertEqual(dut.percentile(100), 0.5)
+        self.assertEqual(stats['max'], 0.5)
+    #*****************************
+
+
+    #*****************************
+    def test_run(self):
+        """
+        @note   late wakes are measured, API stop ends run
+        """
+        atwg = self.open()
+        clock = virtualClock()
+        dut = rtRun(atwg, clock=clock.now, sleep=lambda sec: clock.sleep(sec + 0.002))  # every wake 2ms late
+        atwg.start()
+        rendered = []
+        stats = dut.run(duration=100, render=lambda: rendered.append(atwg.status()))
+        self.assertEqual(stats['wakes'], 100)
+        self.assertEqual(len(rendered), 100)
+        self.assertAlmostEqual(stats['jitter']['p50'], 0.002)
+        self.assertAlmostEqual(stats['jitter']['max'], 0.002)
+        atwg.commands.append("stop")
+        stats = dut.run(duration=100)
+        self.assertEqual(stats['wakes'], 101)
+    #*****************************
+
+
+    #*****************************
+    def test_rt_setup(self):
+        """
+        @note   granted and refused requests
+        """
+        self.assertDictEqual(rt_setup(), {'affinity': None, 'fifo': None, 'errors': []})
+        if ( hasattr(os, 'sched_getaffinity') ):
+            cpus = sorted(os.sched_getaffinity(0))
+            self.assertEqual(rt_setup(cpus=cpus)['affinity'], cpus)
+        res = rt_setup(priority=100)    # out of range
+        self.assertIsNone(res['fifo'])
+        self.assertEqual(1, len(res['errors']))
+        self.assertEqual(self.open(["--split", "--cpu=2,3", "--fifo=50"]).cfg_cpus, [2, 3])
+    #*****************************
+
+
+    #*****************************
+    def test_ui(self):
+        """
+        @note   UI process writes trace from shared memory
+        """
+        atwg = self.open(["--split"])
+        self.assertTrue(atwg.cfg_split)
+        atwg.cfg_tsample_sec = 0.01
+        atwg.export = shmWriter("atwg_ut_" + str(os.getpid()))
+        with tempfile.TemporaryDirectory() as tmpDir:
+            traceFile = os.path.join(tmpDir, "run.csv")
+            dut = uiProcess(atwg, atwg.export.shm.name, period=0.1, traceFile=traceFile, render=False)
+            dut.start()
+            atwg.start()
+            stats = rtRun(atwg).run(duration=0.5)
+            self.assertEqual(dut.stop(), 0)
+            rows = list(traceReader(traceFile).rows())
+            self.assertEqual(len(rows), stats['meas'])
+        atwg.export.close()
+    #*****************************
+
+
+    #*****************************
+    def test_ui_analysis(self):
+        """
+        @note   split mode counts cycles and dose only in UI process
+        """
+        atwg = self.open(["--split", "--rainflow=1C", "--dose=ea=0.7,tref=25C"])
+        info = atwg.chamber.info()
+        rainflowArgs = {'binWidth': atwg.cfg_rainflow, 'hysteresis': 10**-info['fracs']['temperature']}
+        refCycles = rainflow(**rainflowArgs)
+        refDose = thermalDose(**atwg.cfg_dose)
+        writer = shmWriter("atwg_ut_" + str(os.getpid()))
+        for i in range(600):
+            tmeas = round(35 + 25*math.sin(2*math.pi*i/120), 1)
+            writer.write(float(i), tmeas, tmeas, float('nan'), 0.0)
+            refCycles.add(tmeas)
+            refDose.add(float(i), tmeas)
+        stop = threading.Event()
+        stop.set()  # single update
+        handler = signal.getsignal(signal.SIGINT)
+        out = io.StringIO()
+        try:
+            with redirect_stdout(out):
+                ui_main(writer.shm.name, info, dict(atwg.wave.waveArgs), 0, None, stop, render=False, doseArgs=atwg.cfg_dose, rainflowArgs=rainflowArgs)
+        finally:
+            signal.signal(signal.SIGINT, handler)
+            writer.close()
+        self.assertEqual(out.getvalue().strip(), atwg.analysis_text(cycles=refCycles, dose=refDose))
+        self.assertIn("Info: Rainflow 5.5 cycles", out.getvalue())
+        self.assertEqual(atwg.analysis_text(), "")
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+#------------------------------------------------------------------------------
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          soakRun_unittest.py
+@date:          2026-10-19
+
+@note           Unittest for soakRun.py
+                  run ./test/unit/runner/soakRun_unittest.py
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Standard
+import sys        # python path handling
+import os         # platform independent paths
+import unittest   # performs test
+# Self
+sys.path.append(os.path.abspath((os.path.dirname(os.path.abspath(__file__)) + "/../../../"))) # add project root to lib search path
+os.environ["ATWG_CACHE_DIR"] = ""                                                             # no config disk cache in user home
+from ATWG.runner.soakRun import soakRun, rss                                                  # Python Script under test
+from ATWG.ATWG import ATWG                                                                    # generator
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class TestSoakRun(unittest.TestCase):
+
+    #*****************************
+    def open(self):
+        """
+        @note   started ATWG on SIM chamber
+        """
+        atwg = ATWG()
+        chamberArg, waveArg = atwg.parse_cli(["--sine", "--chamber=SIM", "--minTemp=10", "--maxTemp=60", "--period=1h", "--simModel=order=1,tau=5m"])
+        atwg.open(chamberArg=chamberArg, waveArg=waveArg)
+        return atwg
+    #*****************************
+
+
+    #*****************************
+    def test_soak(self):
+        """
+        @note   steady run passes
+        """
+        atwg = self.open()
+        dut = soakRun(atwg, status=True, traceMalloc=True)
+        atwg.start()
+        res = dut.soak(ticks=6000, windows=3)
+        self.assertListEqual(res['failures'], [])
+        self.assertEqual(len(res['windows']), 3)
+        self.assertEqual(res['windows'][-1]['sim_sec'], 6000)
+        for win in res['windows']:
+            self.assertTrue(0 < win['p50'] <= win['p99'] <= win['max'])
+            self.assertLess(0, win['traced'])
+        self.assertLess(0, rss())
+        with self.assertRaises(ValueError) as cm:
+            dut.soak(ticks=10, windows=2)
+        self.assertEqual(str(cm.exception), "Soak needs at least three windows")
+    #*****************************
+
+
+    #*****************************
+    def test_leak(self):
+        """
+        @note   growing status history is detected
+        """
+        atwg = self.open()
+        history = []
+        status = atwg.status
+        atwg.status = lambda: history.append([status()])
+        dut = soakRun(atwg, status=True, traceMalloc=True)
+        atwg.start()
+        res = dut.soak(ticks=6000, windows=3)
+        self.assertEqual(len(res['failures']), 2)
+        self.assertTrue(res['failures'][0].startswith("traced grew by"))
+        self.assertTrue(res['failures'][1].startswith("objects grew by"))
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+#------------------------------------------------------------------------------
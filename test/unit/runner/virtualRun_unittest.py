@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          virtualRun_unittest.py
+@date:          2026-10-19
+
+@note           Unittest for virtualRun.py
+                  run ./test/unit/runner/virtualRun_unittest.py
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Standard
+import sys        # python path handling
+import os         # platform independent paths
+import unittest   # performs test
+import tempfile   # trace file
+# Self
+sys.path.append(os.path.abspath((os.path.dirname(os.path.abspath(__file__)) + "/../../../"))) # add project root to lib search path
+os.environ["ATWG_CACHE_DIR"] = ""                                                             # no config disk cache in user home
+from ATWG.runner.virtualRun import virtualClock, virtualRun                                   # Python Script under test
+from ATWG.ATWG import ATWG                                                                    # generator
+from ATWG.telemetry.trace import traceWriter, traceReader                                     # telemetry
+from ATWG.driver.espec.sh641 import especShSu                                                 # real chamber
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class TestVirtualRun(unittest.TestCase):
+
+    #*****************************
+    def test_clock(self):
+        """
+        @note   time only advances with sleep
+        """
+        dut = virtualClock(start=10)
+        self.assertEqual(dut.now(), 10)
+        dut.sleep(5.5)
+        dut.sleep(-1)
+        self.assertEqual(dut.now(), 15.5)
+    #*****************************
+
+
+    #*****************************
+    def test_run(self):
+        """
+        @note   one day trapezoid w/ rate capped chamber writes and trace
+        """
+        with tempfile.TemporaryDirectory() as tmpDir:
+            traceFile = os.path.join(tmpDir, "run.csv")
+            # prepare
+            atwg = ATWG()
+            chamberArg, waveArg = atwg.parse_cli(["--trapezoid", "--minTemp=-10", "--maxTemp=30", "--period=1d", "--riseTime=2h", "--fallTime=2h", "--writeInterval=1m", "--measPeriod=10s"])
+            waveArg['dutyCycle'] = 0.5
+            atwg.open(chamberArg=chamberArg, waveArg=waveArg)
+            atwg.trace = traceWriter(traceFile)
+            dut = virtualRun(atwg)
+            # run
+            atwg.start()
+            stats = dut.run(86400)
+            atwg.trace.close()
+            # check
+            self.assertEqual(dut.clock.now(), 86400)
+            self.assertEqual(stats['meas'], 8640)
+            self.assertEqual(stats['set'], 86400)
+            self.assertLessEqual(atwg.chamber.policy.stats['written'], 1440 + 1)    # start + one per minute
+            rows = list(traceReader(traceFile).rows())
+            self.assertEqual(len(rows), 8640)
+            self.assertEqual(rows[1][0], 10)
+            self.assertEqual(rows[-1][0], 86390)
+    #*****************************
+
+
+    #*****************************
+    def test_hardware(self):
+        """
+        @note   real chamber is rejected
+        """
+        atwg = ATWG()
+        chamberArg, waveArg = atwg.parse_cli(["--sine", "--minTemp=20", "--maxTemp=30", "--chamber=ESPEC_SH641", "--fastForward=30d"])
+        with self.assertRaises(ValueError) as cm:
+            atwg.open(chamberArg=chamberArg, waveArg=waveArg)
+        self.assertEqual(str(cm.exception), "Fast forward needs simulated chamber, 'ESPEC_SH641' has no model time")
+        atwg.chamber = especShSu()      # f.e. opened by caller
+        with self.assertRaises(ValueError) as cm:
+            virtualRun(atwg)
+        self.assertEqual(str(cm.exception), "Virtual clock needs simulated chamber, 'especShSu' has no model time")
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+#------------------------------------------------------------------------------
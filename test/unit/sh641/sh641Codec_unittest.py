@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          sh641Codec_unittest.py
+@date:          2026-10-19
+
+@note           Unittest for sh641Codec.py
+                  run ./test/unit/sh641/sh641Codec_unittest.py
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Standard
+import sys        # python path handling
+import os         # platform independent paths
+import unittest   # performs test
+import math       # isnan
+import random     # fuzz corpus
+import yaml       # dialog file
+# Self
+sys.path.append(os.path.abspath((os.path.dirname(os.path.abspath(__file__)) + "/../../../"))) # add project root to lib search path
+os.environ["ATWG_CACHE_DIR"] = ""                                                             # no config disk cache in user home
+from ATWG.driver.espec.sh641Codec import sh641Codec, measRec, ackRec                          # Python Script under test
+from ATWG.driver.espec.sh641Const import *                                                    # climate chamber defintions
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class TestSh641Codec(unittest.TestCase):
+
+    #*****************************
+    # common const
+    simFile = os.path.dirname(os.path.abspath(__file__)) + os.path.sep + "sh641_dialog.yml"
+    #*****************************
+
+
+    #*****************************
+    def corpus(self, num=2000, seed=0):
+        """
+        @note   builds fuzz corpus from the dialog file responses and the
+                acknowledges of all set commands
+        """
+        # seeds from dialog file
+        with open(TestSh641Codec.simFile, 'r') as fH:
+            dialog = yaml.load(fH, Loader=yaml.FullLoader)
+        seeds = [str(rsp).encode() for rsp in dialog['req'].values()]
+        for cmd in (CMD_SET_TEMP+"25", CMD_SET_PWR+PWR_ON, CMD_SET_MODE+MODE_STANDBY):
+            seeds.append((RSP_OK + ":" + cmd).encode())
+            seeds.append((RSP_FAIL + ":" + cmd).encode())
+        # mutate
+        rnd = random.Random(seed)
+        alphabet = b"0123456789+-., :ABCDEFGHIJKLMNOPQRSTUVWXYZ\r\n\x00\xff"
+        corpus = list(seeds)
+        while ( len(corpus) < num ):
+            frame = bytearray(rnd.choice(seeds))
+            for i in range(rnd.randint(1, 4)):
+                op = rnd.randint(0, 2)
+                pos = rnd.randint(0, len(frame))
+                if ( 0 == op ):     # insert
+                    frame[pos:pos] = bytes([rnd.choice(alphabet)])
+                elif ( 1 == op ):   # delete
+                    del frame[pos:pos+1]
+                else:               # replace
+                    frame[pos:pos+1] = bytes([rnd.choice(alphabet)])
+            corpus.append(bytes(frame))
+        return corpus
+    #*****************************
+
+
+    #*****************************
+    def test_decode_meas(self):
+        """
+        @note   checks decoding of measurement frames
+        """
+        dut = sh641Codec()
+        self.assertEqual(dut.decode(b"26.4,0.0,140.0,-50.0"), measRec(26.4, 0.0, 140, -50))
+        self.assertEqual(dut.decode(b" -5.0, +6.0,.5,7.\r\n"), measRec(-5.0, 6.0, 0.5, 7))
+        # non numeric fields are nan
+        rsp = dut.decode(b"25,OFF,100")
+        self.assertEqual(rsp.measured, 25)
+        self.assertEqual(rsp.upalarm, 100)
+        self.assertTrue(math.isnan(rsp.setpoint))
+        self.assertTrue(math.isnan(rsp.lowalarm))
+        # too many fields
+        with self.assertRaises(ValueError) as cm:
+            dut.decode(b"1,2,3,4,5")
+        self.assertEqual(str(cm.exception), "Unrecognized response in '1,2,3,4,5'")
+    #*****************************
+
+
+    #*****************************
+    def test_decode_ack(self):
+        """
+        @note   checks decoding of acknowledge frames
+        """
+        dut = sh641Codec()
+        self.assertEqual(dut.decode(b"OK:TEMP,S25"), ackRec("OK", "TEMP", b"S25"))
+        self.assertEqual(dut.decode(b"NA:POWER,ON\r\n"), ackRec("NA", "POWER", b"ON"))
+        self.assertEqual(dut.decode(b"OK:FOO,1,2"), ackRec("OK", "FOO", b"1,2"))
+        # empty frame
+        with self.assertRaises(ValueError) as cm:
+            dut.decode(b"")
+        self.assertEqual(str(cm.exception), "Empty message to parse provided")
+    #*****************************
+
+
+    #*****************************
+    def test_fuzz(self):
+        """
+        @note   decodes mutated dialog frames, only records or ValueError
+                are allowed as result
+        """
+        dut = sh641Codec()
+        for frame in self.corpus():
+            try:
+                rsp = dut.decode(frame)
+            except ValueError:
+                continue
+            if ( isinstance(rsp, measRec) ):
+                for val in rsp:
+                    self.assertIsInstance(val, float)
+            else:
+                self.assertIsInstance(rsp, ackRec)
+                self.assertIsInstance(rsp.state, str)
+                self.assertIsInstance(rsp.parm, str)
+                self.assertIsInstance(rsp.val, bytes)
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+#------------------------------------------------------------------------------
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          sh641Emu_unittest.py
+@date:          2026-10-19
+
+@note           Unittest for sh641Emu.py, driver end-to-end via pty
+                  run ./test/unit/sh641/sh641Emu_unittest.py
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Standard
+import sys        # python path handling
+import os         # platform independent paths
+import unittest   # performs test
+import time       # latency check
+# Self
+sys.path.append(os.path.abspath((os.path.dirname(os.path.abspath(__file__)) + "/../../../"))) # add project root to lib search path
+os.environ["ATWG_CACHE_DIR"] = ""                                                             # no config disk cache in user home
+from ATWG.driver.espec.sh641Emu import sh641Emu                                               # Python Script under test
+from ATWG.driver.espec.sh641 import especShSu                                                 # driver
+from ATWG.driver.espec.sh641Const import *                                                    # climate chamber defintions
+from ATWG.waves.waves import waves                                                            # program source
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+@unittest.skipUnless("posix" == os.name, "requires pseudo terminals")
+class TestSh641Emu(unittest.TestCase):
+
+    #*****************************
+    def open(self, **kwargs):
+        """
+        @note   starts emulator and connects driver
+        """
+        emu = sh641Emu(baudrate=0, **kwargs)
+        self.addCleanup(emu.close)
+        dut = especShSu()
+        self.assertTrue(dut.open(port=emu.open(), timeout=0.2))  # fast timeout for fault injection
+        self.addCleanup(dut.close)
+        return emu, dut
+    #*****************************
+
+
+    #*****************************
+    def test_dialog(self):
+        """
+        @note   driver talks to emulator via pyserial
+        """
+        emu, dut = self.open()
+        self.assertDictEqual(dut.get_clima(), {'temperature': 20.0, 'humidity': 25})
+        self.assertTrue(dut.start(temperature=35.21))
+        self.assertEqual(emu.setTemp, 35.2)
+        self.assertEqual(emu.power, PWR_ON)
+        self.assertEqual(emu.mode, MODE_CONSTANT)
+        self.assertTrue(dut.stop())
+        self.assertEqual(emu.power, PWR_OFF)
+        self.assertEqual(emu.mode, MODE_STANDBY)
+        self.assertEqual(emu.stats['requests'], 8)
+    #*****************************
+
+
+    #*****************************
+    def test_latency(self):
+        """
+        @note   response latency and baud rate delay
+        """
+        emu, dut = self.open(latency=0.05)
+        tstart = time.monotonic()
+        dut.get_clima()
+        self.assertGreaterEqual(time.monotonic() - tstart, 0.1)
+        emu.latency = 0
+        emu.baudrate = 300  # 23 chars: ~77ms
+        dut.com.timeout = 1
+        tstart = time.monotonic()
+        dut.write(CMD_GET_TEMP)
+        dut.read()
+        self.assertGreaterEqual(time.monotonic() - tstart, 0.07)
+    #*****************************
+
+
+    #*****************************
+    def test_faults(self):
+        """
+        @note   injected faults are reported by the driver
+        """
+        emu, dut = self.open(seed=0)
+        # response timeout
+        emu.faults['drop'] = 1.0
+        with self.assertRaises(ValueError):
+            dut.get_clima()
+        self.assertEqual(emu.stats['drop'], 1)
+        # chamber rejects set command
+        emu.faults['drop'] = 0.0
+        emu.faults['reject'] = 1.0
+        with self.assertRaises(ValueError) as cm:
+            dut.set_power(pwr=PWR_ON)
+        self.assertEqual(str(cm.exception), "Failed to set new power state")
+        # corrupted set point acknowledge
+        emu.faults['reject'] = 0.0
+        emu.faults['garble'] = 1.0
+        with self.assertRaises(ValueError):
+            for i in range(10):
+                dut.set_clima(clima={'temperature': 20+i})
+        self.assertLess(0, emu.stats['garble'])
+    #*****************************
+
+
+    #*****************************
+    def test_program(self):
+        """
+        @note   offloaded trapezoid runs in chamber, 1h chamber time per second
+        """
+        emu, dut = self.open(speed=3600)
+        dut.com.timeout = 1
+        wave = waves()
+        wave.set(wave="trapezoid", ts=1, tp=6*3600, lowVal=20, highVal=80, tr=3600, tf=3600, dutyCycle=0.75)
+        program = dut.compile_program(wave, repeat=1)
+        self.assertTrue(dut.upload_program(program))
+        self.assertEqual(emu.programs[1]['steps'], [{'temp': step['temp'], 'time': 60*step['time'], 'ramp': step['ramp']} for step in program['steps']])
+        self.assertEqual(emu.programs[1]['loop'], (1, 4))
+        # not started
+        with self.assertRaises(ValueError):
+            dut.get_program()
+        # run
+        self.assertTrue(dut.start(temperature=20))
+        self.assertTrue(dut.run_program())
+        time.sleep(0.5)     # half way of rise
+        mon = dut.get_program()
+        self.assertEqual(mon['pgm'], 1)
+        self.assertEqual(mon['step'], 1)
+        self.assertEqual(mon['count'], 1)
+        self.assertAlmostEqual(emu.setTemp, 50, delta=10)
+        # host sends no set points, chamber follows program
+        requests = emu.stats['requests']
+        time.sleep(1)
+        self.assertEqual(emu.stats['requests'], requests)
+        self.assertEqual(dut.get_program()['step'], 2)
+        self.assertEqual(emu.setTemp, 80)
+        # stop ends program
+        self.assertTrue(dut.stop())
+        self.assertIsNone(emu.prgm)
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+#------------------------------------------------------------------------------
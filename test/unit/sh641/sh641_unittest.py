@@ -24,8 +24,10 @@ import os         # platform independent paths
 import unittest   # performs test
 # Self
 sys.path.append(os.path.abspath((os.path.dirname(os.path.abspath(__file__)) + "/../../../"))) # add project root to lib search path   
+os.environ["ATWG_CACHE_DIR"] = ""                                                             # no config disk cache in user home
 from ATWG.driver.espec.sh641 import especShSu                                                 # Python Script under test
 from ATWG.driver.espec.sh641Const import *                                                    # climate chamber defintions
+from ATWG.waves.waves import waves                                                            # program source
 #------------------------------------------------------------------------------
 
 
@@ -155,6 +157,92 @@ class TestSh641(unittest.TestCase):
     #*****************************
     
     
+    #*****************************
+    def test_compile_program(self):
+        """
+        @note:  compiles trapezoid and ramp list into program steps
+        """
+        dut = especShSu()
+        wave = waves()
+        # trapezoid, starts in rise
+        wave.set(wave="trapezoid", ts=1, tp=3600, lowVal=-10, highVal=30, tr=600, tf=1200, dutyCycle=0.5, initVal=10)
+        program = dut.compile_program(wave, repeat=3)
+        self.assertListEqual(program['steps'], [
+            {'temp': 30.0, 'time': 5, 'ramp': True}, {'temp': 30, 'time': 15, 'ramp': True}, {'temp': -10.0, 'time': 20, 'ramp': True}, {'temp': -10, 'time': 15, 'ramp': True},
+            {'temp': 30.0, 'time': 10, 'ramp': True}, {'temp': 30, 'time': 15, 'ramp': True}, {'temp': -10.0, 'time': 20, 'ramp': True}, {'temp': -10, 'time': 15, 'ramp': True},
+        ])
+        self.assertEqual(program['loop'], (5, 8))
+        self.assertEqual(program['repeat'], 3)
+        # brick wall
+        wave.set(wave="trapezoid", ts=1, tp=7200, lowVal=-10, highVal=30, dutyCycle=0.25)
+        program = dut.compile_program(wave)
+        self.assertListEqual(program['steps'], [{'temp': 30, 'time': 30, 'ramp': True}, {'temp': -10, 'time': 90, 'ramp': False}])
+        self.assertEqual(program['loop'], (1, 2))
+        # ramp list, rounding carried over, long step split
+        program = dut.compile_program([(20, 20, 80), (20, 50.04, 60), (50.04, 50.04, 7000*60)])
+        self.assertListEqual(program['steps'], [{'temp': 20, 'time': 1, 'ramp': True}, {'temp': 50.0, 'time': 1, 'ramp': True}, {'temp': 50.0, 'time': 3500, 'ramp': True}, {'temp': 50.0, 'time': 3500, 'ramp': True}])
+        self.assertIsNone(program['loop'])
+        # exceptions
+        with self.assertRaises(ValueError) as cm:
+            dut.compile_program([(20, 30, 60), (40, 50, 60)])
+        self.assertEqual(str(cm.exception), "Discontinuous ramp from 30 to 40 not supported by program")
+        with self.assertRaises(ValueError) as cm:
+            dut.compile_program([(20, 200, 60)])
+        self.assertEqual(str(cm.exception), "Program temperature 200.0 outside of chamber ratings")
+        with self.assertRaises(ValueError) as cm:
+            dut.compile_program([(20, 20, 60)] * 100)
+        self.assertEqual(str(cm.exception), "Program needs 100 steps, chamber supports 99")
+        # sine, compressed to chamber resolution
+        wave.set(wave="sine", ts=1, tp=3600, lowVal=-10, highVal=30)
+        program = dut.compile_program(wave)
+        self.assertEqual(sum(step['time'] for step in program['steps']), 60)
+        self.assertLess(len(program['steps']), 50)
+    #*****************************
+
+
+    #*****************************
+    def test_program_error(self):
+        """
+        @note:  uploaded sine program follows waveform within chamber
+                resolution at every second, also from mid period
+        """
+        dut = especShSu()
+        wave = waves()
+        for lowVal, highVal, pos, shift in ((20, 30, 0, 0), (-10, 30, 1234, 26), (10, 60, 1000, 20)):
+            wave.set(wave="sine", ts=1, tp=3600, lowVal=lowVal, highVal=highVal)
+            wave.iterator = pos
+            program = dut.compile_program(wave)
+            # program as played by controller, starts on minute grid to period end
+            times, temps = [0], [program['start']]
+            for step in program['steps']:
+                times.append(times[-1] + 60*step['time'])
+                temps.append(step['temp'])
+            self.assertEqual(times[-1], (3600 - pos - shift) % 3600 + 3600)
+            i = 0
+            for t in range(times[-1] + 1):
+                while ( times[i+1] < t ):
+                    i += 1
+                val = temps[i] + (temps[i+1] - temps[i]) * (t - times[i]) / (times[i+1] - times[i])
+                self.assertLessEqual(abs(val - wave.sample(pos + shift + t)), dut.policy.cfg['resolution'] + 1e-9)
+    #*****************************
+
+
+    #*****************************
+    def test_program(self):
+        """
+        @note:  program upload, start and monitor
+        """
+        dut = especShSu()
+        self.assertTrue(dut.open(simFile=TestSh641.simFile))    # open dialog file
+        self.assertTrue(dut.upload_program(dut.compile_program([(20, 30, 600)]), pgm=2))
+        self.assertTrue(dut.run_program(pgm=2))
+        self.assertDictEqual(dut.get_program(), {'pgm': 1, 'step': 3, 'remain': 1500, 'count': 5})
+        with self.assertRaises(ValueError) as cm:
+            dut.run_program(pgm=21)
+        self.assertEqual(str(cm.exception), "Unsupported program number '21'")
+    #*****************************
+
+
     #*****************************
     def test_info(self):
         """
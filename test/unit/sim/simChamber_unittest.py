@@ -26,6 +26,7 @@ import math       # for isnan
 # Self, DUT
 sys.path.append(os.path.abspath((os.path.dirname(os.path.abspath(__file__)) + "/../../../"))) # add project root to lib search path   
 from ATWG.driver.sim.simChamber import simChamber                                             # Python Script under test
+from ATWG.waves.waves import waves                                                            # profile for offline simulation
 #------------------------------------------------------------------------------
 
 
@@ -118,6 +119,94 @@ class TestSimChamber(unittest.TestCase):
         dut.set_clima(clima={'temperature': 20.5})
         self.assertEqual(dut.last_set_temp, 20.5)
     #*****************************
+
+
+    #*****************************
+    def test_set_model(self):
+        """
+        @note:  checks model config
+        """
+        dut = simChamber()
+        with self.assertRaises(ValueError) as cm:
+            dut.set_model(foo=1)
+        self.assertEqual(str(cm.exception), "Unknown model argument 'foo'")
+        with self.assertRaises(ValueError) as cm:
+            dut.set_model(order=3)
+        self.assertEqual(str(cm.exception), "Unsupported model order '3'")
+        with self.assertRaises(ValueError) as cm:
+            dut.set_model(order=1, fall=1)
+        self.assertEqual(str(cm.exception), "Rise slew rate needs to be positive, fall negative")
+        # slew rates are reported
+        self.assertTrue(dut.set_model(order=1, tau=60, rise=2.9, fall=-1.7))
+        self.assertDictEqual(dut.info()['temperature']['slewrate'], {'rise': 2.9, 'fall': -1.7, 'unit': 'c/min'})
+    #*****************************
+
+
+    #*****************************
+    def test_model(self):
+        """
+        @note:  chamber dynamic over time
+        """
+        # virtual time
+        now = [0.0]
+        dut = simChamber()
+        dut.clock = lambda: now[0]
+        # slew rate limit
+        dut.set_model(order=1, rise=3, fall=-2)
+        dut.get_clima()
+        dut.set_clima(clima={'temperature': 80})
+        now[0] = 60
+        self.assertAlmostEqual(dut.get_clima()['temperature'], 23)
+        dut.set_clima(clima={'temperature': 0})
+        now[0] = 120
+        self.assertAlmostEqual(dut.get_clima()['temperature'], 21)
+        # first order w/ dead time
+        dut.set_model(order=1, tau=100, deadtime=10, rise=float('inf'), fall=float('-inf'))
+        dut.get_clima()
+        dut.set_clima(clima={'temperature': 10})
+        now[0] = 130
+        self.assertAlmostEqual(dut.get_clima()['temperature'], 0)
+        now[0] = 230
+        self.assertAlmostEqual(dut.get_clima()['temperature'], 10*(1-math.exp(-1)))
+        # latency
+        slept = []
+        dut.sleep = slept.append
+        dut.set_model(latency=0.1)
+        dut.get_clima()
+        self.assertEqual(slept, [0.1])
+    #*****************************
+
+
+    #*****************************
+    def test_simulate(self):
+        """
+        @note:  offline simulation matches online request sequence
+        """
+        # profile
+        wave = waves()
+        wave.set(wave="sine", ts=1, tp=3600, lowVal=20, highVal=60)
+        tset = wave.render(3600)
+        for model in ({'order': 0}, {'order': 1, 'tau': 300, 'deadtime': 20, 'rise': 2.9, 'fall': -1.7}, {'order': 2, 'tau': 300, 'tau2': 30, 'rise': 2.9, 'fall': -1.7}):
+            # online
+            now = [0.0]
+            dut = simChamber()
+            dut.clock = lambda: now[0]
+            dut.last_set_temp = tset[0]
+            dut.set_model(**model)
+            dut.policy.set(resolution=0)
+            online = []
+            for k, val in enumerate(tset):
+                now[0] = k
+                online.append(dut.get_clima()['temperature'])
+                dut.set_clima(clima={'temperature': val})
+            # offline
+            offline = dut.simulate(tset=tset, ts=1)
+            self.assertEqual(len(offline), len(online))
+            for a, b in zip(online, offline):
+                self.assertAlmostEqual(a, b, places=6)
+        # chamber lags
+        self.assertLess(max(offline), 60)
+    #*****************************
     
 #------------------------------------------------------------------------------    
 
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          archive_unittest.py
+@date:          2026-10-19
+
+@note           Unittest for archive.py
+                  run ./test/unit/telemetry/archive_unittest.py
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Standard
+import sys          # python path handling
+import os           # platform independent paths
+import unittest     # performs test
+import tempfile     # archive file
+import math         # sine, isnan
+import random       # varint round trip
+import subprocess   # command line
+# Self
+sys.path.append(os.path.abspath((os.path.dirname(os.path.abspath(__file__)) + "/../../../"))) # add project root to lib search path
+from ATWG.telemetry.archive import archiveWriter, archiveReader, trace_writer, varint_encode, varint_decode, ARC_NAN  # Python Script under test
+from ATWG.telemetry.trace import traceWriter, traceReader                                     # CSV trace
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class TestArchive(unittest.TestCase):
+
+    #*****************************
+    def write(self, dut, num, t0=0):
+        """
+        @note   one hour sine with 1 Hz
+        """
+        for i in range(t0, t0+num):
+            tset = 35 + 25 * math.sin(2*math.pi*i/3600)
+            dut.write(time=i, tset=tset, tmeas=tset-0.5, humidity=float('nan'), grad=25*2*math.pi/3600*math.cos(2*math.pi*i/3600))
+    #*****************************
+
+
+    #*****************************
+    def test_varint(self):
+        """
+        @note   round trip incl. large and nan values
+        """
+        vals = [0, 1, -1, 63, -64, 64, 2**40, -2**40, ARC_NAN, ARC_NAN, 5] + [random.randint(-10**6, 10**6) for i in range(1000)]
+        buf = bytearray()
+        varint_encode(vals, buf)
+        self.assertListEqual(varint_decode(buf, len(vals)), vals)
+        buf = bytearray()
+        varint_encode([100] * 10, buf)
+        self.assertEqual(len(buf), 2+9)   # first value, afterwards zero deltas
+    #*****************************
+
+
+    #*****************************
+    def test_range(self):
+        """
+        @note   range queries and overview
+        """
+        with tempfile.TemporaryDirectory() as tmpDir:
+            arcFile = os.path.join(tmpDir, "run.atwa")
+            dut = archiveWriter(arcFile, resolution=0.1, buffered=1000)
+            self.write(dut, 10000)
+            dut.close()
+            # compared to CSV
+            csvFile = os.path.join(tmpDir, "run.csv")
+            csv = traceWriter(csvFile)
+            self.write(csv, 10000)
+            csv.close()
+            self.assertLess(os.path.getsize(arcFile) * 5, os.path.getsize(csvFile))
+            # read
+            rd = archiveReader(arcFile)
+            self.assertEqual(rd.info()['blocks'], 10)
+            self.assertEqual(rd.info()['rows'], 10000)
+            self.assertEqual(rd.info()['tstop'], 9999)
+            recs = list(rd.range(2500, 3500))
+            self.assertEqual(len(recs), 1001)
+            self.assertEqual(recs[0][0], 2500)
+            self.assertEqual(recs[-1][0], 3500)
+            for rec in recs:
+                self.assertAlmostEqual(rec[1], 35 + 25 * math.sin(2*math.pi*rec[0]/3600), delta=0.05+1e-9)
+                self.assertTrue(math.isnan(rec[3]))
+            self.assertListEqual(list(rd.range(9998, 20000, cols=("time", "tmeas"))), [(rec[0], rec[2]) for rec in rd.range(9998, 20000)])
+            self.assertEqual(len(list(rd.range(9998, 20000))), 2)
+            self.assertListEqual(list(rd.range(-10, -1)), [])
+            # overview from index
+            ov = rd.overview(num=5)
+            self.assertEqual(len(ov), 5)
+            self.assertEqual(ov[0]['count'], 2000)
+            self.assertAlmostEqual(ov[0]['tset_max'], 60, delta=0.05)
+            self.assertAlmostEqual(rd.overview(num=1)[0]['tset_min'], 10, delta=0.05)
+            self.assertTrue(math.isnan(ov[0]['humidity_min']))
+            with self.assertRaises(ValueError) as cm:
+                archiveReader(csvFile)
+            self.assertEqual(str(cm.exception), "File '" + csvFile + "' is no telemetry archive")
+    #*****************************
+
+
+    #*****************************
+    def test_append(self):
+        """
+        @note   unclosed archive is scanned, closed archive is continued
+        """
+        with tempfile.TemporaryDirectory() as tmpDir:
+            arcFile = os.path.join(tmpDir, "run.atwa")
+            dut = archiveWriter(arcFile, buffered=100)
+            self.write(dut, 250)
+            dut.flush()
+            dut.fH.close()  # crash w/o index
+            rd = archiveReader(arcFile)
+            self.assertEqual(rd.info()['rows'], 250)
+            # continue
+            dut = archiveWriter(arcFile, buffered=100, append=True)
+            self.write(dut, 250, t0=250)
+            dut.close()
+            rd = archiveReader(arcFile)
+            self.assertEqual(rd.info()['rows'], 500)
+            self.assertListEqual([rec[0] for rec in rd.range(240, 260)], list(range(240, 261)))
+            # overwrite by default
+            dut = archiveWriter(arcFile)
+            dut.close()
+            self.assertEqual(archiveReader(arcFile).info()['rows'], 0)
+    #*****************************
+
+
+    #*****************************
+    def test_restart(self):
+        """
+        @note   second run with restarted clock moves behind first run
+        """
+        with tempfile.TemporaryDirectory() as tmpDir:
+            arcFile = os.path.join(tmpDir, "run.atwa")
+            dut = archiveWriter(arcFile, buffered=30)
+            self.write(dut, 100, t0=100)
+            dut.close()
+            dut = archiveWriter(arcFile, buffered=30, append=True)
+            self.write(dut, 100, t0=50)
+            dut.close()
+            rd = archiveReader(arcFile)
+            self.assertListEqual([round(rec[0], 3) for rec in rd.range(120, 122)], [120, 121, 122])
+            self.assertListEqual([round(rec[0], 3) for rec in rd.range(199, 200.5)], [199, 199.001, 200.001])
+            info = rd.info()
+            self.assertEqual((info['tstart'], round(info['tstop'], 3)), (100, 298.001))
+            times = [rec[0] for rec in rd.range()]
+            self.assertListEqual(times, sorted(times))
+    #*****************************
+
+
+    #*****************************
+    def test_cli(self):
+        """
+        @note   trace conversion and selection by extension
+        """
+        with tempfile.TemporaryDirectory() as tmpDir:
+            csvFile = os.path.join(tmpDir, "run.csv")
+            arcFile = os.path.join(tmpDir, "run.atwa")
+            dut = trace_writer(csvFile)
+            self.assertIsInstance(dut, traceWriter)
+            dut.close()
+            dut = trace_writer(arcFile, {'fracs': {'temperature': 2}})
+            self.assertEqual(dut.quanta[2], 0.01)
+            dut.close()
+            csv = traceWriter(csvFile)
+            self.write(csv, 100)
+            csv.close()
+            root = os.path.abspath(os.path.dirname(os.path.abspath(__file__)) + "/../../../")
+            out = subprocess.run([sys.executable, "-m", "ATWG.telemetry.archive", "--convert", csvFile, arcFile], cwd=root, capture_output=True, text=True, timeout=60)
+            self.assertTrue(out.stdout.startswith("Info: 100 records"))
+            out = subprocess.run([sys.executable, "-m", "ATWG.telemetry.archive", "--range=10,12", arcFile], cwd=root, capture_output=True, text=True, timeout=60)
+            self.assertEqual(len(out.stdout.splitlines()), 4)
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+#------------------------------------------------------------------------------
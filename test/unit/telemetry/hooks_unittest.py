@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          hooks_unittest.py
+@date:          2026-10-19
+
+@note           Unittest for hooks.py
+                  run ./test/unit/telemetry/hooks_unittest.py
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Standard
+import sys        # python path handling
+import os         # platform independent paths
+import unittest   # performs test
+import threading  # blocked callback
+import time       # slow callback
+# Self
+sys.path.append(os.path.abspath((os.path.dirname(os.path.abspath(__file__)) + "/../../../"))) # add project root to lib search path
+from ATWG.telemetry.hooks import hookPool, hookRec                                            # Python Script under test
+from ATWG.ATWG import ATWG                                                                    # tick events
+from ATWG.runner.virtualRun import virtualRun                                                 # fast forward
+from ATWG.runner.rtRun import rtRun                                                           # real time
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class TestHooks(unittest.TestCase):
+
+    #*****************************
+    def atwg(self, waveArgs={}):
+        """
+        @note   opened SIM trapezoid
+        """
+        dut = ATWG()
+        chamberArg, waveArg = dut.parse_cli(["--trapezoid", "--chamber=SIM", "--minTemp=20", "--maxTemp=40", "--startTemp=20", "--period=1h"])
+        waveArg.update({'tr': 900, 'tf': 900, 'dutyCycle': 0.5})
+        waveArg.update(waveArgs)
+        dut.open(chamberArg=chamberArg, waveArg=waveArg)
+        return dut
+    #*****************************
+
+
+    #*****************************
+    def test_pool(self):
+        """
+        @note   drop on full queue, failing callback
+        """
+        dut = hookPool(workers=1, depth=2, policy="drop")
+        started, release = threading.Event(), threading.Event()
+        seen = []
+        def slow(rec):
+            started.set()
+            release.wait()
+            seen.append(rec.time)
+        dut.add("tick", slow)
+        rec = hookRec("tick", 0, 25.0, 24.0, float('nan'), 0.0, "hold", None)
+        self.assertTrue(dut.submit(rec))
+        self.assertTrue(started.wait(10))   # worker busy, queue empty
+        res = [dut.submit(rec._replace(time=t)) for t in range(1, 5)]
+        self.assertListEqual(res, [True, True, False, False])
+        release.set()
+        dut.drain()
+        self.assertListEqual(seen, [0, 1, 2])
+        # failing callback, worker survives
+        dut.add("tick", lambda rec: 1/0)
+        dut.submit(rec)
+        dut.drain()
+        report = dut.report()
+        self.assertEqual((report['queued'], report['dropped'], report['done'], report['errors']), (4, 2, 4, 1))
+        self.assertEqual(report['last_error'], "ZeroDivisionError('division by zero')")
+        self.assertEqual(report['callbacks'], {'tick': 2, 'segment': 0, 'peak': 0})
+        dut.close()
+        # settings
+        with self.assertRaises(ValueError) as cm:
+            hookPool(policy="latest")
+        self.assertEqual(str(cm.exception), "Unknown hook policy 'latest', use drop, block")
+        with self.assertRaises(ValueError) as cm:
+            hookPool(workers=0)
+        self.assertEqual(str(cm.exception), "Hook pool needs at least one worker")
+        with self.assertRaises(ValueError) as cm:
+            dut.add("plateau", print)
+        self.assertEqual(str(cm.exception), "Unknown hook event 'plateau', use tick, segment, peak")
+    #*****************************
+
+
+    #*****************************
+    def test_events(self):
+        """
+        @note   segments and peaks of trapezoid, backpressure on virtual clock
+        """
+        dut = self.atwg()
+        dut.hooks = hookPool(workers=1, depth=4, policy="block")   # nothing lost
+        segments, peaks, ticks = [], [], []
+        dut.on_segment_change(lambda rec: segments.append((rec.time, rec.segment)))
+        dut.on_peak(lambda rec: peaks.append((rec.peak, rec.tset)))
+        dut.on_tick(lambda rec: ticks.append(rec.time))
+        run = virtualRun(dut)
+        dut.start()
+        stats = run.run(2*3600)
+        dut.hooks.drain()
+        kinds = [kind for t, kind in segments]
+        self.assertListEqual(kinds, ["rise", "hold", "fall", "hold"] * 2)
+        self.assertListEqual([round(t) for t, kind in segments], [0, 900, 1800, 2700, 3600, 4500, 5400, 6300])
+        self.assertListEqual(peaks, [("max", 40.0), ("min", 20.0), ("max", 40.0)])
+        self.assertEqual(len(ticks), stats['wakes'])
+        self.assertEqual(dut.hooks.report()['dropped'], 0)
+        # backpressure not in real time
+        with self.assertRaises(ValueError) as cm:
+            rtRun(dut)
+        self.assertEqual(str(cm.exception), "Hook policy 'block' delays control loop, use 'drop' in real time")
+        dut.stop()
+        dut.close()
+    #*****************************
+
+
+    #*****************************
+    def test_slow(self):
+        """
+        @note   slow callback delays neither ticks nor waveform
+        """
+        ref = self.atwg()
+        run = virtualRun(ref)
+        ref.start()
+        run.run(600)
+        # same run with slow hook
+        dut = self.atwg()
+        dut.hooks = hookPool(depth=16)
+        dut.on_tick(lambda rec: time.sleep(0.01))
+        run = virtualRun(dut)
+        dut.start()
+        twall = time.perf_counter()
+        stats = run.run(600)
+        self.assertLess(time.perf_counter() - twall, 600 * 0.01 / 4)      # not waited for callbacks
+        self.assertEqual((stats['set'], stats['meas']), (ref.ticks['set'], ref.ticks['meas']))
+        self.assertEqual(dut.clima['set']['val'], ref.clima['set']['val'])
+        report = dut.hooks.report()
+        self.assertLess(0, report['dropped'])
+        self.assertEqual(report['queued'] + report['dropped'], stats['wakes'])
+        dut.stop()
+        dut.close()
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+#------------------------------------------------------------------------------
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          shm_unittest.py
+@date:          2026-10-19
+
+@note           Unittest for shm.py
+                  run ./test/unit/telemetry/shm_unittest.py
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Standard
+import sys          # python path handling
+import os           # platform independent paths
+import unittest     # performs test
+import subprocess   # reader in other process
+# Self
+sys.path.append(os.path.abspath((os.path.dirname(os.path.abspath(__file__)) + "/../../../"))) # add project root to lib search path
+from ATWG.telemetry.shm import shmWriter, shmReader, SHM_SEQ_OFS, SHM_U64                    # Python Script under test
+from ATWG.ATWG import ATWG                                                                    # generator
+from ATWG.runner.virtualRun import virtualRun                                                 # virtual clock
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class TestShm(unittest.TestCase):
+
+    #*****************************
+    def test_ring(self):
+        """
+        @note   write, wrap around and read back
+        """
+        name = "atwg_ut_" + str(os.getpid())
+        dut = shmWriter(name, capacity=8)
+        rd = shmReader(name)
+        self.assertIsNone(rd.latest())
+        for i in range(20):
+            dut.write(time=i, tset=20+i, tmeas=19+i, humidity=float('nan'), grad=0.5)
+        self.assertEqual(rd.latest()[0:3], (19, 39, 38))
+        count, recs = rd.read(100)
+        self.assertEqual(count, 20)
+        self.assertListEqual([rec[0] for rec in recs], list(range(12, 20)))
+        self.assertListEqual([rec[0] for rec in rd.read(start=15)[1]], list(range(15, 20)))
+        self.assertListEqual([rec[0] for rec in rd.read(start=3)[1]], list(range(12, 20)))   # older overwritten
+        # write in progress, reader retries and gives up
+        SHM_U64.pack_into(dut.buf, SHM_SEQ_OFS, dut.seq+1)
+        with self.assertRaises(ValueError) as cm:
+            rd.read()
+        self.assertEqual(str(cm.exception), "No consistent read after 1000 retries")
+        SHM_U64.pack_into(dut.buf, SHM_SEQ_OFS, dut.seq)
+        self.assertEqual(rd.latest()[0], 19)
+        rd.close()
+        dut.close()
+        with self.assertRaises(FileNotFoundError):
+            shmReader(name)
+    #*****************************
+
+
+    #*****************************
+    def test_layout(self):
+        """
+        @note   foreign segment and version mismatch are rejected
+        """
+        name = "atwg_ut_" + str(os.getpid())
+        dut = shmWriter(name, capacity=2)
+        dut.buf[0:4] = b"XXXX"
+        with self.assertRaises(ValueError) as cm:
+            shmReader(name)
+        self.assertEqual(str(cm.exception), "Shared memory '" + name + "' is no ATWG telemetry")
+        dut.buf[0:6] = b"ATWG\x02\x00"
+        with self.assertRaises(ValueError) as cm:
+            shmReader(name)
+        self.assertEqual(str(cm.exception), "Shared memory '" + name + "' has unsupported layout version 2")
+        with self.assertRaises(ValueError) as cm:
+            shmWriter(name, capacity=100)
+        self.assertEqual(str(cm.exception), "Shared memory '" + name + "' exists with smaller size")
+        dut.close()
+    #*****************************
+
+
+    #*****************************
+    def test_atwg(self):
+        """
+        @note   ATWG exports, other process reads
+        """
+        atwg = ATWG()
+        chamberArg, waveArg = atwg.parse_cli(["--sine", "--chamber=SIM", "--minTemp=10", "--maxTemp=60", "--period=1h", "--shm=atwg_ut_" + str(os.getpid())])
+        atwg.open(chamberArg=chamberArg, waveArg=waveArg)
+        atwg.export = shmWriter(atwg.cfg_shm, capacity=100)
+        run = virtualRun(atwg)
+        atwg.start()
+        run.run(500)
+        script = "import sys; sys.path.insert(0, sys.argv[1]); from ATWG.telemetry.shm import shmReader; rd = shmReader(sys.argv[2]); count, recs = rd.read(100); print(count, len(recs), recs[-1][0]); rd.close()"
+        out = subprocess.run([sys.executable, "-c", script, os.path.abspath(os.path.dirname(os.path.abspath(__file__)) + "/../../../"), atwg.cfg_shm], capture_output=True, text=True, timeout=60)
+        self.assertEqual(out.stdout.split(), ["500", "100", "499.0"])
+        self.assertEqual(out.stderr, "")    # no resource tracker warning
+        atwg.export.close()
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+#------------------------------------------------------------------------------
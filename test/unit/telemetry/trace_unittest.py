@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          trace_unittest.py
+@date:          2026-10-19
+
+@note           Unittest for trace.py
+                  run ./test/unit/telemetry/trace_unittest.py
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Standard
+import sys        # python path handling
+import os         # platform independent paths
+import unittest   # performs test
+import tempfile   # trace file
+import math       # isnan
+# Self
+sys.path.append(os.path.abspath((os.path.dirname(os.path.abspath(__file__)) + "/../../../"))) # add project root to lib search path
+from ATWG.telemetry.trace import traceWriter, traceReader                                     # Python Script under test
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class TestTrace(unittest.TestCase):
+
+    #*****************************
+    def test_write_read(self):
+        """
+        @note   writes trace and reads back row and block wise
+        """
+        with tempfile.TemporaryDirectory() as tmpDir:
+            traceFile = os.path.join(tmpDir, "run.csv")
+            # write
+            dut = traceWriter(traceFile, buffered=7)
+            for i in range(1000):
+                dut.write(time=i, tset=20+i/100, tmeas=20, humidity=float('nan'), grad=0.01)
+            dut.close()
+            self.assertEqual(dut.rows, 1000)
+            # read row wise
+            rows = list(traceReader(traceFile).rows())
+            self.assertEqual(len(rows), 1000)
+            self.assertEqual(rows[500][:3], (500, 25, 20))
+            self.assertTrue(math.isnan(rows[500][3]))
+            # read block wise
+            cnt = 0
+            for block in traceReader(traceFile).blocks(num=100):
+                self.assertEqual(block['time'][0], cnt)
+                cnt += len(block['time'])
+                self.assertEqual(len(block['tset']), len(block['time']))
+            self.assertEqual(cnt, 1000)
+            # no trace
+            with open(traceFile, 'w') as fH:
+                fH.write("foo\n")
+            with self.assertRaises(ValueError) as cm:
+                traceReader(traceFile)
+            self.assertEqual(str(cm.exception), "File '" + traceFile + "' is not a telemetry trace")
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+#------------------------------------------------------------------------------
@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          serialTrace_unittest.py
+@date:          2026-10-19
+
+@note           Unittest for serialTrace.py
+                  run ./test/unit/trace/serialTrace_unittest.py
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Standard
+import sys        # python path handling
+import os         # platform independent paths
+import unittest   # performs test
+import tempfile   # log file
+# Self
+sys.path.append(os.path.abspath((os.path.dirname(os.path.abspath(__file__)) + "/../../../"))) # add project root to lib search path
+os.environ["ATWG_CACHE_DIR"] = ""                                                             # no config disk cache in user home
+from ATWG.driver.trace.serialTrace import *                                                   # Python Script under test
+from ATWG.driver.espec.sh641 import especShSu                                                 # replay target
+from ATWG.driver.espec.sh641Const import *                                                    # climate chamber defintions
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class fakeChamber:
+    """
+    @note   answers like a SH641 on a serial port
+    """
+    def __init__(self):
+        self.rsp = b""
+        self.closed = False
+    def write(self, data):
+        cmd = data.decode().strip()
+        if ( CMD_GET_TYPE == cmd ):
+            self.rsp = RSP_CH_ID
+        elif ( CMD_GET_TEMP == cmd ):
+            self.rsp = "26.4,25.0,140.0,-50.0"
+        elif ( CMD_GET_HUMI == cmd ):
+            self.rsp = "25,85,100,0"
+        else:
+            self.rsp = RSP_OK + ":" + cmd
+        self.rsp = (self.rsp + MSC_LINE_END).encode()
+        return len(data)
+    def read_until(self, expected=b"\n", size=None):
+        rsp, self.rsp = self.rsp, b""
+        return rsp
+    def close(self):
+        self.closed = True
+#------------------------------------------------------------------------------
+
+
+#------------------------------------------------------------------------------
+class fakeClock:
+    """
+    @note   virtual time, sleep advances time
+    """
+    def __init__(self):
+        self.t = 0.0
+        self.slept = 0.0
+    def clock(self):
+        return self.t
+    def sleep(self, sec):
+        self.t += sec
+        self.slept += sec
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class TestSerialTrace(unittest.TestCase):
+
+    #*****************************
+    def setUp(self):
+        """
+        @note   records a short session of a chamber
+        """
+        self.tmpDir = tempfile.TemporaryDirectory()
+        self.logFile = os.path.join(self.tmpDir.name, "session.trc")
+        # record session
+        clk = fakeClock()
+        dut = especShSu()
+        dut.com = serialRecorder(com=fakeChamber(), logFile=self.logFile, clock=clk.clock)
+        dut.isOpen = True
+        dut.write(CMD_GET_TYPE)
+        dut.read()
+        clk.t = 1.0
+        dut.get_clima()
+        clk.t = 2.0
+        dut.set_clima(clima={'temperature': 30})
+        dut.close()
+    #*****************************
+
+
+    #*****************************
+    def tearDown(self):
+        """
+        @note   removes log
+        """
+        self.tmpDir.cleanup()
+    #*****************************
+
+
+    #*****************************
+    def test_load(self):
+        """
+        @note   checks recorded log
+        """
+        recs = load(self.logFile)
+        self.assertEqual(len(recs), 12)
+        self.assertEqual(recs[0], (0.0, DIR_WRITE, b"TYPE?\r\n"))
+        self.assertEqual(recs[1], (0.0, DIR_REQ, pack_req(REQ_UNTIL, None, b"\r\n")))
+        self.assertEqual(recs[2], (0.0, DIR_READ, b"T,T,S2,160.0\r\n"))
+        self.assertEqual(recs[9], (2.0, DIR_WRITE, b"TEMP,S30.0\r\n"))
+        self.assertEqual(recs[11], (2.0, DIR_READ, b"OK:TEMP,S30.0\r\n"))
+        # no trace file
+        with open(self.logFile, 'wb') as fH:
+            fH.write(b"foo")
+        with self.assertRaises(ValueError) as cm:
+            load(self.logFile)
+        self.assertEqual(str(cm.exception), "File '" + self.logFile + "' is not a serial trace")
+    #*****************************
+
+
+    #*****************************
+    def test_replay(self):
+        """
+        @note   replays session as fast as possible through driver
+        """
+        dut = especShSu()
+        self.assertTrue(dut.open(replayFile=self.logFile, replaySpeed=0))
+        self.assertDictEqual(dut.get_clima(), {'temperature': 26.4, 'humidity': 25})
+        self.assertTrue(dut.set_clima(clima={'temperature': 30}))
+        # log end behaves like timeout
+        with self.assertRaises(ValueError):
+            dut.get_clima()
+    #*****************************
+
+
+    #*****************************
+    def test_replay_timing(self):
+        """
+        @note   replay with original timing and double speed
+        """
+        for speed, slept in ((1, 2.0), (2, 1.0)):
+            clk = fakeClock()
+            dut = serialReplay(logFile=self.logFile, speed=speed, strict=False, clock=clk.clock, sleep=clk.sleep)
+            while ( 0 < len(dut.read()) ):
+                pass
+            self.assertAlmostEqual(clk.slept, slept)
+    #*****************************
+
+
+    #*****************************
+    def test_replay_mismatch(self):
+        """
+        @note   changed host traffic is detected
+        """
+        dut = serialReplay(logFile=self.logFile, speed=0)
+        with self.assertRaises(ValueError) as cm:
+            dut.write(b"TEMP?\r\n")
+        self.assertEqual(str(cm.exception), "Replay mismatch at record 0, expected b'TYPE?\\r\\n' got b'TEMP?\\r\\n'")
+        # changed read request is detected
+        dut = serialReplay(logFile=self.logFile, speed=0)
+        dut.write(b"TYPE?\r\n")
+        with self.assertRaises(ValueError) as cm:
+            dut.read(64)
+        self.assertEqual(str(cm.exception), "Replay mismatch at record 1, expected read_until(b'\\r\\n', None) got read(64)")
+        dut = serialReplay(logFile=self.logFile, speed=0)
+        dut.write(b"TYPE?\r\n")
+        with self.assertRaises(ValueError) as cm:
+            dut.read_until(b"\n", 16)
+        self.assertEqual(str(cm.exception), "Replay mismatch at record 1, expected read_until(b'\\r\\n', None) got read_until(b'\\n', 16)")
+        # skipped read is detected
+        dut = serialReplay(logFile=self.logFile, speed=0)
+        dut.write(b"TYPE?\r\n")
+        with self.assertRaises(ValueError) as cm:
+            dut.write(b"TEMP?\r\n")
+        self.assertEqual(str(cm.exception), "Replay mismatch at record 1, expected direction 'Q'")
+        # non-strict skips
+        dut = serialReplay(logFile=self.logFile, speed=0, strict=False)
+        self.assertEqual(dut.read(), b"T,T,S2,160.0\r\n")
+        self.assertEqual(dut.read(64), b"26.4,25.0,140.0,-50.0\r\n")
+    #*****************************
+
+
+    #*****************************
+    def test_replay_v1(self):
+        """
+        @note   version 1 logs w/o read requests are replayed unchecked
+        """
+        recs = load(self.logFile)
+        with open(self.logFile, 'wb') as fH:
+            fH.write(LOG_MAGIC_V1)
+            for tsec, direction, data in recs:
+                if ( DIR_REQ != direction ):
+                    fH.write(LOG_REC.pack(int(tsec*1e6), direction, len(data)) + data)
+        dut = serialReplay(logFile=self.logFile, speed=0)
+        dut.write(b"TYPE?\r\n")
+        self.assertEqual(dut.read(64), b"T,T,S2,160.0\r\n")
+        dut = especShSu()
+        self.assertTrue(dut.open(replayFile=self.logFile, replaySpeed=0))
+        self.assertDictEqual(dut.get_clima(), {'temperature': 26.4, 'humidity': 25})
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+#------------------------------------------------------------------------------
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          lookahead_unittest.py
+@date:          2026-10-19
+
+@note           Unittest for lookahead.py
+                  run ./test/unit/waves/lookahead_unittest.py
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Standard
+import sys        # python path handling
+import os         # platform independent paths
+import unittest   # performs test
+import math       # sine
+# Self
+sys.path.append(os.path.abspath((os.path.dirname(os.path.abspath(__file__)) + "/../../../"))) # add project root to lib search path
+from ATWG.waves.lookahead import lookahead                                                    # Python Script under test
+from ATWG.waves.waves import waves                                                            # waveform
+from ATWG.ATWG import ATWG                                                                    # closed loop with SIM
+from ATWG.runner.virtualRun import virtualRun                                                 # fast forward
+from ATWG.analysis.trackError import trackError                                               # tracking error
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class TestLookahead(unittest.TestCase):
+
+    #*****************************
+    def track(self, waveArgs, ahead):
+        """
+        @note   RMS tracking error of SIM chamber after first period
+        """
+        dut = ATWG()
+        cli = ["--sine", "--chamber=SIM", "--minTemp=20", "--maxTemp=40", "--startTemp=20", "--period=1h", "--simModel=order=1,tau=5m,deadtime=1m,rise=2.9,fall=-1.7"]
+        if ( None != ahead ):
+            cli.append("--lookahead=" + ahead)
+        chamberArg, waveArg = dut.parse_cli(cli)
+        waveArg.update(waveArgs)
+        dut.open(chamberArg=chamberArg, waveArg=waveArg)
+        err = trackError(keepSegments=False)
+        # trace interface, measured against intended waveform
+        class sink:
+            def write(self, time, tset, tmeas, humidity, grad):
+                if ( 3600 <= time ):
+                    err.add(time, tset, tmeas, grad)
+        dut.trace = sink()
+        run = virtualRun(dut)
+        dut.start()
+        run.run(3*3600)
+        return err.report()['rms']
+    #*****************************
+
+
+    #*****************************
+    def test_setpoint(self):
+        """
+        @note   shift and shape of sine
+        """
+        wave = waves()
+        wave.set(wave="sine", ts=1, tp=3600, lowVal=20, highVal=40)
+        wave.next()
+        # shift, dead time plus time constant ahead
+        dut = lookahead(wave, tau=240, tau2=60, deadtime=60, mode="shift")
+        self.assertAlmostEqual(dut.setpoint(), 30 + 10*math.sin(2*math.pi*360/3600))
+        # shape, dead time ahead plus lag of first order
+        dut = lookahead(wave, tau=300, deadtime=60)
+        grad = 10*2*math.pi/3600*math.cos(2*math.pi*60/3600)
+        self.assertAlmostEqual(dut.setpoint(), 30 + 10*math.sin(2*math.pi*60/3600) + 300*grad, delta=1e-3)
+        self.assertEqual(wave.iterator, 1)  # state unchanged
+        # slew limit and ratings
+        dut = lookahead(wave, tau=300, deadtime=60, rise=0.6)
+        self.assertAlmostEqual(dut.setpoint(), 30 + 10*math.sin(2*math.pi*60/3600) + 300*0.01, delta=1e-3)
+        dut = lookahead(wave, tau=300, deadtime=60, tmax=31)
+        self.assertEqual(dut.setpoint(), 31)
+        # w/o lag is set point the waveform
+        dut = lookahead(wave)
+        self.assertAlmostEqual(dut.setpoint(), 30)
+        # errors
+        with self.assertRaises(ValueError) as cm:
+            lookahead(wave, mode="pid")
+        self.assertEqual(str(cm.exception), "Unsupported lookahead mode 'pid', use shift, shape")
+        with self.assertRaises(ValueError) as cm:
+            lookahead(wave, tau=-1)
+        self.assertEqual(str(cm.exception), "Lag model needs non-negative times")
+    #*****************************
+
+
+    #*****************************
+    def test_lag_model(self):
+        """
+        @note   lag model from SIM chamber, command line wins
+        """
+        dut = ATWG()
+        chamberArg, waveArg = dut.parse_cli(["--sine", "--chamber=SIM", "--minTemp=20", "--maxTemp=40", "--simModel=order=1,tau=5m,deadtime=1m,rise=2.9,fall=-1.7", "--lookahead=mode=shift,deadtime=2m"])
+        self.assertDictEqual(dut.cfg_lookahead, {'mode': "shift", 'deadtime': 120})
+        dut.open(chamberArg=chamberArg, waveArg=waveArg)
+        lag = dut.lag_model(dut.cfg_lookahead)
+        self.assertDictEqual(lag, {'tau': 300, 'tau2': 0, 'deadtime': 120, 'rise': 2.9, 'fall': -1.7, 'tmin': float('-inf'), 'tmax': float('inf'), 'mode': "shift"})
+        self.assertEqual(dut.ahead.k, 419)
+        with self.assertRaises(ValueError) as cm:
+            ATWG().parse_cli(["--sine", "--minTemp=20", "--maxTemp=30", "--lookahead=gain=2"])
+        self.assertEqual(str(cm.exception), "Unknown lookahead setting 'gain'")
+    #*****************************
+
+
+    #*****************************
+    def test_track(self):
+        """
+        @note   SIM chamber follows waveform closer
+        """
+        for waveArgs in ({}, {'wave': "trapezoid", 'tr': 900, 'tf': 900, 'dutyCycle': 0.5}):
+            rms = {ahead: self.track(waveArgs, ahead) for ahead in (None, "mode=shift", "mode=shape")}
+            self.assertGreater(rms[None], 3)
+            self.assertLess(rms["mode=shift"], rms[None] / 3)
+            self.assertLess(rms["mode=shape"], 0.1)
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+#------------------------------------------------------------------------------
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+@author:        Andreas Kaeberlein
+@copyright:     Copyright 2026
+@credits:       AKAE
+
+@license:       GPLv3
+@maintainer:    Andreas Kaeberlein
+@email:         andreas.kaeberlein@web.de
+
+@file:          pwl_unittest.py
+@date:          2026-10-19
+
+@note           Unittest for pwl.py
+                  run ./test/unit/waves/pwl_unittest.py
+"""
+
+
+
+#------------------------------------------------------------------------------
+# Standard
+import sys        # python path handling
+import os         # platform independent paths
+import unittest   # performs test
+import random     # random profile
+# Self
+sys.path.append(os.path.abspath((os.path.dirname(os.path.abspath(__file__)) + "/../../../"))) # add project root to lib search path
+from ATWG.waves.pwl import pwl                                                                # Python Script under test
+from ATWG.waves.waves import waves                                                            # sample source
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+class TestPwl(unittest.TestCase):
+
+    #*****************************
+    def test_compress(self):
+        """
+        @note   error bound holds, linear input results in one ramp
+        """
+        dut = pwl()
+        # line
+        self.assertEqual(dut.compress([2*k for k in range(100)], ts=2, maxError=0), 1)
+        self.assertEqual(list(dut.times), [0, 198])
+        self.assertEqual(list(dut.values), [0, 198])
+        # one hour sine at chamber resolution
+        wave = waves()
+        wave.set(wave="sine", ts=1, tp=3600, lowVal=-10, highVal=60)
+        samples = wave.render(3601)
+        self.assertLess(dut.compress(samples, maxError=0.05), 40)
+        for k in range(len(samples)):
+            self.assertLessEqual(abs(dut.eval(k) - samples[k]), 0.05 + 1e-9)
+        # breakpoints on time quantum, bound holds for every sample
+        num = dut.compress(samples, ts=1, maxError=0.05, quantum=60)
+        self.assertTrue(all(0 == t % 60 for t in dut.times))
+        for k in range(len(samples)):
+            self.assertLessEqual(abs(dut.eval(k) - samples[k]), 0.05 + 1e-9)
+        self.assertEqual(dut.compress([0, 10, 20, 20, 20, 10, 0], ts=1, maxError=0, quantum=1), 3)     # every sample
+        # noisy table profile w/ jumps
+        rnd = random.Random(7)
+        samples = [rnd.choice((0, 20, 40)) + rnd.uniform(-0.5, 0.5) for i in range(50) for j in range(20)]
+        num = dut.compress(samples, ts=10, maxError=0.5, t0=100)
+        self.assertLess(num, len(samples))
+        for k in range(len(samples)):
+            self.assertLessEqual(abs(dut.eval(100 + 10*k) - samples[k]), 0.5 + 1e-9)
+        # exceptions
+        with self.assertRaises(ValueError) as cm:
+            dut.compress([0, 10, 10, 10, 10], ts=1, maxError=0, quantum=2)
+        self.assertEqual(str(cm.exception), "Samples within time quantum exceed max error 0 at 2s")
+        with self.assertRaises(ValueError) as cm:
+            dut.compress(samples, ts=2, quantum=3)
+        self.assertEqual(str(cm.exception), "Time quantum 3s is no multiple of sample time 2s")
+        with self.assertRaises(ValueError) as cm:
+            dut.compress([])
+        self.assertEqual(str(cm.exception), "No samples to compress provided")
+        with self.assertRaises(ValueError) as cm:
+            dut.compress([1, 2], maxError=-1)
+        self.assertEqual(str(cm.exception), "Max error needs to be non-negative")
+    #*****************************
+
+
+    #*****************************
+    def test_eval(self):
+        """
+        @note   segment lookup and hold outside
+        """
+        dut = pwl()
+        dut.compress([0, 10, 20, 20, 20, 10], ts=1, maxError=0)
+        self.assertEqual(list(dut.times), [0, 2, 4, 5])
+        self.assertEqual(dut.eval(-1), 0)
+        self.assertEqual(dut.eval(0.5), 5)
+        self.assertEqual(dut.eval(3), 20)
+        self.assertEqual(dut.eval(4.5), 15)
+        self.assertEqual(dut.eval(9), 10)
+        self.assertEqual(list(dut.render(6)), [0, 10, 20, 20, 20, 10])
+        self.assertEqual(dut.ramps(), [(0, 20, 2), (20, 20, 2), (20, 10, 1)])
+    #*****************************
+
+#------------------------------------------------------------------------------
+
+
+
+#------------------------------------------------------------------------------
+if __name__ == '__main__':
+    unittest.main()
+#------------------------------------------------------------------------------
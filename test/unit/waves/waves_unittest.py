@@ -25,7 +25,7 @@ import unittest   # performs test
 import math       # check nan
 # Self
 sys.path.append(os.path.abspath((os.path.dirname(os.path.abspath(__file__)) + "/../../../")))  # add project root to lib search path
-from ATWG.waves.waves import waves                                                             # Python Script under test
+from ATWG.waves.waves import waves, waveRec                                                    # Python Script under test
 #------------------------------------------------------------------------------
 
 
@@ -320,8 +320,107 @@ class TestWaves(unittest.TestCase):
                 cnt = 0
             # check iterator
             self.assertEqual(dut.iterator, cnt)
+        # given record is filled in place and returned
+        for waveArg in ({'wave': "sine"}, {'wave': "trapezoid", 'dutyCycle': 0.5}):
+            ref = waves()
+            self.assertTrue(ref.set(ts=1, tp=100, lowVal=-10, highVal=10, initVal=5, **waveArg))
+            self.assertTrue(dut.set(ts=1, tp=100, lowVal=-10, highVal=10, initVal=5, **waveArg))
+            rec = waveRec()
+            for i in range(150):
+                self.assertIs(dut.next(rec=rec), rec)
+                val = ref.next()
+                self.assertEqual((rec.val, rec.grad), (val['val'], val['grad']))
         #*****************************
 
+
+    #*****************************
+    def test_render(self):
+        """
+        @note   rendered values are next values
+        """
+        dut = waves()
+        self.assertTrue(dut.set(wave="sine", ts=1, tp=100, lowVal=-10, highVal=10, initVal=5))
+        rendered = dut.render(250)
+        self.assertEqual(len(rendered), 250)
+        for val in rendered:
+            self.assertAlmostEqual(val, dut.next()['val'])
+    #*****************************
+
+
+    #*****************************
+    def test_peek(self):
+        """
+        @note   lookahead w/o state change
+        """
+        dut = waves()
+        self.assertTrue(dut.set(wave="trapezoid", ts=1, tp=100, lowVal=-10, highVal=30, tr=20, tf=30, dutyCycle=0.5, initVal=10))
+        iterator = dut.iterator
+        ahead = [dut.peek(k) for k in range(-1, 150)]
+        self.assertEqual(dut.iterator, iterator)
+        self.assertAlmostEqual(ahead[0], dut.sample(iterator-1))
+        for val in ahead[1:]:
+            self.assertAlmostEqual(val, dut.next()['val'])
+    #*****************************
+
+
+    #*****************************
+    def test_ramps(self):
+        """
+        @note   linear pieces reproduce samples
+        """
+        dut = waves()
+        self.assertTrue(dut.set(wave="trapezoid", ts=2, tp=200, lowVal=-10, highVal=30, tr=40, tf=60, dutyCycle=0.5, initVal=10))
+        pieces = dut.ramps(dut.iterator, 150)
+        self.assertEqual(sum(piece[2] for piece in pieces), 300)
+        self.assertEqual(pieces[0], (10.0, 30.0, 20))
+        k = dut.iterator
+        for startVal, endVal, dur in pieces:
+            num = round(dur / 2)
+            for i in range(num):
+                self.assertAlmostEqual(dut.sample(k+i), startVal + (endVal-startVal)*i/num)
+            k += num
+        # sine is compressed
+        self.assertTrue(dut.set(wave="sine", ts=1, tp=3600, lowVal=-10, highVal=10))
+        pieces = dut.ramps(0, 3600, maxError=0.05)
+        self.assertLess(len(pieces), 40)
+        self.assertEqual(sum(piece[2] for piece in pieces), 3600)
+        self.assertEqual(pieces[0][0], 0)
+    #*****************************
+
+
+    #*****************************
+    def test_ticks_to_change(self):
+        """
+        @note   checks predicted set point change against sample wise search
+        """
+        # sample wise reference
+        def search(dut, ref, resolution):
+            for num in range(dut.waveDescr['x']['n']):
+                if ( round(ref/resolution) != round(dut.sample(dut.iterator+num)/resolution) ):
+                    return num
+            return dut.waveDescr['x']['n']
+        # waveforms
+        waveArgs = [
+            {'wave': "sine", 'ts': 1, 'tp': 86400, 'lowVal': 20, 'highVal': 30},
+            {'wave': "sine", 'ts': 2, 'tp': 3601, 'lowVal': -10, 'highVal': 45, 'initVal': 30, 'pSlope': False},
+            {'wave': "trapezoid", 'ts': 1, 'tp': 3600, 'lowVal': -10, 'highVal': 30, 'tr': 600, 'tf': 1200, 'dutyCycle': 0.5},
+        ]
+        for args in waveArgs:
+            for resolution in (0.1, 1):
+                dut = waves()
+                self.assertTrue(dut.set(**args))
+                # walk one period in change steps
+                num = 0
+                while ( num < dut.waveDescr['x']['n'] ):
+                    ref = dut.next()['val']
+                    exp = search(dut, ref, resolution)
+                    self.assertEqual(dut.ticks_to_change(ref=ref, resolution=resolution), exp)
+                    self.assertTrue(dut.skip(exp))
+                    num += exp + 1
+        # no quantization
+        self.assertEqual(dut.ticks_to_change(ref=0, resolution=0), 0)
+    #*****************************
+
 #------------------------------------------------------------------------------
 
 